@@ -0,0 +1,57 @@
+"""
+Benchmarks de balance, excedentes y transferencias sobre proyecciones de 3 escenarios
+"""
+
+import pytest
+
+from generadores import EFECTIVO_INICIAL, REVENUE_BASE, generar_contratos, generar_cotizaciones
+from spt_forecast.balance import (
+    calcular_excedentes_invertibles,
+    calcular_transferencias_con_balance,
+    generar_balance_multi_escenario,
+)
+from spt_forecast.cartera import compilar_indice_cartera
+from spt_forecast.proyecciones import generar_proyecciones_vectorizadas
+
+HORIZONTES = [3, 12, 36, 120]
+
+
+@pytest.fixture(scope='module', params=HORIZONTES, ids=lambda m: f'{m}_meses')
+def proyecciones(request, financial_data, seasonal_factors):
+    indice = compilar_indice_cartera(generar_contratos(100), generar_cotizaciones(100))
+    return generar_proyecciones_vectorizadas(
+        REVENUE_BASE,
+        financial_data,
+        request.param,
+        seasonal_factors=seasonal_factors,
+        ultimo_mes_historico=9,
+        indice_cartera=indice,
+        ano_base=2025
+    )
+
+
+def bench_calcular_transferencias_con_balance(benchmark, proyecciones):
+    meses = len(proyecciones['Moderado'])
+
+    def transferencias_3_escenarios():
+        return {
+            escenario: calcular_transferencias_con_balance(df_proj, EFECTIVO_INICIAL, meses)
+            for escenario, df_proj in proyecciones.items()
+        }
+
+    benchmark(transferencias_3_escenarios)
+
+
+def bench_calcular_excedentes_invertibles(benchmark, proyecciones, financial_data):
+    def excedentes_3_escenarios():
+        return {
+            escenario: calcular_excedentes_invertibles(df_proj, EFECTIVO_INICIAL, financial_data, 2, 30)
+            for escenario, df_proj in proyecciones.items()
+        }
+
+    benchmark(excedentes_3_escenarios)
+
+
+def bench_generar_balance_multi_escenario(benchmark, proyecciones):
+    meses = len(proyecciones['Moderado'])
+    benchmark(generar_balance_multi_escenario, meses, EFECTIVO_INICIAL, proyecciones)
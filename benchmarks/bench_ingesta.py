@@ -0,0 +1,54 @@
+"""
+Benchmarks de la ingesta de Utilization Reports (procesar_utilization_reports en el dashboard)
+
+Se mide el procesamiento sobre DataFrames ya leídos: el parseo de Excel
+depende de openpyxl y del disco, y queda cubierto por el cache de lectura.
+"""
+
+import pytest
+
+from generadores import generar_utilization_df
+from spt_forecast.estacionalidad import (
+    actualizar_almacen_estacional,
+    calcular_factores_estacionales,
+)
+from spt_forecast.ingesta import procesar_utilization_dataframes
+
+# Filas totales (repartidas entre los 3 años)
+FILAS = [1_000, 10_000, 100_000, 1_000_000]
+
+
+@pytest.mark.parametrize('n_filas', FILAS, ids=lambda n: f'{n}_filas')
+def bench_procesar_utilization(benchmark, n_filas):
+    por_ano = n_filas // 3
+    dataframes = [generar_utilization_df(por_ano, ano) for ano in (2023, 2024, 2025)]
+    # Corridas largas: pocas rondas para que la suite completa siga siendo práctica
+    rondas = 3 if n_filas >= 100_000 else 10
+    resultado = benchmark.pedantic(procesar_utilization_dataframes, args=dataframes, rounds=rondas, iterations=1)
+    assert len(resultado['revenue_mensual']) == 36
+
+
+def bench_procesar_utilization_un_archivo_nuevo(benchmark):
+    """Nueva carga con solo el archivo 2025 cambiado: 2023 y 2024 salen del cache de resúmenes"""
+    dataframes = [generar_utilization_df(100_000, ano) for ano in (2023, 2024, 2025)]
+    procesar_utilization_dataframes(*dataframes, huellas=['2023', '2024', '2025'])
+    huellas = iter(range(10**6))
+
+    def procesar_con_2025_nuevo():
+        return procesar_utilization_dataframes(*dataframes, huellas=['2023', '2024', f'2025-{next(huellas)}'])
+
+    assert len(benchmark(procesar_con_2025_nuevo)['revenue_mensual']) == 36
+
+
+def bench_actualizar_almacen_estacional_un_mes(benchmark):
+    """Incorporar un mes nuevo a un almacén con 3 años de historia (sin recorrer filas)"""
+    dataframes = [generar_utilization_df(10_000, ano) for ano in (2023, 2024, 2025)]
+    resumen = procesar_utilization_dataframes(*dataframes)['resumen_mensual']
+    almacen, _ = actualizar_almacen_estacional(None, resumen)
+    mes_nuevo = resumen.iloc[[0]].assign(Year=2026)
+
+    def incorporar_y_calcular():
+        nuevo, _ = actualizar_almacen_estacional(almacen, mes_nuevo)
+        return calcular_factores_estacionales(nuevo)
+
+    assert benchmark(incorporar_y_calcular) is not None
@@ -0,0 +1,140 @@
+"""
+Benchmarks del motor de proyecciones (generar_proyecciones_por_escenario en el dashboard)
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from generadores import (
+    EFECTIVO_INICIAL,
+    REVENUE_BASE,
+    TARIFAS_POR_TIPO,
+    generar_contratos,
+    generar_cotizaciones,
+    generar_equipos_disponibles,
+)
+from spt_forecast.backtest import ESTACIONALIDAD_EN_MUESTRA, HORIZONTES_BACKTEST, ejecutar_backtest
+from spt_forecast.cartera import calcular_revenue_equipos_50pct, compilar_indice_cartera
+from spt_forecast.grafo import evaluar, fijar_entrada
+from spt_forecast.granularidad import generar_proyecciones_diarias
+from spt_forecast.motor import crear_grafo_flujo_caja
+from spt_forecast.pronostico import BACKENDS, ajustar_backend, limpiar_cache_ajustes
+from spt_forecast.proyecciones import generar_proyecciones_vectorizadas
+from spt_forecast.simulacion import simular_monte_carlo
+
+HORIZONTES = [3, 12, 36, 120]
+CARTERAS = [10, 100, 1000, 10000]
+
+
+@pytest.fixture(scope='module', params=CARTERAS, ids=lambda n: f'{n}_contratos')
+def indice_cartera(request):
+    return compilar_indice_cartera(generar_contratos(request.param), generar_cotizaciones(request.param))
+
+
+@pytest.mark.parametrize('n_contratos', CARTERAS, ids=lambda n: f'{n}_contratos')
+def bench_compilar_indice_cartera(benchmark, n_contratos):
+    contratos = generar_contratos(n_contratos)
+    cotizaciones = generar_cotizaciones(n_contratos)
+    benchmark(compilar_indice_cartera, contratos, cotizaciones)
+
+
+@pytest.mark.parametrize('meses', HORIZONTES, ids=lambda m: f'{m}_meses')
+def bench_generar_proyecciones(benchmark, indice_cartera, financial_data, seasonal_factors, meses):
+    revenue_equipos = calcular_revenue_equipos_50pct(generar_equipos_disponibles(), TARIFAS_POR_TIPO)
+    resultado = benchmark(
+        generar_proyecciones_vectorizadas,
+        REVENUE_BASE,
+        financial_data,
+        meses,
+        seasonal_factors=seasonal_factors,
+        ultimo_mes_historico=9,
+        indice_cartera=indice_cartera,
+        revenue_equipos_50pct=revenue_equipos,
+        ano_base=2025
+    )
+    assert all(len(df) == meses for df in resultado.values())
+
+
+@pytest.mark.parametrize('dias', [91, 365, 1825], ids=lambda d: f'{d}_dias')
+def bench_generar_proyecciones_diarias(benchmark, indice_cartera, financial_data, seasonal_factors, dias):
+    resultado = benchmark(
+        generar_proyecciones_diarias,
+        REVENUE_BASE,
+        financial_data,
+        dias,
+        seasonal_factors=seasonal_factors,
+        ultimo_mes_historico=9,
+        indice_cartera=indice_cartera,
+        ano_base=2025,
+        efectivo_inicial=EFECTIVO_INICIAL
+    )
+    assert resultado['balance'].shape == (3, dias)
+
+
+@pytest.mark.parametrize('meses_historia', [33, 60, 120], ids=lambda m: f'{m}_meses_historia')
+@pytest.mark.parametrize('metodo', list(BACKENDS))
+def bench_ajustar_backend_en_frio(benchmark, seasonal_factors, metodo, meses_historia):
+    """Ajuste + holdout sin cache (presupuesto: < 200 ms por rerun de Streamlit)"""
+    factores = list(seasonal_factors.values())
+    serie = np.array([(REVENUE_BASE + i * 1000) * factores[i % 12] for i in range(meses_historia)])
+    ajuste = benchmark.pedantic(
+        ajustar_backend, args=(metodo, serie, 1), setup=limpiar_cache_ajustes, rounds=20, iterations=1
+    )
+    assert ajuste['mape'] is not None
+
+
+@pytest.mark.parametrize('meses', [12, 60], ids=lambda m: f'{m}_meses')
+def bench_simular_monte_carlo_100k(benchmark, financial_data, seasonal_factors, meses):
+    """Máximo del slider: 100k trayectorias (presupuesto: < 1 s también a 60 meses)"""
+    factores = list(seasonal_factors.values())
+    ruido = np.random.default_rng(0).normal(1.0, 0.08, 33)
+    df_historical = pd.DataFrame({
+        'periodo': [f'{2023 + i // 12}-{i % 12 + 1:02d}' for i in range(33)],
+        'revenue': [(REVENUE_BASE + i * 1000) * factores[i % 12] * ruido[i] for i in range(33)]
+    })
+    indice = compilar_indice_cartera(generar_contratos(100), generar_cotizaciones(100))
+    resultado = benchmark.pedantic(
+        simular_monte_carlo,
+        args=(df_historical, REVENUE_BASE, financial_data, meses, EFECTIVO_INICIAL, 3, 'Optimista', seasonal_factors),
+        kwargs={'n_simulaciones': 100000, 'indice_cartera': indice},
+        rounds=5, iterations=1
+    )
+    assert len(resultado['bandas']) == meses
+
+
+@pytest.mark.parametrize('meses_historia', [33, 60, 120], ids=lambda m: f'{m}_meses_historia')
+def bench_backtest_walk_forward(benchmark, seasonal_factors, meses_historia):
+    """Todos los cortes × 3/6/12 meses × 300 tasas × 3 variantes estacionales"""
+    factores = list(seasonal_factors.values())
+    serie = np.array([(REVENUE_BASE + i * 1000) * factores[i % 12] for i in range(meses_historia)])
+    tasas = {f'{tasa:.4f}': tasa for tasa in np.linspace(-0.02, 0.05, 300)}
+    variantes = {'en_muestra': ESTACIONALIDAD_EN_MUESTRA, 'actuales': seasonal_factors, 'sin': None}
+    resultado = benchmark(ejecutar_backtest, serie, 1, tasas, variantes)
+    assert len(resultado) == len(tasas) * len(variantes) * len(HORIZONTES_BACKTEST)
+
+
+@pytest.mark.parametrize('entrada', ['efectivo_inicial', 'meses_colchon'])
+def bench_grafo_cambio_de_entrada(benchmark, indice_cartera, financial_data, seasonal_factors, entrada):
+    """Recalcular el grafo de flujo de caja tras cambiar una entrada (sin reproyectar)"""
+    grafo = crear_grafo_flujo_caja()
+    fijar_entrada(grafo, 'indice_cartera', indice_cartera, huella=id(indice_cartera))
+    for nombre, valor in {
+        'revenue_base': REVENUE_BASE, 'financial_data': financial_data, 'seasonal_factors': seasonal_factors,
+        'ultimo_mes_historico': 9, 'ano_base': 2025, 'revenue_equipos_50pct': 0.0, 'meses': 36,
+        'escenarios': ['Conservador', 'Moderado', 'Optimista'], 'efectivo_inicial': EFECTIVO_INICIAL,
+        'meses_colchon': 2, 'dias_liquidacion': 30, 'rentabilidad_estimada': 0.10
+    }.items():
+        fijar_entrada(grafo, nombre, valor)
+    nodos = ('balances', 'necesidades', 'transferencias', 'recomendaciones')
+    for nodo in nodos:
+        evaluar(grafo, nodo)
+
+    valores = iter(range(1, 10 ** 9))
+
+    def cambiar_y_evaluar():
+        fijar_entrada(grafo, entrada, next(valores))
+        return [evaluar(grafo, nodo) for nodo in nodos]
+
+    benchmark(cambiar_y_evaluar)
+    assert grafo['estadisticas']['proyecciones']['ejecuciones'] == 1
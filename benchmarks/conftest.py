@@ -0,0 +1,23 @@
+"""
+Configuración de la suite de benchmarks (ver generadores.py para los datos sintéticos)
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Permite importar spt_forecast al ejecutar `pytest benchmarks/` desde cualquier directorio
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+@pytest.fixture(scope='session')
+def financial_data():
+    from generadores import FINANCIAL_DATA
+    return dict(FINANCIAL_DATA)
+
+
+@pytest.fixture(scope='session')
+def seasonal_factors():
+    from generadores import SEASONAL_FACTORS
+    return dict(SEASONAL_FACTORS)
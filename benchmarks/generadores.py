@@ -0,0 +1,109 @@
+"""
+Generadores sintéticos para los benchmarks de spt_forecast
+==========================================================
+
+Datos con la misma estructura que producen el dashboard y los Excel reales
+(Utilization Reports, contratos y cotizaciones manuales), con volúmenes
+configurables y semilla fija para que las corridas sean comparables.
+"""
+
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+SEMILLA = 20250101
+
+TIPOS_EQUIPO = ['CoreMaster CM3', 'Gyro RigAligner V4', 'GyroMaster', 'GyroTracer',
+                'GyroTracer 150°C', 'MagCruiser', 'StructMaster']
+TARIFAS_POR_TIPO = {'CoreMaster CM3': 2200, 'Gyro RigAligner V4': 2700, 'GyroMaster': 7050,
+                    'GyroTracer': 6200, 'GyroTracer 150°C': 5000, 'MagCruiser': 2454,
+                    'StructMaster': 1500}
+
+FINANCIAL_DATA = {'gastos_fijos': 65732.0, 'tasa_costos_variables': 0.0962}
+REVENUE_BASE = 127467.51
+EFECTIVO_INICIAL = 80000.0
+
+SEASONAL_FACTORS = {
+    'Enero': 0.76, 'Febrero': 0.85, 'Marzo': 0.93, 'Abril': 0.88, 'Mayo': 1.02, 'Junio': 1.10,
+    'Julio': 1.465, 'Agosto': 1.12, 'Septiembre': 1.05, 'Octubre': 0.98, 'Noviembre': 0.95,
+    'Diciembre': 0.80
+}
+
+
+def generar_utilization_df(n_filas, ano, semilla=SEMILLA):
+    """
+    Utilization Report sintético de un año (columnas que usa la ingesta)
+
+    Args:
+        n_filas: número de filas
+        ano: año de las fechas
+    """
+    rng = np.random.default_rng(semilla + ano)
+    dias = rng.integers(0, 365, size=n_filas)
+    tipos = rng.choice(TIPOS_EQUIPO, size=n_filas)
+    return pd.DataFrame({
+        'Date': pd.Timestamp(f'{ano}-01-01') + pd.to_timedelta(dias, unit='D'),
+        'Client': rng.choice([f'Cliente {i:03d}' for i in range(150)], size=n_filas),
+        'Equipment': tipos,
+        'Rental Rate': pd.Series(tipos).map(TARIFAS_POR_TIPO).to_numpy() * rng.uniform(0.8, 1.2, n_filas),
+        'Accrual Revenue': rng.gamma(2.0, 250.0, size=n_filas)
+    })
+
+
+def generar_contratos(n_contratos, semilla=SEMILLA):
+    """
+    Contratos con el formato de st.session_state.contratos_manuales
+    (80% activos, 30% sin fecha fin)
+    """
+    rng = np.random.default_rng(semilla)
+    hoy = date.today()
+    contratos = []
+    for i in range(n_contratos):
+        inicio = hoy + timedelta(days=int(rng.integers(-365, 365)))
+        duracion = int(rng.integers(1, 37))
+        abierto = rng.random() < 0.3
+        contratos.append({
+            'contrato_id': f'CT-{i:05d}',
+            'cliente': f'Cliente {i % 150:03d}',
+            'fecha_inicio': inicio.isoformat(),
+            'fecha_fin': 'Abierta' if abierto else (inicio + timedelta(days=30 * duracion)).isoformat(),
+            'duracion_meses': duracion,
+            'tarifa_mensual_total': float(rng.integers(1500, 30000)),
+            'costos_operativos_mensuales': float(rng.integers(0, 8000)),
+            'estado': 'Activo' if rng.random() < 0.8 else 'Finalizado'
+        })
+    return contratos
+
+
+def generar_cotizaciones(n_cotizaciones, semilla=SEMILLA):
+    """
+    Cotizaciones con el formato de st.session_state.cotizaciones_manuales.
+    Incluye también 'fecha_inicio' y 'tarifa_total' (las claves que lee el
+    índice de cartera) para que el benchmark ejercite la vigencia real.
+    """
+    rng = np.random.default_rng(semilla + 1)
+    hoy = date.today()
+    cotizaciones = []
+    for i in range(n_cotizaciones):
+        inicio = (hoy + timedelta(days=int(rng.integers(0, 365)))).isoformat()
+        tarifa = float(rng.integers(1500, 30000))
+        cotizaciones.append({
+            'quote_id': f'Q-{i:05d}',
+            'cliente': f'Cliente {i % 150:03d}',
+            'fecha_inicio_estimada': inicio,
+            'fecha_inicio': inicio,
+            'probabilidad_cierre': int(rng.integers(10, 95)),
+            'duracion_meses': int(rng.integers(0, 25)),
+            'tarifa_mensual': tarifa,
+            'tarifa_total': tarifa
+        })
+    return cotizaciones
+
+
+def generar_equipos_disponibles(n_equipos=28, semilla=SEMILLA):
+    """Equipos Standby/Backup con el formato de get_equipos_disponibles()"""
+    rng = np.random.default_rng(semilla + 2)
+    return [{'serial': str(1000 + i), 'tipo': str(rng.choice(TIPOS_EQUIPO)),
+             'estado': 'Standby'} for i in range(n_equipos)]
+
@@ -1,8 +1,305 @@
 """
-SPT MASTER FORECAST - Dashboard Streamlit v6.2.4
+SPT MASTER FORECAST - Dashboard Streamlit v7.5.2
 =================================================
 Sistema de pronóstico y análisis financiero para SPT Colombia
 
+🚀 VERSIÓN 7.5.2 - CORRECCIONES DE REVISIÓN:
+===========================================
+
+  🗂️ Almacén estacional por fuente de datos (corrige v7.2.0):
+     - Clave estable: "🏢 Fuente de datos (empresa)"; un libro con un mes
+       nuevo actualiza el mismo almacén y sube su versión. Los SHA-256 de
+       los 3 Utilization Reports solo detectan si algún archivo cambió
+     - Vive en session_state y los meses de la carga reemplazan (no se
+       mezclan) a los anteriores; índice por mes calendario → O(años) por mes
+     - Disco solo con el checkbox "Guardar almacén estacional local"
+       (data/cache/estacionalidad/<fuente>.json, escritura con archivo
+       temporal único y bloqueo)
+     - Ingesta: resumen por Utilization Report memoizado por SHA-256; solo
+       se recorren las filas de los archivos que cambiaron. df_completo se
+       arma únicamente al guardar un snapshot
+     - Modo demo: siempre los factores estacionales históricos constantes
+
+  📈 Backends de pronóstico (corrige v7.3.0):
+     - Meses en cero ya no producen 0/0 en Holt-Winters ni en la
+       descomposición (denominadores con piso, índices iniciales neutros)
+     - Un ajuste o trayectoria no finita se descarta: se usa el heurístico
+
+  🔬 Perfilador (corrige v7.5.0):
+     - tracemalloc con contador entre sesiones: se activa con el primer
+       perfil con memoria y se detiene con el último; los reruns abandonados
+       en hilos terminados se liberan solos
+     - El pico de memoria solo se informa si el perfil fue el único activo
+
+  📂 Cache de lectura (corrige v6.3.0):
+     - El fallback de equipos disponibles lee la hoja 'Sheet1' del Weekly
+       Report como la ingesta: reutiliza el DataFrame cacheado en vez de
+       parsear el workbook por segunda vez
+
+  🎲 Monte Carlo (corrige v6.5.0 con horizontes de v7.1.0):
+     - Trayectorias por bloques de 8.192 (en cache) y percentiles sobre
+       float32: 100k trayectorias × 60 meses en ~0.5 s (antes ~1 s)
+
+🚀 VERSIÓN 7.5.1 - REGISTRO ESTRUCTURADO:
+=========================================
+
+  📝 spt_forecast.registro reemplaza los print() de depuración:
+     - Niveles con SPT_LOG_LEVEL (default WARNING): en producción no se
+       arman los volcados por contrato ni los to_string() por escenario
+     - calcular_revenue_adicional_escenarios: una línea DEBUG muestreada por
+       contrato (SPT_LOG_MUESTREO, default 1 de cada 20) + resumen
+     - Ingesta (procesar_archivos_reales y procesadores): eventos INFO con
+       campos (periodos, revenue, burn rate, margen) y duracion_ms
+     - Balance (tab 6): primeros 3 meses por escenario solo en DEBUG
+     - SPT_LOG_FORMAT=json: una línea JSON por evento para parsear trazas
+
+🚀 VERSIÓN 7.5.0 - PERFILADOR POR RERUN:
+========================================
+
+  🔬 spt_forecast.perfilador + panel "⏱️ Perfilador (admin)" en el sidebar:
+     - Solo con SPT_ADMIN_PASSWORD (variable de entorno) como contraseña
+     - Por rerun completo o fragmento re-ejecutado: tiempo de pared, llamadas
+       y memoria asignada (tracemalloc, opcional) por sección (sidebar y cada
+       fragmento) y por función caliente (@perfilar): ingesta Excel,
+       proyecciones, calcular_revenue_adicional_por_mes, gráficos Plotly
+       (mostrar_grafico) y tablas (mostrar_tabla)
+     - Historial rotativo de 50 reruns en session_state, exportable a JSON
+     - Sin perfilador activo el costo es una consulta a threading.local
+
+🚀 VERSIÓN 7.4.1 - GRAFO INCREMENTAL DE CÁLCULO:
+================================================
+
+  🕸️ spt_forecast.grafo + motor.crear_grafo_flujo_caja():
+     - Entradas (histórico, factores estacionales, cartera, efectivo,
+       meses de colchón, ...) → proyecciones (revenue por escenario, egresos
+       y flujo neto) → balances / necesidades / excedentes / transferencias
+       → recomendaciones
+     - Cada nodo se memoiza por las versiones de sus dependencias: cambiar
+       el efectivo disponible ya no recalcula proyecciones; cambiar meses de
+       colchón solo recalcula necesidades, excedentes y recomendaciones
+     - Resumen Ejecutivo y Balance Proyectado mantienen su grafo en
+       session_state; expander "⏱️ Grafo de cálculo" con versión,
+       ejecuciones, aciertos y ms por nodo
+
+🚀 VERSIÓN 7.4.0 - FRAGMENTOS POR PESTAÑA Y SECCIÓN:
+====================================================
+
+  🧩 Cada pestaña se dibuja en un st.fragment (requiere streamlit >= 1.37):
+     - Mover un control (ej: "Meses a proyectar") solo re-ejecuta su pestaña;
+       Resumen Ejecutivo, Reportes y sus gráficos Plotly ya no se reconstruyen
+     - Secciones pesadas con fragmento propio: Monte Carlo y Diario / Semanal
+       en Proyecciones; Estacionalidad, Burn Rate y Balance en Reportes
+     - Dependencias declaradas: cada fragmento lista las claves de
+       session_state que lee; si una sección re-ejecutada sola cambia una
+       clave que otra usa (ej: fuente de datos), se hace un rerun completo
+     - Sidebar y acciones que ya llamaban st.rerun() siguen refrescando todo
+
+🚀 VERSIÓN 7.3.1 - BACKTEST WALK-FORWARD:
+=========================================
+
+  🧪 spt_forecast.backtest - expander en Proyecciones:
+     - En cada corte del histórico (mes 13 en adelante) se proyecta con lo
+       que se sabía hasta ese mes y se compara contra lo ocurrido
+     - MAPE y sesgo por escenario y horizonte (3/6/12 meses) con factores
+       estacionales en muestra, actuales o sin estacionalidad
+     - Grilla de 141 tasas de crecimiento × 3 variantes estacionales para
+       encontrar la mejor configuración por horizonte
+     - Cortes × pasos × configuraciones en una sola operación con arrays
+       (sumas acumuladas, sin loops por corte): milisegundos
+
+🚀 VERSIÓN 7.3.0 - BACKENDS DE PRONÓSTICO ESTADÍSTICO:
+======================================================
+
+  📈 spt_forecast.pronostico - método seleccionable en Proyecciones:
+     - Heurístico: promedio × crecimiento fijo × factores (comportamiento previo)
+     - Descomposición estacional clásica + tendencia lineal desestacionalizada
+     - Holt-Winters (tendencia aditiva, estacionalidad multiplicativa) con
+       grilla de 150 combinaciones alfa/beta/gamma evaluadas en paralelo (NumPy)
+     - Con un método estadístico, Moderado sigue el pronóstico y los otros
+       escenarios se separan según la diferencia de sus tasas de crecimiento
+
+  💾 Ajustes memoizados por huella del histórico (solo se reajusta si cambia)
+     y parte de la huella del cache de proyecciones; cada ajuste toma ~1-2 ms
+
+  🎯 Precisión por método: MAPE y sesgo en los últimos 6 meses del histórico
+
+  ℹ️ Monte Carlo y el flujo diario/semanal siguen usando el método heurístico
+
+🚀 VERSIÓN 7.2.0 - ALMACÉN ESTACIONAL PERSISTENTE:
+==================================================
+
+  🗂️ spt_forecast.estacionalidad (data/cache/estacionalidad.json):
+     - Suma y conteo por mes incorporado + acumulados por mes calendario
+       + vectores de totales por año
+     - Una ingesta solo incorpora meses nuevos o modificados; factores
+       estacionales y seasonal_by_year se derivan en O(12) sin recorrer
+       df_completo
+     - Versionado: cada cambio incrementa la versión y registra la huella
+       de los factores; las proyecciones guardan la huella usada
+       (DataFrame.attrs['huella_estacional']) y Proyecciones muestra la versión
+     - Modo demo: usa el almacén si ya tiene 12 meses (si no, constantes)
+
+  ⚡ Ingesta: suma y conteo por año-mes en una sola agrupación
+     (revenue mensual y estacionalidad salen del mismo resumen)
+
+🚀 VERSIÓN 7.1.0 - HORIZONTES LARGOS Y FLUJO DIARIO/SEMANAL:
+============================================================
+
+  📅 Horizonte de proyección hasta 60 meses (antes 12) en Proyecciones y Balance
+
+  🗓️ Nueva pestaña "Diario / Semanal" (spt_forecast.granularidad):
+     - Hasta 1,825 días o 260 semanas, sobre el mismo motor mensual
+     - Revenue y egresos repartidos por día calendario del mes
+     - Rezago de cobranza configurable (default: pagos a 30 días) →
+       la caja mínima del período y su fecha quedan visibles
+     - Tabla completa y descarga CSV del escenario seleccionado
+
+  📉 Gráficos largos con submuestreo min-max (spt_forecast.submuestreo):
+     ≤800 puntos por traza conservando picos y valles
+
+🚀 VERSIÓN 7.0.2 - LIBRO DE CAJA VECTORIZADO:
+=============================================
+
+  ⚡ spt_forecast.balance sin iterrows():
+     - Balance y excedentes: suma acumulada (np.cumsum) sobre el flujo neto
+     - Totales trimestrales: reducciones agrupadas (np.bincount)
+     - Transferencias a HQ: eventos negativos intercalados en la misma suma
+       acumulada (suma segmentada) → balance antes/después de cada transferencia
+     - Recomendaciones de inversión: máscara booleana
+     - Resultados idénticos (mismo orden de suma y mismos tipos de columna);
+       ~16x más rápido a 120 meses × 3 escenarios
+
+🚀 VERSIÓN 7.0.1 - SUITE DE BENCHMARKS:
+=======================================
+
+  ⏱️ benchmarks/ (pytest-benchmark, no se ejecuta con `pytest` en la raíz):
+     - Proyecciones: horizontes 3-120 meses × carteras de 10-10k contratos
+     - Balance, excedentes y transferencias (3 escenarios)
+     - Ingesta de Utilization Reports de 1k a 1M filas
+     - Línea base JSON con --benchmark-autosave / --benchmark-compare (ver README)
+
+  🔧 spt_forecast.ingesta.procesar_utilization_dataframes(): las métricas de
+     procesar_utilization_reports() se calculan sin Streamlit (misma salida)
+
+🚀 VERSIÓN 7.0.0 - MOTOR DE CÁLCULO SIN STREAMLIT:
+==================================================
+
+  🧮 PAQUETE spt_forecast (importable sin ejecutar la UI):
+     - constantes: ESCENARIOS, TASAS_CRECIMIENTO, COMPONENTES_ESCENARIO, meses
+     - cartera: índice de intervalos de contratos/cotizaciones (recibe listas)
+     - proyecciones: generar_proyecciones_vectorizadas() con cartera y revenue
+       de equipos explícitos (default: cartera vacía)
+     - balance: runway, necesidades mínimas dinámicas, excedentes invertibles,
+       recomendaciones, transferencias trimestrales y balance multi-escenario
+     - simulacion: simular_monte_carlo() con índice de cartera explícito
+     - motor: proyectar_flujo_caja() → proyecciones, balances, excedentes,
+       recomendaciones y transferencias en una sola llamada
+
+  🔌 DASHBOARD:
+     - Mantiene sólo los adaptadores que leen st.session_state
+       (obtener_indice_cartera, obtener_proyecciones, calcular_revenue_adicional_*)
+     - Misma salida que v6.5.0: las funciones se movieron sin cambios de lógica
+
+🚀 VERSIÓN 6.5.0 - SIMULACIÓN MONTE CARLO:
+===========================================
+
+  🎲 NUEVO MODO ESTOCÁSTICO (Proyecciones > 🎲 Monte Carlo):
+     - simular_monte_carlo(): 10k-100k trayectorias en un solo array NumPy
+     - Crecimiento: bootstrap de retornos mes a mes del histórico desestacionalizado
+     - Cotizaciones: cierre Bernoulli por trayectoria según probabilidad_cierre
+     - Bandas P5/P50/P95 del balance y probabilidad de romper el colchón de
+       meses_colchon (necesidades mínimas dinámicas) y de efectivo negativo
+     - Semilla fija: resultados estables entre reruns
+
+🚀 VERSIÓN 6.4.2 - CACHE DE PROYECCIONES:
+==========================================
+
+  ⚡ RENDIMIENTO:
+     - obtener_proyecciones(): memoiza los 3 escenarios por huella SHA-256 de
+       revenue base, gastos fijos, tasa variable, factores estacionales, último
+       mes histórico, año base y versión de la cartera
+     - Una entrada de 12 meses sirve 3 o 6 meses como prefijo (sin recalcular)
+     - Desalojo LRU (MAX_ENTRADAS_CACHE_PROYECCIONES = 32)
+     - Resumen Ejecutivo, Proyecciones y Reportes comparten el mismo cache
+     - Hits/misses visibles en el expander "DEBUG: Proyecciones por Escenario"
+
+🚀 VERSIÓN 6.4.1 - ÍNDICE DE INTERVALOS DE LA CARTERA:
+=======================================================
+
+  ⚡ RENDIMIENTO:
+     - compilar_indice_cartera(): contratos y cotizaciones → intervalos de
+       ordinales de mes (año × 12 + mes - 1) con sumas de prefijo de revenue
+       y costos sobre los puntos de cambio
+     - consultar_indice_cartera(): revenue/costos vigentes por mes en O(log n)
+       (búsqueda binaria vectorizada con np.searchsorted)
+     - calcular_revenue_adicional_por_mes() y el motor vectorizado consultan el
+       índice en vez de recorrer la cartera y parsear fechas ISO
+     - El índice vive en session_state y sólo se reconstruye cuando cambia
+       version_cartera (marcar_cartera_modificada() al agregar/eliminar)
+
+🚀 VERSIÓN 6.4.0 - MOTOR VECTORIZADO DE PROYECCIONES:
+======================================================
+
+  ⚡ RENDIMIENTO:
+     - Nuevo generar_proyecciones_vectorizadas(): 3 escenarios × N meses en una
+       sola pasada NumPy (crecimiento, estacionalidad, vigencia y costos
+       variables como operaciones de arrays)
+     - Fechas ISO de contratos/cotizaciones se parsean UNA vez por llamada
+       (antes: una vez por mes, por escenario, por tab)
+     - generar_proyecciones_por_escenario() mantiene su firma y columnas, ahora
+       delega al motor vectorizado
+     - Tabs Proyecciones y Reportes calculan los 3 escenarios con una sola llamada
+     - Eliminado el volcado de debug por contrato dentro del cálculo de proyecciones
+
+🚀 VERSIÓN 6.3.3 - INGESTA PARALELA OPCIONAL:
+==============================================
+
+  ⚡ RENDIMIENTO:
+     - Nuevo paquete spt_forecast/ (sin Streamlit): spt_forecast.ingesta
+     - procesar_archivos_reales(files_dict, paralelo=True) reparte los bytes de
+       cada workbook en un ProcessPoolExecutor (contexto 'spawn')
+     - Los DataFrames de los workers precargan el cache de Excel (v6.3.0)
+     - Errores reportados POR ARCHIVO; el procesador correspondiente reintenta
+       en secuencial y mantiene sus fallbacks (ej: backup $65,732)
+     - Checkbox "⚡ Procesamiento paralelo" en Carga de Datos (desactivado por defecto)
+
+🚀 VERSIÓN 6.3.2 - SNAPSHOTS PARQUET PARA RECARGA INSTANTÁNEA:
+===============================================================
+
+  ⚡ RENDIMIENTO:
+     - guardar_snapshot(): df_completo, revenue mensual e histórico en Parquet
+       + parámetros financieros/estacionales/equipos en metadata.json
+     - Snapshots versionados (VERSION_SNAPSHOT + hash de los Excel de origen)
+       en data/cache/snapshots/ (ignorado por git), publicados atómicamente
+     - cargar_snapshot(): lectura con memory_map, reconstruye datos_procesados
+     - Nuevo expander "⚡ Carga Rápida desde Snapshot" en Carga de Datos
+     - Opt-in: checkbox "Guardar snapshot local" (pyarrow opcional)
+
+🚀 VERSIÓN 6.3.1 - INGESTA DE EXCEL EN UNA SOLA PASADA:
+========================================================
+
+  ⚡ RENDIMIENTO:
+     - procesar_utilization_reports() construye en la misma pasada: revenue
+       mensual, set de clientes y tarifas promedio por equipo (2025)
+     - procesar_weekly_operation() construye equipos por estado y la lista de
+       equipos disponibles (Available/StandBy/Backup)
+     - Todo queda en datos_procesados: historical['clientes'],
+       historical['revenue_mensual'], equipment['equipos_disponibles'], tarifas_equipos
+     - extraer_*_from_data() y obtener_tarifas_sugeridas_por_equipo() leen
+       primero de datos_procesados (fallback: archivo vía cache)
+     - "Procesar Datos" lee UNA vez cada archivo (antes 3 a 5 lecturas)
+
+🚀 VERSIÓN 6.3.0 - CACHE DE LECTURA DE EXCEL POR CONTENIDO:
+============================================================
+
+  ⚡ RENDIMIENTO:
+     - Nuevo leer_excel_cacheado(): cada workbook se parsea UNA vez por versión
+       de contenido (clave = SHA-256 de los bytes + hoja + header)
+     - procesar_utilization_reports(), extraer_clientes_from_data() y
+       obtener_tarifas_sugeridas_por_equipo() comparten el mismo DataFrame
+     - Mover un slider ya no re-ejecuta openpyxl sobre los ~30k registros
+     - Cache en session_state con desalojo LRU (MAX_ENTRADAS_CACHE_EXCEL)
+
 🚀 VERSIÓN 6.2.4 - NUEVOS GRÁFICOS DE FLUJO DE CAJA (Noviembre 11, 2025):
 ==========================================================================
 
@@ -998,6 +1295,18 @@ import numpy as np
 from io import BytesIO
 from pathlib import Path
 import sys
+import functools
+import hashlib
+import json
+import logging
+import os
+import shutil
+
+# 🆕 v7.5.1: Registro estructurado (niveles con SPT_LOG_LEVEL, JSON con SPT_LOG_FORMAT=json)
+from spt_forecast.registro import con_campos, configurar_registro, cronometrar, muestrear, obtener_logger
+
+configurar_registro()
+logger = obtener_logger('dashboard')
 
 # 🆕 v4.9.3.1: Imports para parsers reales
 try:
@@ -1010,84 +1319,298 @@ try:
     PARSERS_DISPONIBLES = True
 except ImportError:
     PARSERS_DISPONIBLES = False
-    print("⚠️ Parsers no disponibles - usando datos simulados")
+    logger.warning("Parsers no disponibles - usando datos simulados")
+
+# 🆕 v6.3.3: Ingesta paralela (workers importan este módulo, no el dashboard)
+from spt_forecast.ingesta import (
+    construir_clientes_desde_df,
+    construir_equipos_disponibles_desde_df,
+    construir_tarifas_desde_df,
+    parsear_workbooks_en_paralelo,
+    combinar_utilization_dataframes,
+    procesar_utilization_dataframes,
+)
+
+# 🆕 v7.0.0: Motor de cálculo sin Streamlit (proyecciones, cartera, balance, Monte Carlo)
+from spt_forecast.balance import calcular_runway_mejorado
+from spt_forecast.backtest import (
+    ESTACIONALIDAD_EN_MUESTRA,
+    HORIZONTES_BACKTEST,
+    MIN_MESES_ENTRENAMIENTO,
+    ejecutar_backtest,
+    mejor_configuracion,
+)
+from spt_forecast.cartera import (
+    calcular_revenue_equipos_50pct,
+    compilar_indice_cartera,
+    consultar_indice_cartera,
+    ordinal_mes,
+)
+from spt_forecast.constantes import ESCENARIOS
+from spt_forecast.estacionalidad import (
+    actualizar_almacen_en_disco,
+    actualizar_almacen_estacional,
+    calcular_factores_estacionales,
+    calcular_seasonal_by_year,
+    clave_fuente,
+    huella_factores,
+)
+from spt_forecast.grafo import (
+    definir_entrada,
+    definir_nodo,
+    evaluar,
+    fijar_entrada,
+    obtener_estadisticas_grafo,
+)
+from spt_forecast.granularidad import (
+    DIAS_COBRO_DEFAULT,
+    generar_proyecciones_diarias,
+    proyeccion_diaria_a_dataframe,
+)
+from spt_forecast.motor import crear_grafo_flujo_caja
+from spt_forecast.pronostico import (
+    BACKENDS,
+    MIN_MESES_ESTADISTICOS,
+    ajustar_backend,
+    backend_disponible,
+    evaluar_backends,
+    huella_serie,
+    obtener_estadisticas_cache_ajustes,
+    pronosticar,
+)
+from spt_forecast.perfilador import (
+    agregar_a_historial,
+    finalizar_perfil,
+    iniciar_perfil,
+    medir_seccion,
+    perfil_activo,
+    perfilar,
+)
+from spt_forecast.proyecciones import generar_proyecciones_vectorizadas
+from spt_forecast.simulacion import SEMILLA_MONTE_CARLO, simular_monte_carlo
+from spt_forecast.submuestreo import MAX_PUNTOS_GRAFICO, submuestrear_min_max
+
+# 🆕 v7.5.0: Funciones calientes del motor y de render, perfiladas (ver spt_forecast.perfilador).
+# Sin un perfil activo la envoltura solo consulta un threading.local.
+generar_proyecciones_vectorizadas = perfilar(generar_proyecciones_vectorizadas)
+generar_proyecciones_diarias = perfilar(generar_proyecciones_diarias)
+simular_monte_carlo = perfilar(simular_monte_carlo)
+parsear_workbooks_en_paralelo = perfilar(parsear_workbooks_en_paralelo)
+procesar_utilization_dataframes = perfilar(procesar_utilization_dataframes)
+mostrar_grafico = perfilar(st.plotly_chart, nombre='st.plotly_chart')
+mostrar_tabla = perfilar(st.dataframe, nombre='st.dataframe')
+
+# 🆕 v7.1.0: Horizontes máximos (5 años)
+MAX_MESES_PROYECCION = 60
+MAX_SEMANAS_PROYECCION = 260
+MAX_DIAS_PROYECCION = 1825
+
+# 🆕 v6.3.2: Snapshots Parquet (opcional - requiere pyarrow)
+try:
+    import pyarrow  # noqa: F401
+    PARQUET_DISPONIBLE = True
+except ImportError:
+    PARQUET_DISPONIBLE = False
+    logger.warning("pyarrow no disponible - snapshots Parquet deshabilitados")
 
 # =============================================================================
 # PROCESAMIENTO DE ARCHIVOS REALES - v4.7.0
 # =============================================================================
 
+# 🆕 v6.3.0: Cache de lectura de Excel por contenido (SHA-256)
+# Cada rerun de Streamlit volvía a decodificar los mismos workbooks con openpyxl.
+# Ahora cada archivo se lee UNA sola vez por versión de contenido y todos los
+# consumidores (procesamiento, clientes, tarifas) comparten el mismo DataFrame.
+MAX_ENTRADAS_CACHE_EXCEL = 16
+
+
+def calcular_hash_archivo(archivo):
+    """
+    🆕 v6.3.0: Calcula el SHA-256 del contenido de un archivo cargado
+
+    Args:
+        archivo: UploadedFile de Streamlit (o cualquier objeto tipo archivo)
+
+    Returns:
+        tuple (hash_hex, contenido_bytes)
+    """
+    if hasattr(archivo, 'getvalue'):
+        contenido = archivo.getvalue()
+    else:
+        archivo.seek(0)
+        contenido = archivo.read()
+        archivo.seek(0)
+    return hashlib.sha256(contenido).hexdigest(), contenido
+
+
+@perfilar
+def leer_excel_cacheado(archivo, sheet_name=0, header=0):
+    """
+    🆕 v6.3.0: Lee un Excel usando cache por hash de contenido en session_state
+
+    La clave es (sha256, hoja, header): si el usuario vuelve a cargar el mismo
+    archivo (o simplemente mueve un slider) no se vuelve a parsear. Las entradas
+    se desalojan en orden LRU al superar MAX_ENTRADAS_CACHE_EXCEL.
+
+    IMPORTANTE: El DataFrame retornado es compartido entre consumidores,
+    no debe modificarse in-place (usar .copy() o columnas derivadas).
+    """
+    if 'cache_excel' not in st.session_state:
+        st.session_state.cache_excel = {}
+    cache = st.session_state.cache_excel
+
+    sha256, contenido = calcular_hash_archivo(archivo)
+    clave = (sha256, sheet_name, header)
+
+    if clave in cache:
+        # Mover al final (más reciente) para política LRU
+        df = cache.pop(clave)
+        cache[clave] = df
+        return df
+
+    df = pd.read_excel(BytesIO(contenido), sheet_name=sheet_name, header=header)
+    guardar_en_cache_excel(clave, df)
+    logger.info("Excel parseado y cacheado", extra=con_campos(sha256=sha256[:12], hoja=sheet_name, filas=len(df)))
+
+    return df
+
+
+def guardar_en_cache_excel(clave, df):
+    """
+    🆕 v6.3.3: Inserta un DataFrame ya parseado en el cache de Excel
+    (usado por la ingesta paralela para precargar resultados de los workers)
+    
+    Args:
+        clave: tuple (sha256, sheet_name, header)
+        df: DataFrame parseado
+    """
+    if 'cache_excel' not in st.session_state:
+        st.session_state.cache_excel = {}
+    cache = st.session_state.cache_excel
+    
+    cache.pop(clave, None)
+    cache[clave] = df
+    
+    while len(cache) > MAX_ENTRADAS_CACHE_EXCEL:
+        cache.pop(next(iter(cache)))
+
+
+# 🆕 v6.3.3: Hoja y fila de encabezado que lee cada procesador de archivos
+ESPECIFICACION_HOJAS = {
+    'file_2023': {'sheet_name': 0, 'header': 0},
+    'file_2024': {'sheet_name': 0, 'header': 0},
+    'file_2025': {'sheet_name': 0, 'header': 0},
+    'file_weekly': {'sheet_name': 'Sheet1', 'header': 0},
+    'file_financial': {'sheet_name': 'td', 'header': 5}
+}
+
+NOMBRES_ARCHIVOS = {
+    'file_2023': 'Utilization Report 2023',
+    'file_2024': 'Utilization Report 2024',
+    'file_2025': 'Utilization Report 2025',
+    'file_weekly': 'Weekly Operation Report',
+    'file_financial': 'Estado Financiero'
+}
+
+# 🆕 v7.5.2: Fuente de datos por defecto (clave estable del almacén estacional)
+FUENTE_DATOS_DEFAULT = 'SPT Colombia'
+
+
+@perfilar
+def precargar_workbooks_en_paralelo(files_dict):
+    """
+    🆕 v6.3.3: Parsea en paralelo (ProcessPoolExecutor) los workbooks que aún
+    no están en cache y deja los DataFrames listos en el cache de Excel
+    
+    Los procesadores (procesar_utilization_reports, procesar_informe_financiero,
+    procesar_weekly_operation) se ejecutan después sin cambios: encuentran los
+    DataFrames en cache. Si un archivo falla en el worker, su procesador lo
+    vuelve a intentar y aplica sus fallbacks habituales (ej: valores de backup).
+    
+    Args:
+        files_dict: diccionario con los 5 archivos cargados
+    
+    Returns:
+        dict {clave_archivo: mensaje_error} de los archivos que fallaron
+    """
+    cache = st.session_state.get('cache_excel', {})
+    trabajos = {}
+    claves_cache = {}
+    
+    for clave_archivo, archivo in files_dict.items():
+        especificacion = ESPECIFICACION_HOJAS.get(clave_archivo)
+        if archivo is None or especificacion is None:
+            continue
+        sha256, contenido = calcular_hash_archivo(archivo)
+        clave_cache = (sha256, especificacion['sheet_name'], especificacion['header'])
+        if clave_cache in cache:
+            continue  # Ya parseado en un rerun anterior
+        claves_cache[clave_archivo] = clave_cache
+        trabajos[clave_archivo] = dict(especificacion, contenido=contenido)
+    
+    if not trabajos:
+        logger.debug("Ingesta paralela: todos los archivos ya estaban en cache")
+        return {}
+    
+    with cronometrar(logger, "Ingesta paralela", archivos=len(trabajos)):
+        resultados, errores = parsear_workbooks_en_paralelo(trabajos)
+    
+    for clave_archivo, df in resultados.items():
+        guardar_en_cache_excel(claves_cache[clave_archivo], df)
+        logger.info("Archivo parseado", extra=con_campos(
+            archivo=NOMBRES_ARCHIVOS.get(clave_archivo, clave_archivo), filas=len(df)))
+    for clave_archivo, error in errores.items():
+        logger.error("Archivo con error en la ingesta paralela", extra=con_campos(
+            archivo=NOMBRES_ARCHIVOS.get(clave_archivo, clave_archivo), error=error))
+    
+    return errores
+
+
 def procesar_utilization_reports(file_2023, file_2024, file_2025):
     """
     Procesa los 3 Utilization Reports y extrae métricas clave
     
+    🆕 v6.3.1: Ingesta de una sola pasada - además de las métricas de revenue
+    construye el set de clientes y las tarifas por equipo (2025) sobre los
+    mismos DataFrames, sin volver a abrir los archivos.
+    
     Returns:
-        dict con revenue mensual, clientes, estacionalidad
+        dict con revenue mensual, clientes, estacionalidad, tarifas por equipo
     """
     try:
-        print("\n📥 Iniciando procesamiento de Utilization Reports...")
-        
         # Leer los 3 archivos
-        df_2023 = pd.read_excel(file_2023, sheet_name=0)
-        print(f"   ✅ Archivo 2023 leído: {len(df_2023)} filas")
-        
-        df_2024 = pd.read_excel(file_2024, sheet_name=0)
-        print(f"   ✅ Archivo 2024 leído: {len(df_2024)} filas")
-        
-        df_2025 = pd.read_excel(file_2025, sheet_name=0)
-        print(f"   ✅ Archivo 2025 leído: {len(df_2025)} filas")
-        
-        # Combinar todos los datos
-        df_all = pd.concat([df_2023, df_2024, df_2025], ignore_index=True)
-        print(f"   ✅ Total combinado: {len(df_all)} filas")
-        
-        # Limpiar nombres de columnas
-        df_all.columns = df_all.columns.str.strip()
-        print(f"   📋 Columnas: {list(df_all.columns)}")
-        
-        # Convertir Date a datetime
-        df_all['Date'] = pd.to_datetime(df_all['Date'])
-        df_all['Year'] = df_all['Date'].dt.year
-        df_all['Month'] = df_all['Date'].dt.month
-        
-        # Convertir Accrual Revenue a numérico
-        df_all['Accrual Revenue'] = pd.to_numeric(df_all['Accrual Revenue'], errors='coerce')
-        print(f"   💰 Rango de Accrual Revenue: ${df_all['Accrual Revenue'].min():,.2f} - ${df_all['Accrual Revenue'].max():,.2f}")
-        
-        # 1. Revenue mensual total
-        revenue_mensual = df_all.groupby(['Year', 'Month'])['Accrual Revenue'].sum().reset_index()
-        revenue_mensual['Year-Month'] = revenue_mensual['Year'].astype(str) + '-' + revenue_mensual['Month'].astype(str).str.zfill(2)
-        print(f"   📊 Periodos encontrados: {len(revenue_mensual)}")
-        
-        # 2. Revenue promedio
-        revenue_promedio = revenue_mensual['Accrual Revenue'].mean()
-        print(f"   📈 Revenue promedio mensual: ${revenue_promedio:,.2f}")
-        
-        # 3. Top clientes (últimos 12 meses)
-        df_recent = df_all[df_all['Date'] >= df_all['Date'].max() - pd.DateOffset(months=12)]
-        top_clientes = df_recent.groupby('Client')['Accrual Revenue'].sum().sort_values(ascending=False).head(10)
-        print(f"   👥 Top clientes encontrados: {len(top_clientes)}")
-        
-        # 4. Estacionalidad (promedio por mes del año)
-        estacionalidad = df_all.groupby('Month')['Accrual Revenue'].mean()
+        df_2023 = leer_excel_cacheado(file_2023, sheet_name=0)
+        df_2024 = leer_excel_cacheado(file_2024, sheet_name=0)
+        df_2025 = leer_excel_cacheado(file_2025, sheet_name=0)
+        
+        # 🆕 v7.0.1: Métricas calculadas en spt_forecast.ingesta (sin Streamlit)
+        with cronometrar(logger, "Utilization Reports procesados", filas_2023=len(df_2023),
+                         filas_2024=len(df_2024), filas_2025=len(df_2025)):
+            # 🆕 v7.5.2: Resumen por archivo memoizado por SHA-256 (solo se
+            # recorren las filas de los archivos que cambiaron)
+            resultado = procesar_utilization_dataframes(
+                df_2023, df_2024, df_2025,
+                huellas=[calcular_hash_archivo(f)[0] for f in (file_2023, file_2024, file_2025)]
+            )
         
-        # 5. Revenue por año
-        revenue_anual = df_all.groupby('Year')['Accrual Revenue'].sum()
+        if logger.isEnabledFor(logging.DEBUG):
+            df_all = combinar_utilization_dataframes(resultado['dataframes'])
+            logger.debug("Columnas Utilization: %s", list(df_all.columns))
+            logger.debug("Utilization Reports combinados", extra=con_campos(
+                filas=len(df_all),
+                accrual_min=float(df_all['Accrual Revenue'].min()),
+                accrual_max=float(df_all['Accrual Revenue'].max()),
+                periodos=len(resultado['revenue_mensual']),
+                revenue_promedio=round(resultado['revenue_promedio'], 2),
+                top_clientes=len(resultado['top_clientes']),
+                clientes=len(resultado['clientes']),
+                tipos_equipo_con_tarifa=len(resultado['tarifas_equipos'])
+            ))
         
-        print("   ✅ Procesamiento de Utilization Reports completado\n")
-        
-        return {
-            'revenue_mensual': revenue_mensual,
-            'revenue_promedio': revenue_promedio,
-            'top_clientes': top_clientes.to_dict(),
-            'estacionalidad': estacionalidad.to_dict(),
-            'revenue_anual': revenue_anual.to_dict(),
-            'df_completo': df_all
-        }
+        return resultado
         
     except Exception as e:
-        print(f"   ❌ ERROR en procesar_utilization_reports: {str(e)}")
-        import traceback
-        print(traceback.format_exc())
+        logger.exception("Error en procesar_utilization_reports: %s", e)
         st.error(f"Error procesando Utilization Reports: {str(e)}")
         return None
 
@@ -1100,21 +1623,16 @@ def procesar_informe_financiero(file_financial):
     """
     try:
         # Leer hoja 'td' con datos mensuales
-        df_td = pd.read_excel(file_financial, sheet_name='td', header=5)
+        df_td = leer_excel_cacheado(file_financial, sheet_name='td', header=5)
         
         # ✅ v5.0.4: NOTA - No extraer revenue de informe financiero
         # El revenue debe venir de Utilization Reports (más confiable)
         # Solo extraer egresos del informe financiero
         
-        print("\n📄 PROCESANDO INFORME FINANCIERO:")
-        print("   💡 Revenue se tomará de Utilization Reports (más confiable)")
-        print("   🎯 Extrayendo solo EGRESOS del informe financiero...")
-        
         # Calcular egresos por categoría
         categorias_egresos = ['04 HR', '05 Logistics', '06 Marketing', '07 Admin', '08 Insurance', '09 Salary']
         egresos_fijos = 0
         
-        print("\n💰 EXTRAYENDO EGRESOS DEL INFORME FINANCIERO:")
         for categoria in categorias_egresos:
             cat_row = df_td[df_td.iloc[:, 0].str.contains(categoria, case=False, na=False)]
             if len(cat_row) > 0:
@@ -1134,34 +1652,32 @@ def procesar_informe_financiero(file_financial):
                 
                 if cat_values_clean:
                     promedio_cat = np.mean(cat_values_clean)
-                    print(f"   • {categoria}: ${promedio_cat:,.2f}/mes (promedio de {len(cat_values_clean)} valores)")
+                    logger.debug("Egreso por categoría", extra=con_campos(
+                        categoria=categoria, promedio_mensual=round(promedio_cat, 2), valores=len(cat_values_clean)))
                     
                     # ✅ v5.0.4: Validar que el valor sea razonable (> $500 y < 100k/mes por categoría)
                     if 500 < promedio_cat < 100000:
                         egresos_fijos += promedio_cat
                     else:
-                        print(f"   ⚠️ Valor fuera de rango razonable ($500-$100k), ignorado: ${promedio_cat:,.2f}")
+                        logger.warning("Egreso fuera de rango razonable ($500-$100k), ignorado", extra=con_campos(
+                            categoria=categoria, promedio_mensual=round(promedio_cat, 2)))
                 else:
-                    print(f"   ⚠️ {categoria}: No se encontraron valores válidos")
-        
-        print(f"\n   📊 TOTAL EGRESOS FIJOS EXTRAÍDOS: ${egresos_fijos:,.2f}/mes")
+                    logger.warning("Categoría de egresos sin valores válidos", extra=con_campos(categoria=categoria))
         
         # ✅ v5.0.4: Validar que egresos_fijos sea razonable (entre 30k y 150k/mes)
         # Rango ajustado basado en operación real de SPT Colombia
         if egresos_fijos < 30000 or egresos_fijos > 150000:
-            print(f"   ⚠️ Egresos totales fuera de rango esperado ($30k-$150k/mes): ${egresos_fijos:,.2f}")
-            print(f"   🔄 Usando valor de backup del backend: $65,732/mes")
+            logger.warning("Egresos fuera de rango esperado ($30k-$150k/mes): se usa el backup del backend",
+                           extra=con_campos(egresos_fijos=round(egresos_fijos, 2), backup=65732))
             egresos_fijos = 65732
         else:
-            print(f"   ✅ Egresos validados correctamente: ${egresos_fijos:,.2f}/mes")
+            logger.info("Egresos fijos extraídos del informe financiero",
+                        extra=con_campos(egresos_fijos=round(egresos_fijos, 2)))
         
         # ✅ v5.0.4: NO calcular burn_rate aquí (necesitamos revenue real de Utilization Reports)
         # Solo retornar egresos_fijos y tasa
         tasa_costos_variables = 0.0962
         
-        print(f"   ✅ Extracción de egresos completada")
-        print(f"   💡 Burn rate se calculará con revenue de Utilization Reports\n")
-        
         return {
             'gastos_fijos': egresos_fijos,
             'tasa_costos_variables': tasa_costos_variables,
@@ -1172,9 +1688,8 @@ def procesar_informe_financiero(file_financial):
         
     except Exception as e:
         st.error(f"Error procesando Informe Financiero: {str(e)}")
-        print(f"\n   ❌ ERROR procesando informe financiero: {str(e)}")
         # Retornar valores de backup desde backend analysis
-        print(f"   🔄 Usando valores de backup del backend")
+        logger.exception("Error procesando informe financiero, se usan valores de backup: %s", e)
         return {
             'gastos_fijos': 65732,
             'tasa_costos_variables': 0.0962,
@@ -1187,11 +1702,14 @@ def procesar_weekly_operation(file_weekly):
     """
     Procesa el Weekly Operation Report para estado de equipos
     
+    🆕 v6.3.1: También construye la lista de equipos disponibles en la misma
+    lectura (antes extraer_equipos_disponibles_from_data() volvía a abrir el archivo)
+    
     Returns:
-        dict con equipos por estado
+        dict con equipos por estado y lista de equipos disponibles
     """
     try:
-        df_weekly = pd.read_excel(file_weekly, sheet_name='Sheet1')
+        df_weekly = leer_excel_cacheado(file_weekly, sheet_name='Sheet1')
         
         # Contar equipos por estado
         if 'Status' in df_weekly.columns:
@@ -1205,10 +1723,14 @@ def procesar_weekly_operation(file_weekly):
         else:
             equipos_cliente = {}
         
+        # 🆕 v6.3.1: Equipos disponibles (Available/StandBy/Backup)
+        equipos_disponibles = construir_equipos_disponibles_desde_df(df_weekly)
+        
         return {
             'equipos_estado': equipos_estado,
             'equipos_cliente': equipos_cliente,
-            'total_equipos': len(df_weekly)
+            'total_equipos': len(df_weekly),
+            'equipos_disponibles': equipos_disponibles  # 🆕 v6.3.1
         }
         
     except Exception as e:
@@ -1216,20 +1738,77 @@ def procesar_weekly_operation(file_weekly):
         return {
             'equipos_estado': {},
             'equipos_cliente': {},
-            'total_equipos': 0
+            'total_equipos': 0,
+            'equipos_disponibles': []  # 🆕 v6.3.1
         }
 
-def procesar_archivos_reales(files_dict):
+@perfilar
+def obtener_almacen_estacional(files_dict, resumen_mensual, fuente=FUENTE_DATOS_DEFAULT, persistir=False):
+    """
+    🆕 v7.5.2: Almacén estacional de la fuente de datos (empresa)
+    
+    La clave es la fuente (clave_fuente()), estable entre cargas: un libro con
+    un mes nuevo actualiza el mismo almacén y sube su versión. Los SHA-256 de
+    los 3 Utilization Reports solo detectan si algún archivo cambió; si
+    ninguno cambió, el almacén se reutiliza sin recorrer el resumen. Los datos
+    de otra empresa van bajo otra fuente. El almacén vive en session_state;
+    solo con persistir=True se guarda en disco (un archivo por fuente).
+    
+    Returns:
+        tuple (almacen, meses_actualizados)
+    """
+    clave = clave_fuente(fuente)
+    hashes_archivos = [
+        calcular_hash_archivo(files_dict[archivo])[0] for archivo in ('file_2023', 'file_2024', 'file_2025')
+    ]
+    almacenes_sesion = st.session_state.setdefault('almacenes_estacionales', {})
+    
+    almacen = None
+    if persistir:
+        try:
+            almacen, meses_actualizados = actualizar_almacen_en_disco(
+                DIRECTORIO_ALMACENES_ESTACIONALES / f'{clave}.json', resumen_mensual,
+                hashes_archivos=hashes_archivos
+            )
+        except OSError as e:
+            logger.warning("No se pudo guardar el almacén estacional: %s", e)
+    if almacen is None:
+        almacen, meses_actualizados = actualizar_almacen_estacional(
+            almacenes_sesion.get(clave), resumen_mensual, reemplazar=True, hashes_archivos=hashes_archivos
+        )
+    
+    almacenes_sesion[clave] = almacen
+    logger.info("Almacén estacional actualizado", extra=con_campos(
+        fuente=clave, version=almacen['version'], meses_actualizados=meses_actualizados,
+        meses=len(almacen['meses']), en_disco=persistir))
+    return almacen, meses_actualizados
+
+
+def procesar_archivos_reales(files_dict, paralelo=False, persistir_estacionalidad=False,
+                             fuente_datos=FUENTE_DATOS_DEFAULT):
     """
     Función principal que procesa todos los archivos y genera datos integrados
     
     Args:
         files_dict: diccionario con los 5 archivos cargados
+        paralelo: 🆕 v6.3.3 - Si True, parsea los workbooks en un pool de procesos
+        persistir_estacionalidad: 🆕 v7.5.2 - Si True, guarda el almacén
+            estacional de la fuente en disco (opt-in, como los snapshots)
+        fuente_datos: 🆕 v7.5.2 - Empresa/fuente que identifica el almacén estacional
         
     Returns:
         dict con estructura compatible con get_data()
     """
     try:
+        # 🆕 v6.3.3: Ingesta paralela opcional (errores reportados por archivo)
+        if paralelo:
+            errores_ingesta = precargar_workbooks_en_paralelo(files_dict)
+            for clave_archivo, error in errores_ingesta.items():
+                st.warning(
+                    f"⚠️ {NOMBRES_ARCHIVOS.get(clave_archivo, clave_archivo)}: "
+                    f"falló la lectura en paralelo ({error}). Se reintenta en modo secuencial."
+                )
+        
         # 1. Procesar Utilization Reports
         util_data = procesar_utilization_reports(
             files_dict['file_2023'],
@@ -1246,53 +1825,29 @@ def procesar_archivos_reales(files_dict):
         # 3. Procesar Weekly Operation Report
         weekly_data = procesar_weekly_operation(files_dict['file_weekly'])
         
-        # 4. Calcular factores estacionales
-        estacionalidad = util_data['estacionalidad']
-        avg_revenue = np.mean(list(estacionalidad.values()))
-        
-        # 🆕 v6.0.5: Mejorar cálculo de factores estacionales con fallback
-        # Si hay menos de 12 meses de datos, usar factores reales conocidos
-        num_meses_datos = len(estacionalidad)
-        
-        # 🆕 v6.0.7: Nombres de meses para conversión de claves
-        meses_nombres = ['Enero', 'Febrero', 'Marzo', 'Abril', 'Mayo', 'Junio',
-                         'Julio', 'Agosto', 'Septiembre', 'Octubre', 'Noviembre', 'Diciembre']
+        # 4. 🆕 v7.2.0: Factores estacionales desde el almacén versionado
+        # Solo se incorporan los meses nuevos o modificados; los factores y los
+        # vectores por año se derivan de los acumulados en O(12)
+        # 🆕 v7.5.2: Un almacén por fuente de datos (session_state; disco solo con opt-in)
+        almacen_estacional, _ = obtener_almacen_estacional(
+            files_dict, util_data['resumen_mensual'], fuente=fuente_datos,
+            persistir=persistir_estacionalidad
+        )
         
-        if num_meses_datos >= 12:
-            # Suficientes datos: calcular factores de datos reales
-            # 🔧 v6.0.7: CORRECCIÓN CRÍTICA - Convertir claves numéricas a nombres de meses
-            seasonal_factors = {}
-            for mes_num, val in estacionalidad.items():
-                nombre_mes = meses_nombres[mes_num - 1]  # mes_num es 1-12
-                seasonal_factors[nombre_mes] = val / avg_revenue if avg_revenue > 0 else 1.0
-            print(f"   ✅ Factores estacionales calculados de {num_meses_datos} meses de datos reales")
+        # 🆕 v6.0.5: Si hay menos de 12 meses de datos, usar factores reales conocidos
+        seasonal_factors = calcular_factores_estacionales(almacen_estacional)
+        if seasonal_factors is not None:
+            version_estacional = {
+                'version': almacen_estacional['version'],
+                'huella': huella_factores(seasonal_factors)
+            }
         else:
-            # Pocos datos: usar factores reales conocidos
             seasonal_factors = get_real_seasonal_factors()
-            print(f"   ⚠️ Solo {num_meses_datos} meses de datos - Usando factores estacionales históricos conocidos")
-            print(f"   💡 Los factores históricos se basan en 33 meses de datos (2023-2025)")
-        
-        # ✅ v5.0.4: Calcular seasonal_by_year para años completos (2023, 2024)
-        seasonal_by_year = {}
-        df_completo = util_data['df_completo']
-        
-        # Calcular para cada año que tenga 12 meses completos
-        for year in [2023, 2024]:
-            df_year = df_completo[df_completo['Year'] == year]
-            if len(df_year['Month'].unique()) == 12:
-                # Revenue por mes para este año
-                revenue_por_mes = df_year.groupby('Month')['Accrual Revenue'].sum()
-                promedio_anual = revenue_por_mes.mean()
-                
-                # Calcular factores (revenue_mes / promedio_anual)
-                factores_12_meses = [revenue_por_mes.get(mes, promedio_anual) / promedio_anual 
-                                     for mes in range(1, 13)]
-                seasonal_by_year[year] = factores_12_meses
-                print(f"   ✅ Factores estacionales calculados para año {year}")
-        
-        # Año 2025 no se incluye (solo 9 meses: Ene-Sep)
-        print(f"   ⚠️ Año 2025 omitido (incompleto: solo 9 meses)")
+            version_estacional = {'version': None, 'huella': huella_factores(seasonal_factors)}
+            logger.info("Menos de 12 meses con datos: factores estacionales históricos conocidos (33 meses, 2023-2025)")
         
+        # ✅ v5.0.4: seasonal_by_year para años completos (12 meses)
+        seasonal_by_year = calcular_seasonal_by_year(almacen_estacional)
         
         # ✅ v5.0.3: Crear DataFrame histórico con estructura correcta para visualización
         df_revenue_mensual = util_data['revenue_mensual']
@@ -1304,7 +1859,6 @@ def procesar_archivos_reales(files_dict):
         # 🆕 v6.0.6: Obtener el último mes histórico para proyecciones correctas
         ultimo_mes_historico = int(df_revenue_mensual['Month'].iloc[-1])
         ultimo_anio_historico = int(df_revenue_mensual['Year'].iloc[-1])
-        print(f"   📅 Último mes histórico: {ultimo_anio_historico}-{ultimo_mes_historico:02d}")
         
         # Calcular métricas de revenue
         revenue_promedio = df_historical['revenue'].mean()
@@ -1312,14 +1866,10 @@ def procesar_archivos_reales(files_dict):
         revenue_maximo = df_historical['revenue'].max()
         periodos = len(df_historical)
         
-        # Debug logging
-        print(f"\n📊 DATOS PROCESADOS CORRECTAMENTE:")
-        print(f"   - Periodos: {periodos}")
-        print(f"   - Revenue promedio: ${revenue_promedio:,.2f}")
-        print(f"   - Revenue mínimo: ${revenue_minimo:,.2f}")
-        print(f"   - Revenue máximo: ${revenue_maximo:,.2f}")
-        print(f"   - DataFrame shape: {df_historical.shape}")
-        print(f"   - Primeros periodos: {df_historical['periodo'].head(3).tolist()}")
+        logger.info("Histórico de revenue procesado", extra=con_campos(
+            periodos=periodos, ultimo_mes=f"{ultimo_anio_historico}-{ultimo_mes_historico:02d}",
+            revenue_promedio=round(revenue_promedio, 2), revenue_minimo=round(revenue_minimo, 2),
+            revenue_maximo=round(revenue_maximo, 2), anios_estacionales=list(seasonal_by_year)))
         
         # ✅ v5.0.4: Calcular burn_rate y margen operativo con revenue REAL de Utilization Reports
         gastos_fijos = financial_data['gastos_fijos']
@@ -1343,22 +1893,19 @@ def procesar_archivos_reales(files_dict):
         burn_rate = burn_rate_base + costos_contratos_promedio  # 🆕 v6.2.1: Incluir costos específicos
         margen_operativo = 1 - (burn_rate / revenue_promedio) if revenue_promedio > 0 else 0
         
-        print(f"\n💰 DATOS FINANCIEROS CALCULADOS:")
-        print(f"   - Gastos Fijos: ${gastos_fijos:,.2f}/mes")
-        print(f"   - Tasa Costos Variables: {tasa_costos_variables*100:.2f}%")
-        print(f"   - Revenue Promedio (Utilization): ${revenue_promedio:,.2f}/mes")
-        print(f"   - Costos Variables: ${revenue_promedio * tasa_costos_variables:,.2f}/mes")
-        print(f"   - Costos Contratos (promedio 3m): ${costos_contratos_promedio:,.2f}/mes")  # 🆕 v6.2.1
-        print(f"   - Burn Rate TOTAL: ${burn_rate:,.2f}/mes")
-        print(f"   - Margen Operativo: {margen_operativo*100:.1f}%")
+        campos_financieros = con_campos(
+            gastos_fijos=round(gastos_fijos, 2),
+            tasa_costos_variables=tasa_costos_variables,
+            costos_variables=round(revenue_promedio * tasa_costos_variables, 2),
+            costos_contratos_3m=round(costos_contratos_promedio, 2),  # 🆕 v6.2.1
+            burn_rate=round(burn_rate, 2),
+            margen_operativo=round(margen_operativo, 4)
+        )
+        logger.info("Datos financieros calculados", extra=campos_financieros)
         
         # Validar margen operativo
         if margen_operativo < 0.20 or margen_operativo > 0.60:
-            print(f"   ⚠️ ADVERTENCIA: Margen operativo fuera de rango esperado (20%-60%)")
-        else:
-            print(f"   ✅ Margen operativo dentro del rango esperado")
-        
-        print()
+            logger.warning("Margen operativo fuera de rango esperado (20%-60%)", extra=campos_financieros)
         
         # 5. Estructurar datos en formato compatible
         datos_procesados = {
@@ -1372,7 +1919,12 @@ def procesar_archivos_reales(files_dict):
                 'revenue_anual': util_data['revenue_anual'],
                 'years_data': {},  # Se puede agregar más detalle si se necesita
                 'ultimo_mes': ultimo_mes_historico,  # 🆕 v6.0.6: Para proyecciones correctas
-                'ultimo_anio': ultimo_anio_historico  # 🆕 v6.0.6: Para referencia
+                'ultimo_anio': ultimo_anio_historico,  # 🆕 v6.0.6: Para referencia
+                'revenue_mensual': df_revenue_mensual,  # 🆕 v6.3.1: Year/Month/Accrual Revenue
+                'clientes': util_data['clientes'],  # 🆕 v6.3.1: Ingesta de una sola pasada
+                # 🆕 v7.5.2: Utilization Reports leídos; df_completo se arma
+                # solo al guardar un snapshot (combinar_utilization_dataframes)
+                'utilization_dataframes': util_data['dataframes']
             },
             'financial': {
                 'gastos_fijos': gastos_fijos,  # ✅ v5.0.4: Calculado correctamente
@@ -1383,7 +1935,9 @@ def procesar_archivos_reales(files_dict):
             },
             'seasonal_factors': seasonal_factors,  # ✅ v5.0.3: En nivel raíz para compatibilidad
             'seasonal_by_year': seasonal_by_year,  # ✅ v5.0.4: Calculado para años completos
-            'equipment': weekly_data,
+            'seasonal_version': version_estacional,  # 🆕 v7.2.0: Versión del almacén estacional
+            'equipment': weekly_data,  # 🆕 v6.3.1: Incluye 'equipos_disponibles'
+            'tarifas_equipos': util_data['tarifas_equipos'],  # 🆕 v6.3.1
             'metadata': {
                 'fecha_procesamiento': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
                 'archivos_procesados': list(files_dict.keys())
@@ -1396,6 +1950,201 @@ def procesar_archivos_reales(files_dict):
         st.error(f"Error en procesamiento general: {str(e)}")
         return None
 
+# =============================================================================
+# 🆕 v6.3.2: SNAPSHOTS PARQUET DE DATOS PROCESADOS
+# =============================================================================
+# Después de un "Procesar Datos" exitoso, los DataFrames consolidados se guardan
+# en formato columnar (Parquet) y el resto de datos_procesados en JSON.
+# Una sesión nueva puede recargar el snapshot (memory-map) en milisegundos en vez
+# de volver a subir y parsear los 5 archivos Excel.
+#
+# Estructura en disco (data/cache/ está en .gitignore):
+#   data/cache/snapshots/snapshot_YYYYMMDD_HHMMSS_<hash>/
+#       df_completo.parquet       → filas consolidadas de Utilization Reports
+#       revenue_mensual.parquet   → Year / Month / Accrual Revenue / Year-Month
+#       historico.parquet         → periodo / revenue (df_historical)
+#       metadata.json             → financial, seasonal, equipment, clientes, etc.
+
+DIRECTORIO_SNAPSHOTS = Path(__file__).resolve().parent / 'data' / 'cache' / 'snapshots'
+
+# 🆕 v7.2.0: Almacén estacional persistente (acumulados por mes, versionado)
+# 🆕 v7.5.2: Un archivo por fuente de datos y solo si el usuario lo solicita
+DIRECTORIO_ALMACENES_ESTACIONALES = Path(__file__).resolve().parent / 'data' / 'cache' / 'estacionalidad'
+VERSION_SNAPSHOT = 1  # Incrementar si cambia la estructura de datos_procesados
+
+
+def _preparar_df_para_parquet(df):
+    """
+    🆕 v6.3.2: Convierte columnas object con tipos mezclados (ej: Client con
+    números y textos) a string para que Arrow pueda serializarlas
+    """
+    df = df.copy()
+    for col in df.columns:
+        if df[col].dtype == object:
+            tipo = pd.api.types.infer_dtype(df[col], skipna=True)
+            if tipo not in ('string', 'empty'):
+                df[col] = df[col].astype('string')
+    # Parquet requiere nombres de columna string
+    df.columns = [str(c) for c in df.columns]
+    return df
+
+
+def guardar_snapshot(datos_procesados, hashes_archivos=None):
+    """
+    🆕 v6.3.2: Persiste datos_procesados como snapshot versionado en disco
+    
+    Args:
+        datos_procesados: dict retornado por procesar_archivos_reales()
+        hashes_archivos: dict {clave_archivo: sha256} de los Excel de origen
+    
+    Returns:
+        Path del snapshot creado o None si no fue posible
+    """
+    if not PARQUET_DISPONIBLE:
+        logger.warning("Snapshot omitido: pyarrow no está instalado")
+        return None
+    
+    try:
+        hashes_archivos = hashes_archivos or {}
+        huella = hashlib.sha256(
+            json.dumps(hashes_archivos, sort_keys=True).encode()
+        ).hexdigest()[:12]
+        nombre = f"snapshot_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{huella}"
+        
+        DIRECTORIO_SNAPSHOTS.mkdir(parents=True, exist_ok=True)
+        destino = DIRECTORIO_SNAPSHOTS / nombre
+        temporal = DIRECTORIO_SNAPSHOTS / f".{nombre}.tmp"
+        temporal.mkdir(parents=True, exist_ok=True)
+        
+        historical = datos_procesados['historical']
+        
+        # 1. DataFrames en formato columnar
+        df_completo = historical.get('df_completo')
+        if df_completo is None and historical.get('utilization_dataframes') is not None:
+            df_completo = combinar_utilization_dataframes(historical['utilization_dataframes'])
+        if df_completo is not None:
+            _preparar_df_para_parquet(df_completo).to_parquet(
+                temporal / 'df_completo.parquet', index=False)
+        if historical.get('revenue_mensual') is not None:
+            _preparar_df_para_parquet(historical['revenue_mensual']).to_parquet(
+                temporal / 'revenue_mensual.parquet', index=False)
+        _preparar_df_para_parquet(historical['data']).to_parquet(
+            temporal / 'historico.parquet', index=False)
+        
+        # 2. Resto de la estructura en JSON (sin DataFrames)
+        historical_meta = {
+            k: v for k, v in historical.items()
+            if k not in ('data', 'df_completo', 'revenue_mensual', 'utilization_dataframes')
+        }
+        metadata = {
+            'version_snapshot': VERSION_SNAPSHOT,
+            'fecha_snapshot': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            'hashes_archivos': hashes_archivos,
+            'historical': historical_meta,
+            'financial': datos_procesados['financial'],
+            'seasonal_factors': datos_procesados['seasonal_factors'],
+            'seasonal_by_year': datos_procesados['seasonal_by_year'],
+            'seasonal_version': datos_procesados.get('seasonal_version'),
+            'equipment': datos_procesados['equipment'],
+            'tarifas_equipos': datos_procesados.get('tarifas_equipos', {}),
+            'metadata': datos_procesados['metadata']
+        }
+        with open(temporal / 'metadata.json', 'w', encoding='utf-8') as f:
+            json.dump(metadata, f, ensure_ascii=False, indent=2, default=float)
+        
+        # 3. Publicar de forma atómica (un snapshot a medio escribir nunca es visible)
+        temporal.rename(destino)
+        logger.info("Snapshot guardado", extra=con_campos(destino=str(destino)))
+        return destino
+    
+    except Exception as e:
+        logger.warning("Error guardando snapshot: %s", e)
+        if 'temporal' in locals() and temporal.exists():
+            shutil.rmtree(temporal, ignore_errors=True)
+        return None
+
+
+def listar_snapshots():
+    """
+    🆕 v6.3.2: Lista los snapshots compatibles disponibles (más reciente primero)
+    
+    Returns:
+        Lista de dicts con {ruta, nombre, fecha, periodos}
+    """
+    snapshots = []
+    if not DIRECTORIO_SNAPSHOTS.exists():
+        return snapshots
+    
+    for ruta in sorted(DIRECTORIO_SNAPSHOTS.glob('snapshot_*'), reverse=True):
+        archivo_meta = ruta / 'metadata.json'
+        if not archivo_meta.exists():
+            continue
+        try:
+            with open(archivo_meta, encoding='utf-8') as f:
+                metadata = json.load(f)
+        except (OSError, ValueError):
+            continue
+        if metadata.get('version_snapshot') != VERSION_SNAPSHOT:
+            continue
+        snapshots.append({
+            'ruta': ruta,
+            'nombre': ruta.name,
+            'fecha': metadata.get('fecha_snapshot', ''),
+            'periodos': metadata.get('historical', {}).get('periodos', 0)
+        })
+    return snapshots
+
+
+def cargar_snapshot(ruta):
+    """
+    🆕 v6.3.2: Reconstruye datos_procesados desde un snapshot en disco
+    
+    Los Parquet se leen con memory_map=True (sin copiar el archivo completo
+    a memoria antes de decodificar).
+    
+    Returns:
+        dict con la misma estructura de procesar_archivos_reales() o None
+    """
+    if not PARQUET_DISPONIBLE:
+        return None
+    
+    try:
+        ruta = Path(ruta)
+        with open(ruta / 'metadata.json', encoding='utf-8') as f:
+            metadata = json.load(f)
+        
+        if metadata.get('version_snapshot') != VERSION_SNAPSHOT:
+            logger.warning("Snapshot con versión incompatible", extra=con_campos(snapshot=ruta.name))
+            return None
+        
+        historical = dict(metadata['historical'])
+        historical['data'] = pd.read_parquet(ruta / 'historico.parquet', memory_map=True)
+        if (ruta / 'revenue_mensual.parquet').exists():
+            historical['revenue_mensual'] = pd.read_parquet(ruta / 'revenue_mensual.parquet', memory_map=True)
+        if (ruta / 'df_completo.parquet').exists():
+            historical['df_completo'] = pd.read_parquet(ruta / 'df_completo.parquet', memory_map=True)
+        
+        # JSON convierte claves numéricas a string: restaurar años como int
+        historical['revenue_anual'] = {int(k): v for k, v in historical.get('revenue_anual', {}).items()}
+        seasonal_by_year = {int(k): v for k, v in metadata.get('seasonal_by_year', {}).items()}
+        
+        datos_procesados = {
+            'historical': historical,
+            'financial': metadata['financial'],
+            'seasonal_factors': metadata['seasonal_factors'],
+            'seasonal_by_year': seasonal_by_year,
+            'seasonal_version': metadata.get('seasonal_version'),
+            'equipment': metadata['equipment'],
+            'tarifas_equipos': metadata.get('tarifas_equipos', {}),
+            'metadata': dict(metadata['metadata'], snapshot=ruta.name)
+        }
+        logger.info("Snapshot cargado", extra=con_campos(snapshot=ruta.name, periodos=historical['periodos']))
+        return datos_procesados
+    
+    except Exception as e:
+        logger.warning("Error cargando snapshot %s: %s", ruta, e)
+        return None
+
 # =============================================================================
 # 🆕 v5.0.0: FUNCIONES DE EXTRACCIÓN DE DATOS REALES
 # =============================================================================
@@ -1434,49 +2183,29 @@ def extraer_equipos_disponibles_from_data(data_dict):
     equipos_lista = []
     
     try:
-        # Intentar cargar desde archivos uploaded
+        # 🆕 v6.3.1: Preferir la lista construida durante la ingesta (sin I/O)
+        if data_dict and 'equipos_disponibles' in data_dict.get('equipment', {}):
+            return list(data_dict['equipment']['equipos_disponibles'])
+        
+        # Fallback: cargar desde archivos uploaded
         weekly_file = st.session_state.get('uploaded_files', {}).get('file_weekly')
         
         if weekly_file is not None:
-            # Resetear el puntero del archivo al inicio
-            weekly_file.seek(0)
-            
-            # Leer Excel
-            df_weekly = pd.read_excel(weekly_file, sheet_name=0)
+            # 🆕 v6.3.0: Lectura cacheada por hash de contenido
+            # 🆕 v7.5.2: Misma hoja que la ingesta ('Sheet1') → misma clave de cache
+            df_weekly = leer_excel_cacheado(weekly_file, **ESPECIFICACION_HOJAS['file_weekly'])
             
             # Validar columnas requeridas
             required_cols = ['Equipment', 'Serial Number', 'Status']
             if all(col in df_weekly.columns for col in required_cols):
-                
-                # Filtrar SOLO Available, StandBy y Backup
-                df_disponibles = df_weekly[
-                    df_weekly['Status'].isin(['Available', 'StandBy', 'Backup'])
-                ].copy()
-                
-                print(f"📊 Equipos disponibles encontrados: {len(df_disponibles)}")
-                
-                # Construir lista de equipos
-                for _, row in df_disponibles.iterrows():
-                    serial = str(row['Serial Number']).strip()
-                    tipo = str(row['Equipment']).strip()
-                    estado = str(row['Status']).strip()
-                    
-                    # Validar que no sean valores nulos
-                    if serial and tipo and serial != 'nan' and tipo != 'nan':
-                        equipos_lista.append({
-                            'serial': serial,
-                            'tipo': tipo,
-                            'estado': estado,
-                            'display': f"{serial} - {tipo} ({estado})"
-                        })
-                
-                print(f"✅ {len(equipos_lista)} equipos válidos extraídos")
+                equipos_lista = construir_equipos_disponibles_desde_df(df_weekly)
+                logger.debug("Equipos válidos extraídos del Weekly Report", extra=con_campos(equipos=len(equipos_lista)))
             else:
                 missing = [col for col in required_cols if col not in df_weekly.columns]
-                print(f"⚠️ Columnas faltantes en Weekly Report: {missing}")
+                logger.warning("Columnas faltantes en Weekly Report: %s", missing)
     
     except Exception as e:
-        print(f"⚠️ Error extrayendo equipos desde Weekly Report: {str(e)}")
+        logger.warning("Error extrayendo equipos desde Weekly Report: %s", e)
     
     return equipos_lista
 
@@ -1513,55 +2242,37 @@ def extraer_clientes_from_data(data_dict):
     clientes_set = set()
     
     try:
-        # Intentar cargar desde datos históricos procesados
-        if 'historical' in data_dict:
-            hist_data = data_dict['historical']
-            
-            # Opción 1: Desde top_clientes (dict con revenue)
-            if 'clientes' in hist_data:
-                clientes_set.update(hist_data['clientes'].keys())
-                print(f"📊 Clientes desde top_clientes: {len(clientes_set)}")
-            
-            # Opción 2: Desde df_historical completo
-            if 'df_historical' in hist_data:
-                df = hist_data['df_historical']
-                if 'Client' in df.columns:
-                    clientes_df = df['Client'].dropna().unique()
-                    clientes_set.update(clientes_df)
-                    print(f"📊 Clientes desde df_historical: {len(clientes_set)}")
+        # 🆕 v6.3.1: Preferir el set construido durante la ingesta (sin I/O)
+        if data_dict and 'clientes' in data_dict.get('historical', {}):
+            return set(data_dict['historical']['clientes'])
         
-        # Intentar cargar directamente de archivos uploaded (más confiable)
+        # Fallback: cargar directamente de archivos uploaded
+        dataframes = []
         for file_key in ['file_2023', 'file_2024', 'file_2025']:
             util_file = st.session_state.get('uploaded_files', {}).get(file_key)
             
             if util_file is not None:
-                # Resetear puntero
-                util_file.seek(0)
-                
-                # Leer Excel
-                df_util = pd.read_excel(util_file, sheet_name=0)
-                
-                if 'Client' in df_util.columns:
-                    # Extraer clientes únicos de este archivo
-                    clientes_file = df_util['Client'].dropna().unique()
-                    clientes_set.update(clientes_file)
-                    print(f"📊 +{len(clientes_file)} clientes desde {file_key}")
+                # 🆕 v6.3.0: Lectura cacheada por hash de contenido
+                dataframes.append(leer_excel_cacheado(util_file, sheet_name=0))
         
         # Limpiar nombres (eliminar espacios extra, etc.)
-        clientes_set = {str(c).strip() for c in clientes_set if c and str(c) != 'nan'}
+        clientes_set = construir_clientes_desde_df(dataframes)
         
-        print(f"✅ Total clientes únicos: {len(clientes_set)}")
+        logger.debug("Clientes únicos extraídos", extra=con_campos(clientes=len(clientes_set)))
     
     except Exception as e:
-        print(f"⚠️ Error extrayendo clientes: {str(e)}")
+        logger.warning("Error extrayendo clientes: %s", e)
     
     return clientes_set
 
 
-def obtener_tarifas_sugeridas_por_equipo():
+def obtener_tarifas_sugeridas_por_equipo(data_dict=None):
     """
     ✅ v5.0: Obtiene tarifas promedio por tipo de equipo desde Utilization Report 2025
     
+    🆕 v6.3.1: Si data_dict (datos_procesados) trae 'tarifas_equipos' de la
+    ingesta, se retornan directamente sin leer el archivo.
+    
     FUNCIONALIDAD:
     - Lee Utilization Report 2025 (el más reciente)
     - Calcula tarifa promedio por tipo de equipo
@@ -1586,44 +2297,29 @@ def obtener_tarifas_sugeridas_por_equipo():
     tarifas_dict = {}
     
     try:
+        # 🆕 v6.3.1: Preferir las tarifas calculadas durante la ingesta (sin I/O)
+        if data_dict and 'tarifas_equipos' in data_dict:
+            return dict(data_dict['tarifas_equipos'])
+        
         # Buscar archivo 2025 (el más reciente y relevante)
         util_file_2025 = st.session_state.get('uploaded_files', {}).get('file_2025')
         
         if util_file_2025 is not None:
-            # Resetear puntero
-            util_file_2025.seek(0)
-            
-            # Leer Excel
-            df_util = pd.read_excel(util_file_2025, sheet_name=0)
+            # 🆕 v6.3.0: Lectura cacheada por hash de contenido
+            df_util = leer_excel_cacheado(util_file_2025, sheet_name=0)
             
             # Validar columnas
             if 'Equipment' in df_util.columns and 'Rental Rate' in df_util.columns:
+                tarifas_dict = construir_tarifas_desde_df(df_util)
                 
-                # Convertir Rental Rate a numérico
-                df_util['Rental Rate'] = pd.to_numeric(df_util['Rental Rate'], errors='coerce')
-                
-                # Calcular promedio por tipo de equipo
-                tarifas_promedio = df_util.groupby('Equipment')['Rental Rate'].mean()
-                
-                # Limpiar y formatear
-                for equipo, tarifa in tarifas_promedio.items():
-                    if pd.notna(tarifa) and tarifa > 0:
-                        # Limpiar nombre del equipo
-                        equipo_limpio = str(equipo).strip()
-                        
-                        # Redondear a 2 decimales
-                        tarifas_dict[equipo_limpio] = round(tarifa, 2)
-                
-                print(f"✅ Tarifas históricas calculadas para {len(tarifas_dict)} tipos de equipos")
-                
-                # Mostrar algunas tarifas en log
-                for tipo, tarifa in list(tarifas_dict.items())[:5]:
-                    print(f"   • {tipo}: ${tarifa:,.0f} USD/mes")
+                # Algunas tarifas en el log (solo con SPT_LOG_LEVEL=DEBUG)
+                logger.debug("Tarifas históricas calculadas", extra=con_campos(
+                    tipos_equipo=len(tarifas_dict), muestra=dict(list(tarifas_dict.items())[:5])))
             else:
-                print("⚠️ Columnas 'Equipment' o 'Rental Rate' no encontradas en Utilization Report 2025")
+                logger.warning("Columnas 'Equipment' o 'Rental Rate' no encontradas en Utilization Report 2025")
     
     except Exception as e:
-        print(f"⚠️ Error obteniendo tarifas históricas: {str(e)}")
+        logger.warning("Error obteniendo tarifas históricas: %s", e)
     
     return tarifas_dict
 
@@ -1632,6 +2328,8 @@ def obtener_tarifas_sugeridas_por_equipo():
 # =============================================================================
 
 VALID_PASSWORD = "spt2025"
+# 🆕 v7.5.0: Contraseña de administrador (habilita el perfilador); sin variable de entorno no hay admin
+ADMIN_PASSWORD = os.environ.get('SPT_ADMIN_PASSWORD')
 
 def check_password():
     """Verifica autenticación del usuario"""
@@ -1662,8 +2360,10 @@ def check_password():
             login_button = st.button("🔓 Ingresar", use_container_width=True)
         
         if login_button:
-            if password_input == VALID_PASSWORD:
+            es_admin = bool(ADMIN_PASSWORD) and password_input == ADMIN_PASSWORD
+            if password_input == VALID_PASSWORD or es_admin:
                 st.session_state.authenticated = True
+                st.session_state.es_admin = es_admin
                 st.success("✅ Acceso autorizado")
                 st.rerun()
             else:
@@ -1859,6 +2559,10 @@ if 'dias_liquidacion' not in st.session_state:
 if 'escenario_proyeccion' not in st.session_state:
     st.session_state.escenario_proyeccion = 'Moderado'  # Default: Moderado
 
+# 🆕 v7.3.0: Método de pronóstico del revenue base (selector en Proyecciones)
+if 'backend_pronostico' not in st.session_state:
+    st.session_state.backend_pronostico = 'heuristico'
+
 # 🆕 v4.9.0: Ingreso manual de cotizaciones y contratos
 if 'cotizaciones_manuales' not in st.session_state:
     st.session_state.cotizaciones_manuales = []
@@ -1866,6 +2570,10 @@ if 'cotizaciones_manuales' not in st.session_state:
 if 'contratos_manuales' not in st.session_state:
     st.session_state.contratos_manuales = []
 
+# 🆕 v6.4.1: Versión de la cartera (contratos + cotizaciones) para invalidar el índice
+if 'version_cartera' not in st.session_state:
+    st.session_state.version_cartera = 0
+
 # 🆕 v4.9.3: Equipos temporales para contratos (igual que cotizaciones)
 if 'equipos_temp_contract' not in st.session_state:
     st.session_state.equipos_temp_contract = []
@@ -2259,246 +2967,15 @@ def calcular_proyeccion_3_meses(revenue_promedio, financial_data):
     
     return proyeccion
 
-def calcular_runway_mejorado(efectivo_actual, flujos_proyectados, burn_rate):
-    """✅ Runway considerando balance proyectado con protección ZeroDivision"""
-    balance_3_meses = efectivo_actual + sum(flujos_proyectados)
-    
-    if balance_3_meses <= 0:
-        efectivo_temp = efectivo_actual
-        for i, flujo in enumerate(flujos_proyectados, 1):
-            efectivo_temp += flujo
-            if efectivo_temp <= 0:
-                return i
-        return 3
-    else:
-        # ✅ v5.0.3: Proteger división por cero
-        if burn_rate > 0:
-            meses_adicionales = balance_3_meses / burn_rate
-            return 3 + meses_adicionales
-        else:
-            return float('inf')  # Runway infinito si no hay burn rate
-
-def calcular_necesidades_excedentes_mejorado(efectivo_actual, proyecciones_df, financial_data, meses_colchon=2):
-    """
-    ✅ Necesidades/excedentes con balance completo
-    ✅ v4.5.5: Recibe burn_rate como parámetro (calculado dinámicamente)
-    🆕 v4.6.0: Meses de colchón configurable
-    ✅ v6.2.3: FIX CRÍTICO - Usa necesidades DINÁMICAS que consideran costos de contratos mes a mes
-    
-    Args:
-        efectivo_actual: Efectivo disponible actual
-        proyecciones_df: DataFrame con proyecciones (debe incluir 'flujo_neto', 'revenue', 'costos_contratos')
-        financial_data: Dict con 'gastos_fijos' y 'tasa_costos_variables'
-        meses_colchon: Número de meses de burn rate para margen de protección (1, 2 o 3)
-    
-    Returns:
-        dict con balance_proyectado, necesidades_minimas, excedente_deficit, flujos_mensuales
-    
-    NOTA: Con pagos a 30 días, se recomienda mínimo 2 meses de colchón:
-    - Mes 1: Cubrir operación actual
-    - Mes 2: Cubrir operación mientras se cobran ventas del mes 1
-    
-    ✅ v6.2.3: CAMBIO CRÍTICO
-    - ANTES: necesidades_minimas = burn_rate * meses_colchon (FIJO para todos los meses)
-    - AHORA: necesidades_minimas = PROMEDIO de necesidades dinámicas de 3 meses (VARIABLE según contratos)
-    """
-    flujos_proyectados = proyecciones_df['flujo_neto'].tolist()
-    balance_proyectado = efectivo_actual + sum(flujos_proyectados)
-    
-    # ✅ v6.2.3: Calcular necesidades mínimas DINÁMICAS mes a mes
-    necesidades_dinamicas = calcular_necesidades_minimas_dinamicas(
-        proyecciones_df,
-        financial_data['gastos_fijos'],
-        financial_data['tasa_costos_variables'],
-        meses_colchon
-    )
-    
-    # Para la métrica principal, usar el PROMEDIO de los 3 meses
-    # (Esto representa las necesidades típicas del período proyectado)
-    necesidades_minimas = sum(necesidades_dinamicas.values()) / len(necesidades_dinamicas)
-    
-    excedente_o_deficit = balance_proyectado - necesidades_minimas
-    
-    return {
-        'balance_proyectado': balance_proyectado,
-        'necesidades_minimas': necesidades_minimas,
-        'excedente_deficit': excedente_o_deficit,
-        'flujos_mensuales': flujos_proyectados,
-        'meses_colchon': meses_colchon  # Incluir para referencia
-    }
-
-# =============================================================================
-# FUNCIONES DE GESTIÓN DE EXCEDENTES E INVERSIONES (v4.8.0)
-# =============================================================================
-
-def calcular_necesidades_minimas_dinamicas(proyecciones_df, gastos_fijos, tasa_costos_variables, meses_colchon):
-    """
-    🆕 v6.2.2: Calcula necesidades mínimas MES A MES considerando costos específicos de contratos
-    
-    Esta función resuelve el problema de que las necesidades mínimas eran estáticas,
-    cuando en realidad varían según si hay contratos vigentes o no en cada mes.
-    
-    Args:
-        proyecciones_df: DataFrame con proyecciones (debe tener 'mes', 'mes_numero', 'ano', 'revenue', 'costos_contratos')
-        gastos_fijos: Gastos fijos mensuales
-        tasa_costos_variables: Tasa de costos variables (ej: 0.0962)
-        meses_colchon: Número de meses de burn rate para mantener como colchón
-    
-    Returns:
-        dict: {mes: necesidades_minimas} donde mes es 1, 2, 3...
-    
-    LÓGICA:
-    Para cada mes proyectado:
-    1. Calcular costos variables = revenue × tasa
-    2. Obtener costos específicos de contratos para ese mes
-    3. Burn rate = gastos_fijos + costos_variables + costos_contratos
-    4. Necesidades mínimas = burn_rate × meses_colchon
-    
-    EJEMPLO:
-    - Mes 1 (Nov 2025) con contrato de $10k costos:
-      Burn rate = $50k + $30k + $10k = $90k
-      Necesidades (2m) = $180k
-    
-    - Mes 7 (May 2026) sin contratos:
-      Burn rate = $50k + $30k + $0 = $80k
-      Necesidades (2m) = $160k
-    """
-    necesidades_por_mes = {}
-    
-    for idx, row in proyecciones_df.iterrows():
-        mes_num = row['mes']
-        revenue_mes = row['revenue']
-        costos_contratos_mes = row.get('costos_contratos', 0)
-        
-        # Calcular burn rate ESPECÍFICO de este mes
-        costos_variables = revenue_mes * tasa_costos_variables
-        burn_rate_mes = gastos_fijos + costos_variables + costos_contratos_mes
-        
-        # Calcular necesidades mínimas para este mes
-        necesidades_minimas_mes = burn_rate_mes * meses_colchon
-        
-        necesidades_por_mes[mes_num] = necesidades_minimas_mes
-    
-    return necesidades_por_mes
-
-def calcular_excedentes_invertibles(proyecciones_df, efectivo_inicial, financial_data, meses_colchon, dias_liquidacion):
-    """
-    🆕 v4.8.0: Calcula excedentes invertibles mes a mes considerando necesidades mínimas
-    ✅ v6.2.2: CORREGIDO - Usa necesidades mínimas DINÁMICAS que varían mes a mes
-    
-    Args:
-        proyecciones_df: DataFrame con proyecciones mensuales (debe tener 'revenue', 'egresos_totales', 'costos_contratos')
-        efectivo_inicial: Efectivo disponible al inicio
-        financial_data: Dict con 'gastos_fijos' y 'tasa_costos_variables'
-        meses_colchon: Número de meses de burn rate para mantener como colchón
-        dias_liquidacion: Días de anticipación para liquidar inversiones
-    
-    Returns:
-        DataFrame con análisis de excedentes invertibles mes a mes
-    
-    LÓGICA v6.2.2 (CORREGIDA):
-    1. Calcular necesidades mínimas DINÁMICAS por mes (considerando vigencia de contratos)
-    2. Por cada mes, calcular el balance acumulado
-    3. Restar las necesidades mínimas ESPECÍFICAS de ese mes
-    4. El excedente es lo que se puede invertir
-    5. Marcar cuándo liquidar cada inversión (basado en días_liquidacion)
-    
-    DIFERENCIA vs v6.2.1:
-    - ANTES: necesidades_minimas = burn_rate × meses_colchon (FIJO para todos los meses)
-    - AHORA: necesidades_minimas_mes = (gastos + costos_variables + costos_contratos) × meses_colchon (VARIABLE)
-    """
-    
-    # 🆕 v6.2.2: Calcular necesidades mínimas DINÁMICAS mes a mes
-    gastos_fijos = financial_data['gastos_fijos']
-    tasa_costos_variables = financial_data['tasa_costos_variables']
-    
-    # Calcular necesidades dinámicas
-    necesidades_dinamicas = calcular_necesidades_minimas_dinamicas(
-        proyecciones_df,
-        gastos_fijos,
-        tasa_costos_variables,
-        meses_colchon
-    )
-    
-    analisis = []
-    balance_acumulado = efectivo_inicial
-    
-    for idx, row in proyecciones_df.iterrows():
-        mes_num = row['mes']
-        flujo_neto = row['flujo_neto']
-        
-        # Actualizar balance acumulado
-        balance_acumulado += flujo_neto
-        
-        # 🆕 v6.2.2: Usar necesidades mínimas ESPECÍFICAS de este mes (no fijas)
-        necesidades_minimas_mes = necesidades_dinamicas[mes_num]
-        
-        # Calcular excedente invertible
-        excedente = balance_acumulado - necesidades_minimas_mes
-        
-        # Determinar si se puede invertir
-        puede_invertir = excedente > 0
-        
-        # Calcular fecha aproximada de liquidación (dias_liquidacion antes del siguiente mes)
-        # Simplificación: asumimos que cada mes tiene 30 días
-        mes_liquidacion = mes_num + 1 if dias_liquidacion <= 30 else mes_num + 2
-        
-        analisis.append({
-            'mes': mes_num,
-            'balance_disponible': balance_acumulado,
-            'necesidades_minimas': necesidades_minimas_mes,  # 🆕 v6.2.2: Ahora varía por mes
-            'excedente_invertible': max(0, excedente),
-            'puede_invertir': puede_invertir,
-            'liquidar_antes_mes': mes_liquidacion if puede_invertir else None
-        })
-    
-    return pd.DataFrame(analisis)
-
-def generar_recomendaciones_inversion(df_excedentes, rentabilidad_estimada=0.10):
-    """
-    🆕 v4.8.0: Genera recomendaciones de inversión basadas en excedentes
-    
-    Args:
-        df_excedentes: DataFrame con análisis de excedentes
-        rentabilidad_estimada: Rentabilidad anual estimada (default 10% = 0.10)
-    
-    Returns:
-        DataFrame con recomendaciones de inversión
-    
-    INSTRUMENTOS SUGERIDOS (Colombia):
-    - CDTs: ~12% EA (baja liquidez pero mayor rendimiento)
-    - TES corto plazo: ~10% EA (buena liquidez)
-    - Fondos de Inversión Colectiva: ~8-10% EA (alta liquidez)
-    """
-    
-    recomendaciones = []
-    
-    for idx, row in df_excedentes.iterrows():
-        if row['puede_invertir'] and row['excedente_invertible'] > 0:
-            monto = row['excedente_invertible']
-            
-            # Calcular rendimiento estimado (proporcional al tiempo de inversión)
-            # Asumimos inversión de 1 mes = rentabilidad_anual / 12
-            rendimiento_mensual = monto * (rentabilidad_estimada / 12)
-            
-            recomendaciones.append({
-                'mes': row['mes'],
-                'monto_invertible': monto,
-                'instrumento_sugerido': 'Cartera Mixta (CDT 40%, TES 30%, FCI 30%)',
-                'rentabilidad_estimada_mensual': rendimiento_mensual,
-                'liquidar_antes_mes': row['liquidar_antes_mes'],
-                'riesgo': 'Bajo',
-                'liquidez': 'Media-Alta'
-            })
-    
-    return pd.DataFrame(recomendaciones) if recomendaciones else pd.DataFrame()
-
-
+# 🆕 v7.0.0: Runway, necesidades mínimas, excedentes, recomendaciones de inversión,
+# transferencias y balance multi-escenario viven en spt_forecast.balance (sin Streamlit)
 
+@perfilar
 def calcular_revenue_adicional_escenarios():
     """
     ✅ v5.0.2: Calcula revenue adicional de contratos y cotizaciones
     🆕 v6.1.0: Debug ultra detallado para diagnosticar problema de contratos
+    🆕 v7.5.1: Debug por logger (nivel DEBUG, muestreado por contrato)
     
     Returns:
         dict con:
@@ -2506,43 +2983,28 @@ def calcular_revenue_adicional_escenarios():
         - revenue_cotizaciones_50pct: 50% del revenue potencial de cotizaciones
         - revenue_equipos_disponibles_50pct: 50% del revenue de equipos disponibles
     """
-    # 🆕 v6.1.0: Debug detallado
-    print("\n" + "="*80)
-    print("🔍 DEBUG ULTRA DETALLADO - calcular_revenue_adicional_escenarios()")
-    print("="*80)
+    # 🆕 v7.5.1: Diagnóstico por contrato en nivel DEBUG y muestreado (1 de cada
+    # SPT_LOG_MUESTREO); sin DEBUG no se arma ningún mensaje
+    depurar = logger.isEnabledFor(logging.DEBUG)
     
     # Revenue de contratos activos
     revenue_contratos = 0
+    contratos = st.session_state.get('contratos_manuales') or []
     
-    # 🆕 v6.1.0: Debug de contratos
-    print(f"\n📋 Verificando contratos en session_state...")
-    if st.session_state.get('contratos_manuales'):
-        print(f"   ✅ contratos_manuales existe")
-        print(f"   📊 Total contratos guardados: {len(st.session_state.contratos_manuales)}")
-        
-        for idx, contrato in enumerate(st.session_state.contratos_manuales):
-            print(f"\n   Contrato #{idx+1}:")
-            print(f"      ID: {contrato.get('contrato_id', 'N/A')}")
-            print(f"      Cliente: {contrato.get('cliente', 'N/A')}")
-            print(f"      Estado guardado: '{contrato.get('estado', 'N/A')}'")
-            print(f"      Estado (repr): {repr(contrato.get('estado', 'N/A'))}")
-            print(f"      Estado (tipo): {type(contrato.get('estado', 'N/A'))}")
-            print(f"      Tarifa mensual: ${contrato.get('tarifa_mensual_total', 0):,.0f}")
-            
+    for contrato in contratos:
+        activo = contrato.get('estado') == 'Activo'
+        if activo:
+            revenue_contratos += contrato.get('tarifa_mensual_total', 0)
+        if depurar and muestrear('revenue_adicional.contrato'):
             estado = contrato.get('estado')
-            print(f"      Comparando: '{estado}' == 'Activo' ? {estado == 'Activo'}")
-            print(f"      Comparando (strip): '{estado.strip() if estado else ''}' == 'Activo' ? {estado.strip() == 'Activo' if estado else False}")
-            
-            if contrato.get('estado') == 'Activo':
-                tarifa = contrato.get('tarifa_mensual_total', 0)
-                revenue_contratos += tarifa
-                print(f"      ✅ CONTRATO ACTIVO DETECTADO - Sumando ${tarifa:,.0f}")
-            else:
-                print(f"      ❌ NO SE DETECTÓ COMO ACTIVO")
-    else:
-        print(f"   ❌ contratos_manuales NO existe o está vacío")
-    
-    print(f"\n💰 TOTAL Revenue Contratos: ${revenue_contratos:,.0f}")
+            logger.debug("Contrato evaluado", extra=con_campos(
+                contrato_id=contrato.get('contrato_id', 'N/A'),
+                cliente=contrato.get('cliente', 'N/A'),
+                estado=repr(estado),
+                activo=activo,
+                activo_con_strip=isinstance(estado, str) and estado.strip() == 'Activo',
+                tarifa_mensual=contrato.get('tarifa_mensual_total', 0)
+            ))
     
     # Revenue de cotizaciones (50% ponderado por probabilidad)
     revenue_cotizaciones = 0
@@ -2565,9 +3027,13 @@ def calcular_revenue_adicional_escenarios():
     # 50% de los equipos disponibles
     revenue_equipos_disponibles_50pct = revenue_equipos_disponibles * 0.5
     
-    print(f"📋 Revenue Cotizaciones (50%): ${revenue_cotizaciones:,.0f}")
-    print(f"🚧 Revenue Equipos Disponibles (50%): ${revenue_equipos_disponibles_50pct:,.0f}")
-    print("="*80 + "\n")
+    if depurar:
+        logger.debug("Revenue adicional por escenarios", extra=con_campos(
+            contratos=len(contratos),
+            revenue_contratos=revenue_contratos,
+            revenue_cotizaciones_50pct=revenue_cotizaciones,
+            revenue_equipos_disponibles_50pct=revenue_equipos_disponibles_50pct
+        ))
     
     return {
         'revenue_contratos': revenue_contratos,
@@ -2576,13 +3042,19 @@ def calcular_revenue_adicional_escenarios():
     }
 
 
+@perfilar
 def calcular_revenue_adicional_por_mes(mes_proyectado, ano_proyectado):
     """
     🆕 v6.2.0: Calcula revenue adicional Y COSTOS para un MES ESPECÍFICO considerando vigencia
+    🆕 v6.4.1: Consulta O(log n) sobre el índice de intervalos de la cartera
+               (antes: recorría todos los contratos y parseaba sus fechas ISO)
     
     Esta función reemplaza calcular_revenue_adicional_escenarios() en el loop de proyecciones
     para considerar la duración real de contratos y cotizaciones.
     
+    Vigencia: un contrato/cotización cuenta en el mes si el día 15 del mes cae
+    entre su fecha de inicio y su fecha fin (o no tiene fecha fin).
+    
     Args:
         mes_proyectado: Mes del año (1-12)
         ano_proyectado: Año (ej: 2024)
@@ -2590,436 +3062,397 @@ def calcular_revenue_adicional_por_mes(mes_proyectado, ano_proyectado):
     Returns:
         dict con revenue adicional Y costos específicos SOLO de contratos/cotizaciones vigentes en ese mes
     """
-    from datetime import datetime
-    
-    # Crear fecha del mes proyectado (usar día 15 para estar en medio del mes)
-    fecha_proyectada = datetime(ano_proyectado, mes_proyectado, 15)
-    
-    # Revenue de contratos activos vigentes en este mes
-    revenue_contratos = 0
-    costos_contratos = 0  # 🆕 v6.2.0: Acumular costos específicos
-    
-    if st.session_state.get('contratos_manuales'):
-        for contrato in st.session_state.contratos_manuales:
-            if contrato.get('estado') == 'Activo':
-                # Verificar si el contrato está vigente en este mes
-                try:
-                    fecha_inicio_str = contrato.get('fecha_inicio')
-                    fecha_fin_str = contrato.get('fecha_fin', 'Abierta')
-                    
-                    # Parsear fecha de inicio
-                    if isinstance(fecha_inicio_str, str):
-                        fecha_inicio = datetime.fromisoformat(fecha_inicio_str)
-                    else:
-                        fecha_inicio = fecha_inicio_str
-                    
-                    # Parsear fecha de fin
-                    if fecha_fin_str == 'Abierta' or fecha_fin_str is None:
-                        # Contrato sin fecha fin - está vigente indefinidamente
-                        fecha_fin = None
-                    elif isinstance(fecha_fin_str, str):
-                        fecha_fin = datetime.fromisoformat(fecha_fin_str)
-                    else:
-                        fecha_fin = fecha_fin_str
-                    
-                    # Verificar vigencia
-                    if fecha_proyectada >= fecha_inicio:
-                        if fecha_fin is None or fecha_proyectada <= fecha_fin:
-                            # Contrato vigente en este mes
-                            tarifa = contrato.get('tarifa_mensual_total', 0)
-                            costos = contrato.get('costos_operativos_mensuales', 0)  # 🆕 v6.2.0
-                            revenue_contratos += tarifa
-                            costos_contratos += costos
-                
-                except (ValueError, TypeError) as e:
-                    # Si hay error parseando fechas, asumir que está vigente (fallback)
-                    tarifa = contrato.get('tarifa_mensual_total', 0)
-                    costos = contrato.get('costos_operativos_mensuales', 0)  # 🆕 v6.2.0
-                    revenue_contratos += tarifa
-                    costos_contratos += costos
-    
-    # Revenue de cotizaciones vigentes en este mes
-    revenue_cotizaciones = 0
-    if st.session_state.get('cotizaciones_manuales'):
-        for cotizacion in st.session_state.cotizaciones_manuales:
-            # Verificar vigencia de la cotización
-            try:
-                fecha_inicio_str = cotizacion.get('fecha_inicio')
-                
-                if isinstance(fecha_inicio_str, str):
-                    fecha_inicio = datetime.fromisoformat(fecha_inicio_str)
-                else:
-                    fecha_inicio = fecha_inicio_str
-                
-                duracion_meses = cotizacion.get('duracion_meses', 0)
-                
-                # Calcular fecha fin
-                if duracion_meses > 0:
-                    # Agregar meses a la fecha de inicio
-                    mes_fin = fecha_inicio.month + duracion_meses
-                    ano_fin = fecha_inicio.year + (mes_fin - 1) // 12
-                    mes_fin = ((mes_fin - 1) % 12) + 1
-                    fecha_fin = datetime(ano_fin, mes_fin, fecha_inicio.day)
-                else:
-                    fecha_fin = None  # Sin duración = indefinido
-                
-                # Verificar vigencia
-                if fecha_proyectada >= fecha_inicio:
-                    if fecha_fin is None or fecha_proyectada <= fecha_fin:
-                        # Cotización vigente en este mes
-                        prob = cotizacion.get('probabilidad_cierre', 50) / 100
-                        tarifa_mensual = cotizacion.get('tarifa_total', 0)
-                        revenue_cotizaciones += tarifa_mensual * prob * 0.5  # 50% del potencial
-            
-            except (ValueError, TypeError, AttributeError) as e:
-                # Si hay error, asumir que está vigente (fallback)
-                prob = cotizacion.get('probabilidad_cierre', 50) / 100
-                tarifa_mensual = cotizacion.get('tarifa_total', 0)
-                revenue_cotizaciones += tarifa_mensual * prob * 0.5
+    revenue_contratos, costos_contratos, revenue_cotizaciones = consultar_indice_cartera(
+        obtener_indice_cartera(),
+        ordinal_mes(ano_proyectado, mes_proyectado)
+    )
     
     # Revenue de equipos disponibles (estos no tienen vigencia - siempre están)
-    revenue_equipos_disponibles = 0
-    equipos_disponibles = get_equipos_disponibles()
-    
-    for equipo in equipos_disponibles:
-        tarifa_mensual = get_tarifa_sugerida(equipo['tipo'])
-        if tarifa_mensual > 0:
-            revenue_equipos_disponibles += tarifa_mensual
-    
-    revenue_equipos_disponibles_50pct = revenue_equipos_disponibles * 0.5
+    revenue_equipos_disponibles_50pct = calcular_revenue_equipos_disponibles_50pct()
     
     return {
-        'revenue_contratos': revenue_contratos,
-        'revenue_cotizaciones_50pct': revenue_cotizaciones,
+        'revenue_contratos': float(revenue_contratos[0]),
+        'revenue_cotizaciones_50pct': float(revenue_cotizaciones[0]),
         'revenue_equipos_disponibles_50pct': revenue_equipos_disponibles_50pct,
-        'costos_contratos': costos_contratos  # 🆕 v6.2.0
+        'costos_contratos': float(costos_contratos[0])  # 🆕 v6.2.0
     }
 
 
-def generar_proyecciones_por_escenario(revenue_base, financial_data, meses, escenario, seasonal_factors=None, ultimo_mes_historico=None):
+# =============================================================================
+# 🆕 v6.4.1: ÍNDICE DE LA CARTERA EN SESSION_STATE
+# =============================================================================
+# 🆕 v7.0.0: El motor vectorizado (spt_forecast.proyecciones) y el índice de
+# intervalos (spt_forecast.cartera) son funciones puras que reciben la cartera
+# explícitamente. Aquí quedan sólo los adaptadores que leen st.session_state.
+# El índice sólo se reconstruye cuando cambia st.session_state.version_cartera
+# (agregar / editar / eliminar contratos o cotizaciones).
+
+def marcar_cartera_modificada():
     """
-    ✅ v5.0.2: Genera proyecciones según NUEVAS FÓRMULAS de escenarios
-    ✅ v5.0.3: Protección cuando todos los valores son 0
-    ✅ v6.0.1: NUEVA FUNCIONALIDAD - Estacionalidad integrada en proyecciones
-    🆕 v6.0.6: CORRECCIÓN CRÍTICA - Usar último mes histórico real para proyecciones
-    
-    Args:
-        revenue_base: Revenue mensual base (solo equipos operando)
-        financial_data: Dict con gastos_fijos y tasa_costos_variables
-        meses: Número de meses a proyectar
-        escenario: 'Conservador', 'Moderado' o 'Optimista'
-        seasonal_factors: Dict opcional con factores estacionales por mes (ej: {'Enero': 0.76, 'Julio': 1.465})
-        ultimo_mes_historico: Int opcional con el último mes histórico (1-12). Si no se proporciona, usa mes actual del sistema
-    
-    Returns:
-        DataFrame con columnas: ['mes', 'revenue', 'egresos_totales', 'flujo_neto', 'nombre_mes']
-    
-    NUEVOS ESCENARIOS v5.0.2:
-    - Conservador: Solo equipos operando + estacionalidad
-    - Moderado: Equipos operando + contratos activos + 50% cotizaciones
-    - Optimista: Moderado + 50% equipos disponibles/standby alquilados
-    
-    🆕 v6.0.1 - ESTACIONALIDAD:
-    Si se proporciona seasonal_factors, las proyecciones aplicarán el patrón estacional
-    histórico a cada mes proyectado. Esto hace las proyecciones mucho más realistas
-    al considerar los ciclos naturales del negocio (ej: pico en Julio, baja en Diciembre).
-    
-    🆕 v6.0.6 - CORRECCIÓN CRÍTICA:
-    Ahora usa el último mes del histórico para calcular los meses proyectados correctamente.
-    Ejemplo: Si histórico termina en Septiembre (mes 9), proyecciones serán Oct, Nov, Dic...
-    Antes usaba datetime.now().month (Noviembre) lo que causaba que las proyecciones
-    no reflejaran la estacionalidad correcta.
+    🆕 v6.4.1: Invalida el índice de la cartera. Llamar después de agregar,
+    editar o eliminar contratos/cotizaciones en session_state.
     """
+    st.session_state.version_cartera = st.session_state.get('version_cartera', 0) + 1
+
+
+@perfilar
+def obtener_indice_cartera():
+    """
+    🆕 v6.4.1: Índice de la cartera en session_state, reconstruido sólo si
+    cambió la versión (o el tamaño de las listas, como salvaguarda)
+    """
+    contratos = st.session_state.get('contratos_manuales', [])
+    cotizaciones = st.session_state.get('cotizaciones_manuales', [])
+    clave = (st.session_state.get('version_cartera', 0), len(contratos), len(cotizaciones))
     
-    gastos_fijos = financial_data.get('gastos_fijos', 0)
-    tasa_costos = financial_data.get('tasa_costos_variables', 0)
-    
-    # ✅ v5.0.3: Si no hay datos (todo en 0), retornar proyecciones vacías
-    if revenue_base == 0 and gastos_fijos == 0:
-        return pd.DataFrame({
-            'mes': list(range(1, meses + 1)),
-            'revenue': [0] * meses,
-            'egresos_totales': [0] * meses,
-            'flujo_neto': [0] * meses
-        })
-    
-    # Calcular revenue adicional de contratos, cotizaciones y equipos disponibles
-    # 🆕 v6.2.0: Esta llamada es solo para el debug UI - las proyecciones usarán calcular_revenue_adicional_por_mes()
-    revenue_adicional = calcular_revenue_adicional_escenarios()
-    
-    # 🆕 v6.0.8: Debug logging para verificar que contratos se sumen correctamente
-    if revenue_adicional['revenue_contratos'] > 0 or revenue_adicional['revenue_cotizaciones_50pct'] > 0:
-        print(f"\n🔍 DEBUG v6.0.8 - Revenue Adicional para escenario '{escenario}':")
-        print(f"   - Contratos activos: ${revenue_adicional['revenue_contratos']:,.0f}/mes")
-        print(f"   - Cotizaciones (50%): ${revenue_adicional['revenue_cotizaciones_50pct']:,.0f}/mes")
-        print(f"   - Equipos disponibles (50%): ${revenue_adicional['revenue_equipos_disponibles_50pct']:,.0f}/mes")
-    
-    # 🆕 v6.2.0: Ya NO calculamos revenue_base_escenario una sola vez
-    # Ahora se calcula en cada iteración del loop considerando vigencia de contratos
-    
-    # Tasas de crecimiento mensual
-    tasas_crecimiento = {
-        'Conservador': 0.01,  # 1% mensual
-        'Moderado': 0.02,     # 2% mensual
-        'Optimista': 0.03     # 3% mensual
+    cache = st.session_state.get('indice_cartera')
+    if cache is None or cache[0] != clave:
+        cache = (clave, compilar_indice_cartera(contratos, cotizaciones))
+        st.session_state.indice_cartera = cache
+    return cache[1]
+
+
+def calcular_revenue_equipos_disponibles_50pct():
+    """
+    🆕 v6.4.0: Revenue del 50% de equipos disponibles (no depende del mes)
+    🆕 v7.0.0: Delegado a spt_forecast.cartera.calcular_revenue_equipos_50pct()
+    """
+    equipos = get_equipos_disponibles()
+    tarifas_por_tipo = {equipo['tipo']: get_tarifa_sugerida(equipo['tipo']) for equipo in equipos}
+    return calcular_revenue_equipos_50pct(equipos, tarifas_por_tipo)
+
+
+# =============================================================================
+# 🆕 v6.4.2: CACHE DE PROYECCIONES (memoización por huella de entradas)
+# =============================================================================
+# Resumen Ejecutivo, Proyecciones y Reportes pedían las mismas proyecciones en
+# cada rerun. Ahora se memoizan por una huella de: revenue base, parámetros
+# financieros, factores estacionales, último mes histórico, año base, versión de
+# la cartera y revenue de equipos disponibles. El horizonte NO es parte de la
+# clave: cada mes proyectado sólo depende de su índice, así que una entrada de
+# 12 meses sirve 3 o 6 meses como prefijo. Desalojo LRU.
+
+MAX_ENTRADAS_CACHE_PROYECCIONES = 32
+
+
+def _huella_proyeccion(revenue_base, financial_data, seasonal_factors, ultimo_mes_historico, ano_base,
+                       revenue_equipos_50pct, clave_backend=None):
+    """
+    🆕 v6.4.2: Huella (SHA-256) de todas las entradas que afectan una proyección
+    """
+    entradas = {
+        'revenue_base': revenue_base,
+        'gastos_fijos': financial_data.get('gastos_fijos', 0),
+        'tasa_costos_variables': financial_data.get('tasa_costos_variables', 0),
+        'seasonal_factors': sorted((seasonal_factors or {}).items()),
+        'ultimo_mes_historico': ultimo_mes_historico,
+        'ano_base': ano_base,
+        'version_cartera': st.session_state.get('version_cartera', 0),
+        'n_contratos': len(st.session_state.get('contratos_manuales', [])),
+        'n_cotizaciones': len(st.session_state.get('cotizaciones_manuales', [])),
+        'revenue_equipos_50pct': revenue_equipos_50pct,
+        'backend_pronostico': clave_backend  # 🆕 v7.3.0: (método, huella del histórico)
     }
-    
-    crecimiento = tasas_crecimiento[escenario]
-    
-    # 🆕 v6.0.1: Preparar nombres de meses para aplicación de estacionalidad
-    meses_nombres = ['Enero', 'Febrero', 'Marzo', 'Abril', 'Mayo', 'Junio',
-                     'Julio', 'Agosto', 'Septiembre', 'Octubre', 'Noviembre', 'Diciembre']
-    meses_abrev = ['Ene', 'Feb', 'Mar', 'Abr', 'May', 'Jun', 
-                   'Jul', 'Ago', 'Sep', 'Oct', 'Nov', 'Dic']
-    
-    # 🆕 v6.2.0: Calcular año base para proyecciones
-    if ultimo_mes_historico is not None:
-        mes_base = ultimo_mes_historico
-    else:
-        mes_base = datetime.now().month
-    
-    ano_base = datetime.now().year
-    
-    proyecciones = []
-    
-    for i in range(meses):
-        # Calcular mes y año proyectado
-        mes_proyectado = ((mes_base + i) % 12) + 1
-        
-        # ✅ v6.2.3: Calcular año correcto (fix del bug que saltaba de 2025 a 2027)
-        ano_proyectado = ano_base + (mes_base + i) // 12
-        
-        nombre_mes = meses_nombres[mes_proyectado - 1]
-        nombre_mes_abrev = meses_abrev[mes_proyectado - 1]
-        
-        # 🆕 v6.2.2: Incluir año en la etiqueta para distinguir 2025 vs 2026
-        nombre_mes_con_ano = f"{nombre_mes_abrev} {ano_proyectado}"
-        
-        # 🆕 v6.2.0: Calcular revenue adicional para ESTE MES específico
-        revenue_adicional_mes = calcular_revenue_adicional_por_mes(mes_proyectado, ano_proyectado)
-        
-        # Configuración de revenue base según escenario (PARA ESTE MES)
-        if escenario == 'Conservador':
-            # Solo equipos operando
-            revenue_base_escenario_mes = revenue_base
-        elif escenario == 'Moderado':
-            # Equipos operando + contratos vigentes + 50% cotizaciones vigentes
-            revenue_base_escenario_mes = (revenue_base + 
-                                          revenue_adicional_mes['revenue_contratos'] + 
-                                          revenue_adicional_mes['revenue_cotizaciones_50pct'])
-        else:  # Optimista
-            # Moderado + 50% equipos disponibles
-            revenue_base_escenario_mes = (revenue_base + 
-                                          revenue_adicional_mes['revenue_contratos'] + 
-                                          revenue_adicional_mes['revenue_cotizaciones_50pct'] +
-                                          revenue_adicional_mes['revenue_equipos_disponibles_50pct'])
-        
-        # Revenue proyectado con crecimiento (sin estacionalidad aún)
-        revenue_base_crecimiento = revenue_base_escenario_mes * (1 + crecimiento)**i
-        
-        # 🆕 v6.0.1: Aplicar factor estacional si está disponible
-        if seasonal_factors and nombre_mes in seasonal_factors:
-            factor_estacional = seasonal_factors[nombre_mes]
-            revenue_mes = revenue_base_crecimiento * factor_estacional
-        else:
-            # Fallback: usar revenue sin ajuste estacional
-            revenue_mes = revenue_base_crecimiento
-        
-        # Burn rate dinámico según revenue del mes
-        costos_variables = revenue_mes * tasa_costos
-        
-        # 🆕 v6.2.0: Sumar costos específicos del contrato
-        costos_especificos_contratos = revenue_adicional_mes.get('costos_contratos', 0)
-        egresos_totales = gastos_fijos + costos_variables + costos_especificos_contratos
-        
-        # Flujo neto
-        flujo_neto = revenue_mes - egresos_totales
-        
-        proyecciones.append({
-            'mes': i + 1,
-            'mes_numero': mes_proyectado,  # 🆕 v6.2.2: Mes del año (1-12) para cálculos
-            'ano': ano_proyectado,  # 🆕 v6.2.2: Año para cálculos
-            'nombre_mes': nombre_mes_con_ano,  # 🆕 v6.2.2: Nombre con año para gráficos
-            'revenue': revenue_mes,
-            'egresos_totales': egresos_totales,
-            'flujo_neto': flujo_neto,
-            'costos_contratos': costos_especificos_contratos  # 🆕 v6.2.2: Para debug
-        })
-    
-    return pd.DataFrame(proyecciones)
+    serializado = json.dumps(entradas, sort_keys=True, default=float)
+    return hashlib.sha256(serializado.encode()).hexdigest()
+
+
+# =============================================================================
+# 🆕 v7.3.0: BACKEND DE PRONÓSTICO (heurístico / descomposición / Holt-Winters)
+# =============================================================================
+
+BACKEND_PRONOSTICO_DEFAULT = 'heuristico'
+
 
-def calcular_transferencias_trimestrales(proyecciones_df, meses_a_proyectar):
+@perfilar
+def obtener_ajuste_backend(metodo=None):
     """
-    🆕 v4.8.0: Calcula transferencias TRIMESTRALES a casa matriz según política SPT
-    ⚠️ NOTA v4.8.1: Esta función NO descuenta transferencias del balance
-    Para balance ajustado, usar calcular_transferencias_con_balance()
+    🆕 v7.3.0: Ajuste del método de pronóstico sobre el histórico cargado
     
-    POLÍTICA SPT GLOBAL:
-    - Utilidad neta local debe ser 10% del revenue
-    - Transferencia = Flujo Neto SPT Colombia - (Revenue × 10%)
-    - Se transfiere trimestre vencido (no mensualmente)
-    
-    Args:
-        proyecciones_df: DataFrame con proyecciones (debe tener 'revenue' y 'flujo_neto')
-        meses_a_proyectar: Número total de meses proyectados
+    El ajuste se memoiza por huella de la serie (spt_forecast.pronostico):
+    solo se reajusta cuando cambia el histórico.
     
     Returns:
-        dict con análisis trimestral de transferencias
-    
-    EJEMPLO:
-    Si Flujo Neto trimestral = $150,000 y Revenue trimestral = $400,000
-    Utilidad Local Requerida = $400,000 × 10% = $40,000
-    Transferencia HQ = $150,000 - $40,000 = $110,000
+        dict de ajustar_backend() o None (sin histórico o historia insuficiente)
+    """
+    metodo = metodo or st.session_state.get('backend_pronostico', BACKEND_PRONOSTICO_DEFAULT)
+    df_hist = get_data()['historical'].get('data')
+    if df_hist is None or df_hist.empty:
+        return None
+    mes_inicial = int(str(df_hist['periodo'].iloc[0]).split('-')[1])
+    return ajustar_backend(metodo, df_hist['revenue'].to_numpy(dtype=float), mes_inicial)
+
+
+def calcular_trayectoria_base(meses, ultimo_mes_historico, ano_base):
     """
+    🆕 v7.3.0: Revenue base pronosticado para el calendario de la proyección
     
-    numero_trimestres = int(np.ceil(meses_a_proyectar / 3))
+    Returns:
+        tuple (trayectoria o None, clave_backend o None). None con el método
+        heurístico o si el método elegido no tiene historia suficiente.
+    """
+    metodo = st.session_state.get('backend_pronostico', BACKEND_PRONOSTICO_DEFAULT)
+    if metodo == 'heuristico':
+        return None, None
+    ajuste = obtener_ajuste_backend(metodo)
+    if ajuste is None:
+        return None, None
+    
+    # Meses entre el cierre del histórico y el primer mes proyectado
+    df_hist = get_data()['historical']['data']
+    ano_ultimo, mes_ultimo = (int(parte) for parte in str(df_hist['periodo'].iloc[-1]).split('-')[:2])
+    mes_base = ultimo_mes_historico if ultimo_mes_historico is not None else datetime.now().month
+    desfase = max(0, (ano_base * 12 + mes_base) - (ano_ultimo * 12 + mes_ultimo - 1) - 1)
+    
+    trayectoria = pronosticar(ajuste, meses, desfase=desfase)
+    if not np.isfinite(trayectoria).all():  # 🆕 v7.5.2: Nunca propagar NaN/inf a proyecciones y balance
+        return None, None
+    clave_backend = [metodo, huella_serie(df_hist['revenue'].to_numpy(dtype=float), ajuste['mes_inicial']), desfase]
+    return trayectoria, clave_backend
+
+
+def obtener_estadisticas_cache_proyecciones():
+    """
+    🆕 v6.4.2: Contadores del cache de proyecciones (hits, misses, entradas)
+    """
+    if 'cache_proyecciones_stats' not in st.session_state:
+        st.session_state.cache_proyecciones_stats = {'hits': 0, 'misses': 0}
+    estadisticas = dict(st.session_state.cache_proyecciones_stats)
+    estadisticas['entradas'] = len(st.session_state.get('cache_proyecciones', {}))
+    return estadisticas
+
+
+@perfilar
+def obtener_proyecciones(revenue_base, financial_data, meses, escenarios=None,
+                         seasonal_factors=None, ultimo_mes_historico=None):
+    """
+    🆕 v6.4.2: Proyecciones memoizadas (mismos argumentos y retorno que
+    generar_proyecciones_vectorizadas)
     
-    trimestres = []
+    - Hit: la entrada cubre >= meses → se retorna el prefijo (copia)
+    - Miss: se calculan los 3 escenarios para el horizonte pedido y se guardan
     
-    for trimestre_num in range(1, numero_trimestres + 1):
-        # Determinar qué meses corresponden a este trimestre
-        mes_inicio = (trimestre_num - 1) * 3 + 1
-        mes_fin = min(trimestre_num * 3, meses_a_proyectar)
-        
-        # Filtrar datos del trimestre
-        df_trimestre = proyecciones_df[
-            (proyecciones_df['mes'] >= mes_inicio) & 
-            (proyecciones_df['mes'] <= mes_fin)
-        ]
-        
-        # Calcular totales del trimestre
-        revenue_total = df_trimestre['revenue'].sum()
-        flujo_neto_total = df_trimestre['flujo_neto'].sum()
-        
-        # Calcular utilidad local requerida (10% del revenue)
-        utilidad_local = revenue_total * 0.10
-        
-        # Calcular transferencia a casa matriz
-        transferencia_hq = flujo_neto_total - utilidad_local
-        
-        trimestres.append({
-            'trimestre': f'T{trimestre_num}',
-            'meses': f'{mes_inicio}-{mes_fin}',
-            'revenue_total': revenue_total,
-            'flujo_neto_total': flujo_neto_total,
-            'utilidad_local_10pct': utilidad_local,
-            'transferencia_hq': max(0, transferencia_hq),  # No transferir si es negativo
-            'margen_retenido': (utilidad_local / revenue_total * 100) if revenue_total > 0 else 0
-        })
+    Returns:
+        dict {escenario: DataFrame} (copias: el llamador puede modificarlas)
+    """
+    escenarios = list(escenarios or ESCENARIOS)
+    if 'cache_proyecciones' not in st.session_state:
+        st.session_state.cache_proyecciones = {}
+    cache = st.session_state.cache_proyecciones
+    obtener_estadisticas_cache_proyecciones()  # Inicializa contadores
+    estadisticas = st.session_state.cache_proyecciones_stats
     
-    return {
-        'trimestres': pd.DataFrame(trimestres),
-        'numero_trimestres': numero_trimestres,
-        'total_transferencias': sum([t['transferencia_hq'] for t in trimestres])
+    ano_base = datetime.now().year
+    revenue_equipos_50pct = calcular_revenue_equipos_disponibles_50pct()
+    trayectoria_base, clave_backend = calcular_trayectoria_base(meses, ultimo_mes_historico, ano_base)
+    clave = _huella_proyeccion(revenue_base, financial_data, seasonal_factors, ultimo_mes_historico,
+                               ano_base, revenue_equipos_50pct, clave_backend)
+    
+    entrada = cache.get(clave)
+    if entrada is not None and entrada['meses'] >= meses:
+        estadisticas['hits'] += 1
+        # Mover al final (más reciente) para política LRU
+        cache[clave] = cache.pop(clave)
+    else:
+        estadisticas['misses'] += 1
+        entrada = {
+            'meses': meses,
+            'proyecciones': generar_proyecciones_vectorizadas(
+                revenue_base,
+                financial_data,
+                meses,
+                escenarios=ESCENARIOS,
+                seasonal_factors=seasonal_factors,
+                ultimo_mes_historico=ultimo_mes_historico,
+                indice_cartera=obtener_indice_cartera(),
+                revenue_equipos_50pct=revenue_equipos_50pct,
+                ano_base=ano_base,
+                trayectoria_base=trayectoria_base
+            )
+        }
+        cache.pop(clave, None)
+        cache[clave] = entrada
+        while len(cache) > MAX_ENTRADAS_CACHE_PROYECCIONES:
+            cache.pop(next(iter(cache)))
+    
+    proyecciones = {
+        escenario: entrada['proyecciones'][escenario].iloc[:meses].copy()
+        for escenario in escenarios
     }
+    # 🆕 v7.2.0: Registrar con qué factores estacionales se calculó
+    huella_estacional = huella_factores(seasonal_factors)
+    for df_proj in proyecciones.values():
+        df_proj.attrs['huella_estacional'] = huella_estacional
+    return proyecciones
+
 
-def calcular_transferencias_con_balance(proyecciones_df, efectivo_inicial, meses_a_proyectar):
+@perfilar
+def generar_proyecciones_por_escenario(revenue_base, financial_data, meses, escenario, seasonal_factors=None, ultimo_mes_historico=None):
     """
-    🆕 v4.8.1: Calcula transferencias Y balance ajustado después de cada transferencia
-    
-    CORRECCIÓN CRÍTICA: Al final de cada trimestre, la transferencia se DESCUENTA
-    del balance, por lo que el siguiente trimestre parte con menos efectivo.
+    ✅ v5.0.2: Genera proyecciones según NUEVAS FÓRMULAS de escenarios
+    ✅ v5.0.3: Protección cuando todos los valores son 0
+    ✅ v6.0.1: NUEVA FUNCIONALIDAD - Estacionalidad integrada en proyecciones
+    🆕 v6.0.6: CORRECCIÓN CRÍTICA - Usar último mes histórico real para proyecciones
+    🆕 v6.4.0: Delegado al motor vectorizado generar_proyecciones_vectorizadas()
+    🆕 v6.4.2: Resultado memoizado (obtener_proyecciones)
     
     Args:
-        proyecciones_df: DataFrame con proyecciones (debe tener 'mes', 'revenue', 'flujo_neto')
-        efectivo_inicial: Efectivo disponible al inicio del período
-        meses_a_proyectar: Número total de meses proyectados
+        revenue_base: Revenue mensual base (solo equipos operando)
+        financial_data: Dict con gastos_fijos y tasa_costos_variables
+        meses: Número de meses a proyectar
+        escenario: 'Conservador', 'Moderado' o 'Optimista'
+        seasonal_factors: Dict opcional con factores estacionales por mes (ej: {'Enero': 0.76, 'Julio': 1.465})
+        ultimo_mes_historico: Int opcional con el último mes histórico (1-12). Si no se proporciona, usa mes actual del sistema
     
     Returns:
-        dict con:
-        - 'trimestres': DataFrame con análisis trimestral
-        - 'balance_mensual': DataFrame con balance mes a mes (DESPUÉS de transferencias)
-        - 'total_transferencias': Total transferido
-        - 'balance_final': Balance después de todas las transferencias
-    
-    LÓGICA:
-    1. Acumular flujo neto mes a mes
-    2. Al final de cada trimestre:
-       - Calcular transferencia (Flujo Neto Trimestral - 10% Revenue Trimestral)
-       - DESCONTAR transferencia del balance
-       - Continuar con balance ajustado
-    """
+        DataFrame con columnas: ['mes', 'mes_numero', 'ano', 'nombre_mes', 'revenue',
+        'egresos_totales', 'flujo_neto', 'costos_contratos']
     
-    numero_trimestres = int(np.ceil(meses_a_proyectar / 3))
-    
-    trimestres = []
-    balance_mensual = []
-    
-    balance_actual = efectivo_inicial
+    NUEVOS ESCENARIOS v5.0.2:
+    - Conservador: Solo equipos operando + estacionalidad
+    - Moderado: Equipos operando + contratos activos + 50% cotizaciones
+    - Optimista: Moderado + 50% equipos disponibles/standby alquilados
     
-    for trimestre_num in range(1, numero_trimestres + 1):
-        # Determinar qué meses corresponden a este trimestre
-        mes_inicio = (trimestre_num - 1) * 3 + 1
-        mes_fin = min(trimestre_num * 3, meses_a_proyectar)
-        
-        # Balance al inicio del trimestre
-        balance_inicio_trimestre = balance_actual
-        
-        # Acumular flujo mes a mes durante el trimestre
-        df_trimestre = proyecciones_df[
-            (proyecciones_df['mes'] >= mes_inicio) & 
-            (proyecciones_df['mes'] <= mes_fin)
-        ]
-        
-        revenue_total = 0
-        flujo_neto_total = 0
-        
-        for idx, row in df_trimestre.iterrows():
-            # Acumular balance
-            balance_actual += row['flujo_neto']
-            revenue_total += row['revenue']
-            flujo_neto_total += row['flujo_neto']
-            
-            # Guardar balance mensual (ANTES de transferencia)
-            balance_mensual.append({
-                'mes': int(row['mes']),
-                'trimestre': f'T{trimestre_num}',
-                'balance_antes_transferencia': balance_actual,
-                'flujo_neto_mes': row['flujo_neto']
-            })
-        
-        # Al final del trimestre: calcular y aplicar transferencia
-        utilidad_local = revenue_total * 0.10
-        transferencia_hq = max(0, flujo_neto_total - utilidad_local)
-        
-        # CRÍTICO: Descontar transferencia del balance
-        balance_despues_transferencia = balance_actual - transferencia_hq
-        
-        # Guardar info del trimestre
-        trimestres.append({
-            'trimestre': f'T{trimestre_num}',
-            'meses': f'{mes_inicio}-{mes_fin}',
-            'balance_inicio': balance_inicio_trimestre,
-            'revenue_total': revenue_total,
-            'flujo_neto_total': flujo_neto_total,
-            'utilidad_local_10pct': utilidad_local,
-            'transferencia_hq': transferencia_hq,
-            'balance_despues_transferencia': balance_despues_transferencia,
-            'margen_retenido': (utilidad_local / revenue_total * 100) if revenue_total > 0 else 0
-        })
-        
-        # Actualizar balance para el siguiente trimestre
-        balance_actual = balance_despues_transferencia
-        
-        # Actualizar el último mes del trimestre con balance después de transferencia
-        if balance_mensual:
-            balance_mensual[-1]['balance_despues_transferencia'] = balance_despues_transferencia
-            balance_mensual[-1]['transferencia_aplicada'] = transferencia_hq
+    🆕 v6.0.1 - ESTACIONALIDAD:
+    Si se proporciona seasonal_factors, las proyecciones aplicarán el patrón estacional
+    histórico a cada mes proyectado (ej: pico en Julio, baja en Diciembre).
     
-    # Completar información de meses sin transferencia
-    for i, bm in enumerate(balance_mensual):
-        if 'balance_despues_transferencia' not in bm:
-            bm['balance_despues_transferencia'] = bm['balance_antes_transferencia']
-            bm['transferencia_aplicada'] = 0
+    🆕 v6.0.6 - CORRECCIÓN CRÍTICA:
+    Usa el último mes del histórico para calcular los meses proyectados.
+    Ejemplo: Si histórico termina en Septiembre (mes 9), proyecciones serán Oct, Nov, Dic...
     
-    return {
-        'trimestres': pd.DataFrame(trimestres),
-        'balance_mensual': pd.DataFrame(balance_mensual),
-        'numero_trimestres': numero_trimestres,
-        'total_transferencias': sum([t['transferencia_hq'] for t in trimestres]),
-        'balance_final': balance_actual
-    }
+    🆕 v6.4.0 - RENDIMIENTO:
+    Para varios escenarios usar directamente generar_proyecciones_vectorizadas(),
+    que los calcula todos en una sola pasada.
+    """
+    return obtener_proyecciones(
+        revenue_base,
+        financial_data,
+        meses,
+        escenarios=[escenario],
+        seasonal_factors=seasonal_factors,
+        ultimo_mes_historico=ultimo_mes_historico
+    )[escenario]
+
+
+# =============================================================================
+# 🆕 v7.4.1: GRAFO INCREMENTAL DE FLUJO DE CAJA
+# =============================================================================
+# Resumen Ejecutivo y Balance Proyectado recalculaban proyecciones, balance,
+# excedentes y transferencias ante cualquier cambio. Cada consumidor mantiene
+# ahora su grafo (spt_forecast.motor.crear_grafo_flujo_caja) en session_state:
+# cambiar el efectivo disponible no toca las proyecciones y cambiar los meses de
+# colchón solo recalcula necesidades, excedentes y recomendaciones. El nodo
+# 'proyecciones' se reemplaza por uno que usa obtener_proyecciones() (cache LRU
+# compartido; cartera y método de pronóstico de session_state como entradas).
+
+RENTABILIDAD_INVERSION_ESTIMADA = 0.10
+
+
+def _proyecciones_grafo(revenue_base, financial_data, meses, escenarios, seasonal_factors,
+                        ultimo_mes_historico, cartera, origen):
+    # cartera y origen solo aportan su versión: obtener_proyecciones() los lee de session_state
+    return obtener_proyecciones(
+        revenue_base,
+        financial_data,
+        meses,
+        escenarios=escenarios,
+        seasonal_factors=seasonal_factors,
+        ultimo_mes_historico=ultimo_mes_historico
+    )
+
+
+def obtener_grafo_flujo_caja(consumidor, data, meses, escenarios, efectivo_inicial):
+    """
+    🆕 v7.4.1: Grafo del consumidor con las entradas actuales fijadas
+
+    Args:
+        consumidor: 'resumen' o 'balance' (cada uno con su horizonte y escenarios)
+
+    Returns:
+        dict del grafo, listo para spt_forecast.grafo.evaluar()
+    """
+    grafos = st.session_state.setdefault('grafos_flujo_caja', {})
+    grafo = grafos.get(consumidor)
+    if grafo is None:
+        grafo = crear_grafo_flujo_caja()
+        definir_entrada(grafo, 'cartera')
+        definir_entrada(grafo, 'origen')
+        definir_nodo(grafo, 'proyecciones', _proyecciones_grafo, (
+            'revenue_base', 'financial_data', 'meses', 'escenarios', 'seasonal_factors',
+            'ultimo_mes_historico', 'cartera', 'origen'
+        ))
+        grafos[consumidor] = grafo
+
+    financial = data['financial']
+    df_hist = data['historical'].get('data')
+    huella_historico = None
+    if df_hist is not None and not df_hist.empty:
+        huella_historico = huella_serie(df_hist['revenue'].to_numpy(dtype=float), 1)
+
+    fijar_entrada(grafo, 'revenue_base', data['historical']['revenue_promedio'])
+    fijar_entrada(grafo, 'financial_data', financial,
+                  huella=(financial.get('gastos_fijos', 0), financial.get('tasa_costos_variables', 0)))
+    fijar_entrada(grafo, 'seasonal_factors', data['seasonal_factors'])
+    fijar_entrada(grafo, 'ultimo_mes_historico', data['historical'].get('ultimo_mes'))
+    fijar_entrada(grafo, 'cartera', None, huella=(
+        st.session_state.get('version_cartera', 0),
+        len(st.session_state.get('contratos_manuales', [])),
+        len(st.session_state.get('cotizaciones_manuales', []))
+    ))
+    fijar_entrada(grafo, 'origen', None, huella=(
+        st.session_state.get('backend_pronostico', BACKEND_PRONOSTICO_DEFAULT),
+        huella_historico,
+        calcular_revenue_equipos_disponibles_50pct()
+    ))
+    fijar_entrada(grafo, 'meses', meses)
+    fijar_entrada(grafo, 'escenarios', list(escenarios))
+    fijar_entrada(grafo, 'efectivo_inicial', efectivo_inicial)
+    fijar_entrada(grafo, 'meses_colchon', st.session_state.meses_colchon)
+    fijar_entrada(grafo, 'dias_liquidacion', st.session_state.dias_liquidacion)
+    fijar_entrada(grafo, 'rentabilidad_estimada', RENTABILIDAD_INVERSION_ESTIMADA)
+    return grafo
+
+
+def mostrar_estadisticas_grafo(grafo):
+    """🆕 v7.4.1: Tabla de versión, ejecuciones, aciertos y tiempo por nodo"""
+    filas = obtener_estadisticas_grafo(grafo)
+    mostrar_tabla(
+        pd.DataFrame([
+            {
+                'Nodo': fila['nodo'],
+                'Depende de': ', '.join(fila['dependencias']),
+                'Versión': fila['version'],
+                'Ejecuciones': fila['ejecuciones'],
+                'Aciertos': fila['aciertos'],
+                'Último (ms)': f"{fila['ultimo_ms']:.1f}" if fila['ultimo_ms'] is not None else "-",
+                'Total (ms)': f"{fila['total_ms']:.1f}"
+            }
+            for fila in filas
+        ]),
+        use_container_width=True,
+        hide_index=True
+    )
+    st.caption("Un nodo solo se recalcula cuando cambia la versión de alguna de sus dependencias.")
+
+# =============================================================================
+# 🆕 v6.5.0: SIMULACIÓN MONTE CARLO DE FLUJO DE CAJA
+# =============================================================================
+# Los 3 escenarios fijos no dicen qué tan probable es quedarse sin caja. El modo
+# estocástico simula miles de trayectorias de revenue en un solo array NumPy:
+#   - Crecimiento: retornos mes a mes (log) del histórico desestacionalizado,
+#     remuestreados con reemplazo (bootstrap) → reemplaza las tasas fijas 1/2/3%
+#   - Estacionalidad: mismos factores que las proyecciones determinísticas
+#   - Cotizaciones: cada una cierra (o no) según probabilidad_cierre (Bernoulli)
+#   - Contratos activos y costos: igual que el escenario determinístico
+# Resultado: bandas P5/P50/P95 del balance y probabilidad de romper el colchón
+# de meses_colchon (necesidades mínimas dinámicas).
+# 🆕 v7.0.0: La simulación vive en spt_forecast.simulacion (sin Streamlit)
 
+SIMULACIONES_MONTE_CARLO = [10000, 25000, 50000, 100000]
+
+
+@perfilar
 def get_data():
     """
     Retorna datos según la fuente (none/demo/real)
@@ -3073,7 +3506,9 @@ def get_data():
                 seasonal_by_year[year] = [r / avg for r in revenues]
         
         # ✅ CAMBIO PRINCIPAL: Usar factores estacionales REALES
+        # 🆕 v7.5.2: Siempre las constantes (nunca datos cargados por otros usuarios)
         seasonal_avg = get_real_seasonal_factors()
+        version_estacional = {'version': None, 'huella': huella_factores(seasonal_avg)}
         
         # ✅ Usar métricas financieras REALES
         financial_real = get_real_financial_data()
@@ -3103,7 +3538,8 @@ def get_data():
                 'margen_operativo': financial_real['margen_operativo']
             },
             'seasonal_factors': seasonal_avg,
-            'seasonal_by_year': seasonal_by_year
+            'seasonal_by_year': seasonal_by_year,
+            'seasonal_version': version_estacional
         }
     
     # Fallback: retornar estructura vacía
@@ -3216,38 +3652,7 @@ def generar_proyecciones_multi_escenario(meses, revenue_base, financial_data, se
     
     return resultados
 
-def generar_balance_multi_escenario(meses, efectivo_inicial, proyecciones):
-    """
-    ✅ Balance multi-escenario corregido
-    ✅ v6.2.3: Ahora incluye nombre_mes con año para etiquetas correctas
-    """
-    
-    balances = {}
-    
-    for escenario, df_proj in proyecciones.items():
-        balance = []
-        efectivo_acumulado = efectivo_inicial
-        
-        for idx, row in df_proj.iterrows():
-            # 🆕 v4.6.1: Usar 'egresos_totales' en lugar de 'gastos'
-            flujo_neto = row['revenue'] - row['egresos_totales']
-            efectivo_acumulado += flujo_neto
-            
-            balance.append({
-                'mes': int(row['mes']),
-                'nombre_mes': row.get('nombre_mes', f"Mes {int(row['mes'])}"),  # ✅ v6.2.3: Incluir nombre con año
-                'efectivo_inicial': efectivo_acumulado - flujo_neto,
-                'ingresos': row['revenue'],
-                'egresos_totales': row['egresos_totales'],
-                'flujo_neto': flujo_neto,
-                'efectivo_final': efectivo_acumulado,
-                'escenario': escenario
-            })
-        
-        balances[escenario] = pd.DataFrame(balance)
-    
-    return balances
-
+@perfilar
 def crear_graficos_efectivo_completos(
     df_proyeccion, 
     escenarios=['Conservador', 'Moderado', 'Optimista'],
@@ -3482,10 +3887,163 @@ def crear_graficos_efectivo_completos(
     
     return fig_flujo, fig_acumulado
 
+# =============================================================================
+# 🆕 v7.4.0: FRAGMENTOS (re-ejecución aislada por pestaña / sección)
+# =============================================================================
+# st.tabs ejecuta el cuerpo de las 6 pestañas en cada interacción. Ahora cada
+# pestaña (y las secciones pesadas de Proyecciones y Reportes) se dibuja dentro
+# de un st.fragment: mover un widget de una sección solo re-ejecuta esa sección.
+# Cada fragmento declara las claves de session_state que lee ('entradas'). Si una
+# sección re-ejecutada sola modifica una clave que otra declaró como entrada, se
+# pide un rerun completo para que las demás no queden desactualizadas. Los
+# argumentos (data, efectivo_actual) se recalculan solo en reruns completos.
+
+DEPENDENCIAS_FRAGMENTOS = {}
+
+
+def _huella_entrada(valor):
+    """Huella barata: el valor si es escalar; identidad + tamaño si es contenedor"""
+    if valor is None or isinstance(valor, (str, int, float, bool)):
+        return valor
+    if isinstance(valor, (list, dict)):
+        return (id(valor), len(valor))
+    return id(valor)
+
+
+def huella_entradas(claves):
+    """Huellas de las claves de session_state indicadas (en orden)"""
+    return tuple(_huella_entrada(st.session_state.get(clave)) for clave in claves)
+
+
+def fragmento(nombre, entradas=()):
+    """
+    🆕 v7.4.0: st.fragment con dependencias declaradas
+
+    Args:
+        nombre: identificador único de la sección
+        entradas: claves de session_state que la sección lee
+    """
+    def decorador(funcion):
+        DEPENDENCIAS_FRAGMENTOS[nombre] = tuple(entradas)
+
+        @st.fragment
+        @functools.wraps(funcion)
+        def envoltura(*args, **kwargs):
+            # En un rerun completo 'corrida_app' avanza antes de dibujar las pestañas
+            corrida = st.session_state.get('corrida_app', 0)
+            solo_fragmento = st.session_state.get(f'corrida_fragmento_{nombre}') == corrida
+            st.session_state[f'corrida_fragmento_{nombre}'] = corrida
+
+            claves_ajenas = sorted({
+                clave
+                for otro, claves in DEPENDENCIAS_FRAGMENTOS.items() if otro != nombre
+                for clave in claves
+            })
+            antes = huella_entradas(claves_ajenas)
+            # 🆕 v7.5.0: Un fragmento re-ejecutado solo es un rerun propio para el perfilador
+            # (salvo si está anidado en otro fragmento que ya abrió el perfil)
+            perfil_propio = solo_fragmento and perfil_activo() is None
+            if perfil_propio:
+                iniciar_perfil_rerun(f'fragmento:{nombre}')
+            with medir_seccion(f'fragmento:{nombre}'):
+                funcion(*args, **kwargs)
+            if perfil_propio:
+                cerrar_perfil_rerun()
+            if solo_fragmento and huella_entradas(claves_ajenas) != antes:
+                st.rerun()  # Alcance "app": actualiza las secciones que dependen del cambio
+        return envoltura
+    return decorador
+
+
+# =============================================================================
+# 🆕 v7.5.0: PERFILADOR POR RERUN (solo administradores)
+# =============================================================================
+# Con el perfilador activo (sidebar, requiere ADMIN_PASSWORD) cada rerun completo
+# y cada re-ejecución aislada de un fragmento registran tiempo, llamadas y
+# (opcional) memoria por sección (fragmentos, sidebar) y por función caliente
+# (@perfilar: ingesta, proyecciones, revenue adicional, gráficos, tablas).
+# Los resúmenes se guardan en un historial rotativo exportable como JSON.
+
+def perfilador_habilitado():
+    """True si la sesión es de administrador y activó el perfilador"""
+    return st.session_state.get('es_admin', False) and st.session_state.get('perfilador_activo', False)
+
+
+def iniciar_perfil_rerun(etiqueta):
+    """Inicia el perfil del rerun (y descarta uno previo que haya quedado abierto)"""
+    finalizar_perfil()
+    if perfilador_habilitado():
+        iniciar_perfil(etiqueta, memoria=st.session_state.get('perfilador_memoria', False))
+
+
+def cerrar_perfil_rerun():
+    """Cierra el perfil del rerun y lo agrega al historial de la sesión"""
+    if perfil_activo() is None:
+        return
+    historial = st.session_state.setdefault('historial_perfiles', [])
+    agregar_a_historial(historial, finalizar_perfil())
+
+
+def _tabla_perfil(filas):
+    return pd.DataFrame([
+        {
+            'Nombre': fila['nombre'],
+            'Llamadas': fila['llamadas'],
+            'Total (ms)': round(fila['total_ms'], 1),
+            'Máx (ms)': round(fila['max_ms'], 1),
+            'Memoria (KB)': round(fila['memoria_kb'], 1) if fila['memoria_kb'] is not None else None
+        }
+        for fila in filas
+    ])
+
+
+def mostrar_panel_perfilador():
+    """🆕 v7.5.0: Panel del perfilador en el sidebar (último rerun + exportar historial)"""
+    with st.expander("⏱️ Perfilador (admin)", expanded=False):
+        st.toggle("Perfilar cada rerun", key="perfilador_activo")
+        st.checkbox(
+            "Medir memoria (tracemalloc)",
+            key="perfilador_memoria",
+            help="Activa tracemalloc durante el rerun: agrega memoria asignada por sección, pero hace más "
+                 "lentas todas las sesiones mientras esté activo (el pico solo se informa si ninguna otra "
+                 "sesión está midiendo memoria)"
+        )
+        
+        historial = st.session_state.get('historial_perfiles', [])
+        if not historial:
+            st.caption("Sin reruns perfilados todavía")
+            return
+        
+        ultimo = historial[-1]
+        pico = f" · pico {ultimo['pico_memoria_kb']:,.0f} KB" if ultimo['pico_memoria_kb'] is not None else ""
+        st.caption(f"Último: {ultimo['etiqueta']} · {ultimo['fecha']} · {ultimo['duracion_ms']:,.0f} ms{pico}")
+        st.markdown("**Secciones**")
+        st.dataframe(_tabla_perfil(ultimo['secciones']), use_container_width=True, hide_index=True)
+        st.markdown("**Funciones**")
+        st.dataframe(_tabla_perfil(ultimo['funciones']), use_container_width=True, hide_index=True)
+        
+        col_exp, col_limpiar = st.columns(2)
+        with col_exp:
+            st.download_button(
+                "📥 JSON",
+                data=json.dumps(historial, ensure_ascii=False, indent=2),
+                file_name=f"perfiles_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
+                mime="application/json",
+                key="btn_exportar_perfiles",
+                help=f"Historial de los últimos {len(historial)} reruns"
+            )
+        with col_limpiar:
+            if st.button("🗑️ Limpiar", key="btn_limpiar_perfiles"):
+                st.session_state.historial_perfiles = []
+
+
 # =============================================================================
 # HEADER Y SIDEBAR
 # =============================================================================
 
+# 🆕 v7.5.0: Perfil del rerun completo (se cierra al final del script)
+iniciar_perfil_rerun('app')
+
 
 st.markdown(f"**Estado al:** {datetime.now().strftime('%Y-%m-%d %H:%M')}")
 
@@ -3502,7 +4060,7 @@ st.markdown("---")
 # SIDEBAR
 # =============================================================================
 
-with st.sidebar:
+with st.sidebar, medir_seccion('sidebar'):
     # 🎨 v6.0.0: Logo y título con branding institucional
     st.markdown('<div class="sidebar-logo">', unsafe_allow_html=True)
     
@@ -3668,6 +4226,11 @@ with st.sidebar:
     
     st.markdown("---")
     
+    # 🆕 v7.5.0: Perfilador por rerun (solo administradores)
+    if st.session_state.get('es_admin', False):
+        mostrar_panel_perfilador()
+        st.markdown("---")
+    
     # 🆕 v6.0.0 FASE B: Información movida al final del sidebar (sin navegación)
     st.markdown("### ℹ️ Información")
     st.markdown("""
@@ -3711,6 +4274,9 @@ with st.sidebar:
 # OBTENER DATOS
 # =============================================================================
 
+# 🆕 v7.4.0: Contador de reruns completos (los fragmentos lo usan para saber si corren solos)
+st.session_state.corrida_app = st.session_state.get('corrida_app', 0) + 1
+
 data = get_data()
 
 # 🆕 v6.0.0: Definir efectivo_actual antes de las pestañas para que esté disponible en todas
@@ -3736,7 +4302,8 @@ tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs([
 # TAB 1: CARGA DE DATOS
 # =============================================================================
 
-with tab1:
+@fragmento('carga_datos', entradas=('data_source', 'datos_procesados', 'uploaded_files', 'escenario_proyeccion', 'meses_colchon'))
+def renderizar_carga_datos(data, efectivo_actual):
     st.markdown("## 📁 Carga de Datos")
 
     st.info("""
@@ -3786,6 +4353,29 @@ with tab1:
                 st.session_state.data_source = 'upload'
                 st.info("👇 Cargue sus archivos abajo")
 
+    # 🆕 v6.3.2: Carga rápida desde snapshot Parquet (sin re-subir los Excel)
+    snapshots_disponibles = listar_snapshots() if PARQUET_DISPONIBLE else []
+    if snapshots_disponibles:
+        with st.expander("⚡ Carga Rápida desde Snapshot", expanded=st.session_state.datos_procesados is None):
+            opciones_snapshot = {
+                f"{snap['fecha']} — {snap['periodos']} periodos ({snap['nombre']})": snap['ruta']
+                for snap in snapshots_disponibles
+            }
+            snapshot_elegido = st.selectbox(
+                "Snapshot de datos procesados",
+                options=list(opciones_snapshot.keys()),
+                key="snapshot_select",
+                help="Datos ya procesados en una sesión anterior (Parquet en data/cache/snapshots)"
+            )
+            if st.button("⚡ Cargar Snapshot", use_container_width=True, key="btn_cargar_snapshot"):
+                datos_snapshot = cargar_snapshot(opciones_snapshot[snapshot_elegido])
+                if datos_snapshot:
+                    st.session_state.data_source = 'real'
+                    st.session_state.datos_procesados = datos_snapshot
+                    st.rerun()
+                else:
+                    st.error("❌ No fue posible cargar el snapshot seleccionado")
+
     # Sección de carga de archivos (solo visible si seleccionó cargar propios)
     if st.session_state.data_source in ['upload', 'real'] or st.session_state.datos_procesados is not None:
         st.markdown("---")
@@ -3835,6 +4425,41 @@ with tab1:
         if all_files:
             st.success("✅ Todos los archivos cargados")
 
+            # 🆕 v6.3.3: Ingesta paralela opcional (útil en servidores multi-núcleo)
+            procesamiento_paralelo = st.checkbox(
+                "⚡ Procesamiento paralelo (multi-núcleo)",
+                value=False,
+                key="chk_procesamiento_paralelo",
+                help="Parsea los 5 archivos Excel simultáneamente en procesos separados. "
+                     "Recomendado para archivos grandes en servidores con varios núcleos."
+            )
+
+            # 🆕 v6.3.2: Snapshot local opcional (los datos quedan en disco del servidor)
+            guardar_snapshot_local = st.checkbox(
+                "💾 Guardar snapshot local para recarga rápida",
+                value=False,
+                disabled=not PARQUET_DISPONIBLE,
+                key="chk_guardar_snapshot",
+                help="Guarda los datos procesados en Parquet (data/cache/snapshots) para "
+                     "recargarlos en milisegundos en otra sesión. Requiere pyarrow."
+            )
+
+            # 🆕 v7.5.2: Almacén estacional por fuente de datos, en disco opcional
+            fuente_datos = st.text_input(
+                "🏢 Fuente de datos (empresa)",
+                value=FUENTE_DATOS_DEFAULT,
+                key="txt_fuente_datos",
+                help="Identifica el almacén estacional: las nuevas cargas de la misma fuente "
+                     "actualizan sus meses y su versión. Usar otro nombre para otra empresa."
+            )
+            guardar_estacionalidad_local = st.checkbox(
+                "🗂️ Guardar almacén estacional local",
+                value=False,
+                key="chk_guardar_estacionalidad",
+                help="Guarda los acumulados estacionales de esta fuente en data/cache/estacionalidad "
+                     "para conservar su historial de versiones entre sesiones."
+            )
+
             if st.button("🚀 Procesar Datos", use_container_width=True, type="primary", key="btn_procesar_datos"):
                 with st.spinner("⚙️ Procesando archivos Excel..."):
                     try:
@@ -3859,13 +4484,26 @@ with tab1:
 
                         # Procesar archivos
                         st.info("📊 Extrayendo datos de Utilization Reports...")
-                        datos_reales = procesar_archivos_reales(files_dict)
+                        datos_reales = procesar_archivos_reales(
+                            files_dict,
+                            paralelo=procesamiento_paralelo,
+                            persistir_estacionalidad=guardar_estacionalidad_local,
+                            fuente_datos=fuente_datos
+                        )
 
                         if datos_reales:
                             # Guardar datos procesados
                             st.session_state.data_source = 'real'
                             st.session_state.datos_procesados = datos_reales
 
+                            # 🆕 v6.3.2: Persistir snapshot columnar si el usuario lo solicitó
+                            if guardar_snapshot_local:
+                                hashes_archivos = {
+                                    clave: calcular_hash_archivo(archivo)[0]
+                                    for clave, archivo in files_dict.items()
+                                }
+                                guardar_snapshot(datos_reales, hashes_archivos)
+
                             st.success("✅ Archivos procesados exitosamente")
                             st.success(f"📈 Revenue promedio: ${datos_reales['historical']['revenue_promedio']:,.0f}")
                             st.success(f"💰 Burn Rate: ${datos_reales['financial']['burn_rate']:,.0f}")
@@ -3901,12 +4539,16 @@ with tab1:
     with col3:
         st.metric("📊 Escenario Activo", st.session_state.escenario_proyeccion)
 
+with tab1:
+    renderizar_carga_datos(data, efectivo_actual)
+
 
     # =============================================================================
     # TAB 2: INGRESO MANUAL
     # =============================================================================
 
-with tab2:
+@fragmento('ingreso_manual', entradas=('datos_procesados', 'contratos_manuales', 'cotizaciones_manuales', 'version_cartera'))
+def renderizar_ingreso_manual(data, efectivo_actual):
 
     st.markdown("## 📝 Ingreso Manual de Cotizaciones y Contratos")
 
@@ -3963,7 +4605,7 @@ with tab2:
             clientes_historicos = get_clientes_historicos()
             clientes_disponibles.extend(sorted(list(clientes_historicos)))
         except Exception as e:
-            print(f"⚠️ Error cargando clientes históricos: {str(e)}")
+            logger.warning("Error cargando clientes históricos: %s", e)
 
         # Agregar clientes de cotizaciones y contratos manuales
         try:
@@ -4107,6 +4749,7 @@ with tab2:
 
                     # Guardar en session_state
                     st.session_state.cotizaciones_manuales.append(nueva_cotizacion)
+                    marcar_cartera_modificada()  # 🆕 v6.4.1
 
                     # Limpiar equipos temporales
                     st.session_state.equipos_temp_quote = []
@@ -4213,6 +4856,7 @@ with tab2:
 
                     if st.button(f"🗑️ Eliminar", key=f"del_quote_{idx}"):
                         st.session_state.cotizaciones_manuales.pop(idx)
+                        marcar_cartera_modificada()  # 🆕 v6.4.1
                         st.rerun()
 
     # =========================================================================
@@ -4229,7 +4873,7 @@ with tab2:
             clientes_historicos = get_clientes_historicos()
             clientes_disponibles_c.extend(sorted(list(clientes_historicos)))
         except Exception as e:
-            print(f"⚠️ Error cargando clientes históricos: {str(e)}")
+            logger.warning("Error cargando clientes históricos: %s", e)
 
         # Agregar clientes de cotizaciones y contratos manuales
         try:
@@ -4384,6 +5028,7 @@ with tab2:
 
                     # Guardar en session_state
                     st.session_state.contratos_manuales.append(nuevo_contrato)
+                    marcar_cartera_modificada()  # 🆕 v6.4.1
 
                     # 🆕 v4.9.3: Limpiar equipos temporales
                     st.session_state.equipos_temp_contract = []
@@ -4442,7 +5087,7 @@ with tab2:
 
         with col_eq4:
             # ✅ v5.0: Obtener tarifa sugerida desde datos históricos
-            tarifas_sugeridas = obtener_tarifas_sugeridas_por_equipo()
+            tarifas_sugeridas = obtener_tarifas_sugeridas_por_equipo(st.session_state.datos_procesados)
             tipo_equipo = equipo_seleccionado['tipo'] if equipo_seleccionado else None
             # ✅ v5.0.1: Obtener tarifa mensual sugerida desde datos reales de 2025
             tarifa_sugerida_mensual = get_tarifa_sugerida(tipo_equipo) if tipo_equipo else 0
@@ -4522,6 +5167,7 @@ with tab2:
 
                     if st.button(f"🗑️ Eliminar", key=f"del_contract_{idx}"):
                         st.session_state.contratos_manuales.pop(idx)
+                        marcar_cartera_modificada()  # 🆕 v6.4.1
                         st.rerun()
 
     # =========================================================================
@@ -4557,7 +5203,7 @@ with tab2:
                     }
                     for q in st.session_state.cotizaciones_manuales
                 ])
-                st.dataframe(df_quotes, use_container_width=True, hide_index=True)
+                mostrar_tabla(df_quotes, use_container_width=True, hide_index=True)
             else:
                 st.info("No hay cotizaciones ingresadas aún")
 
@@ -4585,7 +5231,7 @@ with tab2:
                     }
                     for c in st.session_state.contratos_manuales
                 ])
-                st.dataframe(df_contracts, use_container_width=True, hide_index=True)
+                mostrar_tabla(df_contracts, use_container_width=True, hide_index=True)
             else:
                 st.info("No hay contratos ingresados aún")
 
@@ -4612,15 +5258,20 @@ with tab2:
                 if st.checkbox("⚠️ Confirmar eliminación de todos los datos"):
                     st.session_state.cotizaciones_manuales = []
                     st.session_state.contratos_manuales = []
+                    marcar_cartera_modificada()  # 🆕 v6.4.1
                     st.success("✅ Todos los datos han sido eliminados")
                     st.rerun()
 
+with tab2:
+    renderizar_ingreso_manual(data, efectivo_actual)
+
 
     # =============================================================================
     # TAB 3: RESUMEN EJECUTIVO
     # =============================================================================
 
-with tab3:
+@fragmento('resumen_ejecutivo', entradas=('data_source', 'datos_procesados', 'contratos_manuales', 'cotizaciones_manuales', 'version_cartera', 'escenario_proyeccion', 'meses_colchon', 'dias_liquidacion'))
+def renderizar_resumen_ejecutivo(data, efectivo_actual):
 
     st.markdown("## 🎯 Resumen Ejecutivo")
 
@@ -4638,25 +5289,17 @@ with tab3:
     # ✅ v5.0.3: Usar proyecciones por escenario que incluyen contratos/cotizaciones
     # 🆕 v6.0.1: ESTACIONALIDAD integrada - proyecciones ahora consideran patrones históricos
     # 🆕 v6.0.6: Pasar último mes histórico para proyecciones correctas
-    proyecciones_df = generar_proyecciones_por_escenario(
-        revenue_mensual,
-        data['financial'],
-        meses=3,
-        escenario=st.session_state.escenario_proyeccion,
-        seasonal_factors=data['seasonal_factors'],  # 🆕 Aplicar estacionalidad
-        ultimo_mes_historico=data['historical'].get('ultimo_mes')  # 🆕 v6.0.6
-    )
+    # 🆕 v7.4.1: Grafo incremental - solo se recalculan los nodos cuyas entradas cambiaron
+    escenario_resumen = st.session_state.escenario_proyeccion
+    grafo_resumen = obtener_grafo_flujo_caja('resumen', data, 3, [escenario_resumen], efectivo_actual)
+    proyecciones_df = evaluar(grafo_resumen, 'proyecciones')[escenario_resumen]
     flujos_proyectados = proyecciones_df['flujo_neto'].tolist()
 
     runway = calcular_runway_mejorado(efectivo_actual, flujos_proyectados, burn_rate)
     # 🆕 v4.6.0: Pasar meses_colchon configurado por el usuario
     # ✅ v6.2.3: Ahora pasa proyecciones_df y financial_data para cálculo dinámico
-    analisis_cash = calcular_necesidades_excedentes_mejorado(
-        efectivo_actual, 
-        proyecciones_df,  # ✅ v6.2.3: DataFrame completo con costos_contratos
-        data['financial'],  # ✅ v6.2.3: Datos financieros para cálculo dinámico
-        st.session_state.meses_colchon
-    )
+    # 🆕 v7.4.1: Nodo 'necesidades' (calcular_necesidades_excedentes_mejorado)
+    analisis_cash = evaluar(grafo_resumen, 'necesidades')[escenario_resumen]
 
     # KPIs
     col1, col2, col3, col4 = st.columns(4)
@@ -4730,7 +5373,7 @@ with tab3:
             ]
         })
 
-        st.dataframe(metrics_df, use_container_width=True, hide_index=True)
+        mostrar_tabla(metrics_df, use_container_width=True, hide_index=True)
 
         st.info(f"""
         💡 **Metodología de Burn Rate (v4.6.0):**  
@@ -4754,7 +5397,7 @@ with tab3:
             clients_list = sorted(top_clients.items(), key=lambda x: x[1], reverse=True)[:5]
             df_clients = pd.DataFrame(clients_list, columns=['Cliente', 'Revenue (USD)'])
             df_clients['Revenue (USD)'] = df_clients['Revenue (USD)'].apply(lambda x: f"${x:,.0f}")
-            st.dataframe(df_clients, use_container_width=True, hide_index=True)
+            mostrar_tabla(df_clients, use_container_width=True, hide_index=True)
             st.caption("✅ Datos reales: Utilization Report 2025 (Accrual Revenue)")
         else:
             # Mostrar mensaje cuando no hay datos
@@ -4779,7 +5422,7 @@ with tab3:
     )
 
     fig.update_layout(height=400, showlegend=False)
-    st.plotly_chart(fig, use_container_width=True, key="chart_resumen_flujo_neto_3m")
+    mostrar_grafico(fig, use_container_width=True, key="chart_resumen_flujo_neto_3m")
 
     # Balance al final de 3 meses
     balance_3m = analisis_cash['balance_proyectado']
@@ -4817,31 +5460,15 @@ with tab3:
     para operación. Los fondos se liquidan automáticamente con la anticipación configurada.
     """)
 
-    # 🆕 v4.8.1: Generar proyecciones DETERMINISTAS según escenario seleccionado
-    # CORRECCIÓN: Elimina np.random para que proyecciones sean consistentes
-    # 🆕 v6.0.1: ESTACIONALIDAD integrada - proyecciones consideran patrones históricos
-    # 🆕 v6.0.6: Pasar último mes histórico para proyecciones correctas
-    proyecciones_3m = generar_proyecciones_por_escenario(
-        revenue_mensual,
-        data['financial'],
-        meses=3,
-        escenario=st.session_state.escenario_proyeccion,
-        seasonal_factors=data['seasonal_factors'],  # 🆕 Aplicar estacionalidad
-        ultimo_mes_historico=data['historical'].get('ultimo_mes')  # 🆕 v6.0.6
-    )
+    # 🆕 v7.4.1: Usa el nodo 'proyecciones' del grafo del resumen (3 meses, escenario seleccionado)
 
     # Calcular excedentes invertibles (inversiones VIRTUALES - no afectan balance)
     # 🆕 v6.2.2: Ahora pasa financial_data para calcular necesidades mínimas dinámicas
-    df_excedentes = calcular_excedentes_invertibles(
-        proyecciones_3m, 
-        efectivo_actual, 
-        data['financial'],  # 🆕 v6.2.2: Pasar datos financieros completos
-        st.session_state.meses_colchon,
-        st.session_state.dias_liquidacion
-    )
+    # 🆕 v7.4.1: Nodo 'excedentes' (calcular_excedentes_invertibles)
+    df_excedentes = evaluar(grafo_resumen, 'excedentes')[escenario_resumen]
 
     # Generar recomendaciones de inversión
-    df_recomendaciones = generar_recomendaciones_inversion(df_excedentes, rentabilidad_estimada=0.10)
+    df_recomendaciones = evaluar(grafo_resumen, 'recomendaciones')[escenario_resumen]
 
     # Mostrar análisis de excedentes
     col1, col2 = st.columns(2)
@@ -4857,7 +5484,7 @@ with tab3:
         for col in ['Balance Disponible', 'Necesidades Mínimas', 'Excedente Invertible']:
             df_display[col] = df_display[col].apply(lambda x: f"${x:,.0f}")
 
-        st.dataframe(df_display, use_container_width=True, hide_index=True)
+        mostrar_tabla(df_display, use_container_width=True, hide_index=True)
 
     with col2:
         st.markdown("#### 💼 Recomendaciones de Inversión")
@@ -4871,7 +5498,7 @@ with tab3:
             df_rec_display['Monto'] = df_rec_display['Monto'].apply(lambda x: f"${x:,.0f}")
             df_rec_display['Rendimiento Est.'] = df_rec_display['Rendimiento Est.'].apply(lambda x: f"${x:,.0f}")
 
-            st.dataframe(df_rec_display, use_container_width=True, hide_index=True)
+            mostrar_tabla(df_rec_display, use_container_width=True, hide_index=True)
 
             # Mostrar resumen
             total_invertible = df_recomendaciones['monto_invertible'].sum()
@@ -4926,11 +5553,8 @@ with tab3:
 
     # 🆕 v4.8.1: Calcular transferencias CON balance ajustado después de cada transferencia
     # CORRECCIÓN: Las transferencias ahora se DESCUENTAN del balance
-    resultado_transferencias = calcular_transferencias_con_balance(
-        proyecciones_3m, 
-        efectivo_actual,
-        meses_a_proyectar=3
-    )
+    # 🆕 v7.4.1: Nodo 'transferencias' (calcular_transferencias_con_balance)
+    resultado_transferencias = evaluar(grafo_resumen, 'transferencias')[escenario_resumen]
 
     df_trimestres = resultado_transferencias['trimestres']
     df_balance_mensual = resultado_transferencias['balance_mensual']
@@ -4952,7 +5576,7 @@ with tab3:
     for col in df_trans_display.columns[1:]:  # Todas excepto 'Trimestre'
         df_trans_display[col] = df_trans_display[col].apply(lambda x: f"${x:,.0f}")
 
-    st.dataframe(df_trans_display, use_container_width=True, hide_index=True)
+    mostrar_tabla(df_trans_display, use_container_width=True, hide_index=True)
 
     # Alerta sobre balance después de transferencias
     balance_final = resultado_transferencias['balance_final']
@@ -5028,7 +5652,7 @@ with tab3:
             showlegend=True
         )
 
-        st.plotly_chart(fig_transfer, use_container_width=True, key="chart_resumen_transferencias")
+        mostrar_grafico(fig_transfer, use_container_width=True, key="chart_resumen_transferencias")
 
     st.caption("""
     **Nota:** Las transferencias se realizan trimestre vencido. Esto permite:
@@ -5037,6 +5661,13 @@ with tab3:
     - Optimizar la rentabilidad de los fondos antes de la transferencia
     """)
 
+    # 🆕 v7.4.1: Costo real de cada cambio por nodo del grafo
+    with st.expander("⏱️ Grafo de cálculo: tiempos por nodo", expanded=False):
+        mostrar_estadisticas_grafo(grafo_resumen)
+
+with tab3:
+    renderizar_resumen_ejecutivo(data, efectivo_actual)
+
     # =============================================================================
     # PÁGINA: ANÁLISIS HISTÓRICO
     # =============================================================================
@@ -5046,7 +5677,8 @@ with tab3:
     # TAB 4: ANÁLISIS HISTÓRICO
     # =============================================================================
 
-with tab4:
+@fragmento('analisis_historico', entradas=('datos_procesados',))
+def renderizar_analisis_historico(data, efectivo_actual):
 
     st.markdown("## 📈 Análisis Histórico")
 
@@ -5105,7 +5737,7 @@ with tab4:
         yaxis=dict(tickformat='$,.0f')
     )
 
-    st.plotly_chart(fig, use_container_width=True, key="chart_analisis_tendencia_historica")
+    mostrar_grafico(fig, use_container_width=True, key="chart_analisis_tendencia_historica")
 
     # Análisis de tendencia
     if slope > 0:
@@ -5126,7 +5758,10 @@ with tab4:
     df_display = df_hist.copy()
     df_display['revenue'] = df_display['revenue'].apply(lambda x: f"${x:,.0f}")
 
-    st.dataframe(df_display, use_container_width=True, hide_index=True)
+    mostrar_tabla(df_display, use_container_width=True, hide_index=True)
+
+with tab4:
+    renderizar_analisis_historico(data, efectivo_actual)
 
     # =============================================================================
     # PÁGINA: PROYECCIONES
@@ -5137,11 +5772,113 @@ with tab4:
     # TAB 5: PROYECCIONES
     # =============================================================================
 
-with tab5:
+@fragmento('proyecciones', entradas=('datos_procesados', 'contratos_manuales', 'cotizaciones_manuales', 'version_cartera', 'escenario_proyeccion', 'meses_colchon'))
+def renderizar_proyecciones(data, efectivo_actual):
 
     st.markdown("## 💵 Proyecciones Multi-Escenario")
 
-    meses_proyeccion = st.slider("Meses a proyectar:", 3, 12, 6, key="proyeccion_slider")
+    # 🆕 v7.1.0: Horizonte hasta 5 años (60 meses)
+    meses_proyeccion = st.slider("Meses a proyectar:", 3, MAX_MESES_PROYECCION, 6, key="proyeccion_slider")
+    
+    # 🆕 v7.3.0: Método de pronóstico del revenue base
+    serie_historica = data['historical'].get('data')
+    n_meses_historia = 0 if serie_historica is None else len(serie_historica)
+    st.selectbox(
+        "Método de pronóstico:",
+        options=list(BACKENDS.keys()),
+        format_func=lambda metodo: BACKENDS[metodo],
+        key="backend_pronostico",
+        help="Heurístico: promedio × crecimiento fijo × factores estacionales. "
+             "Los métodos estadísticos se ajustan al histórico (tendencia + estacionalidad); "
+             "Moderado sigue el pronóstico y los otros escenarios se separan según su tasa."
+    )
+    if not backend_disponible(st.session_state.backend_pronostico, n_meses_historia):
+        st.warning(
+            f"⚠️ {BACKENDS[st.session_state.backend_pronostico]} requiere al menos {MIN_MESES_ESTADISTICOS} meses de histórico "
+            f"(hay {n_meses_historia}). Se usa el método heurístico."
+        )
+    
+    if n_meses_historia > 0:
+        with st.expander("🎯 Precisión por método (últimos 6 meses del histórico)", expanded=False):
+            mes_inicial_hist = int(str(serie_historica['periodo'].iloc[0]).split('-')[1])
+            ajustes_backend = evaluar_backends(serie_historica['revenue'].to_numpy(dtype=float), mes_inicial_hist)
+            if ajustes_backend:
+                mostrar_tabla(
+                    pd.DataFrame([
+                        {
+                            'Método': BACKENDS[metodo],
+                            'MAPE': f"{ajuste['mape']:.1f}%" if ajuste['mape'] is not None else "N/A",
+                            'Sesgo': f"{ajuste['sesgo']:+.1f}%" if ajuste['sesgo'] is not None else "N/A",
+                            'Ajuste (ms)': f"{ajuste['tiempo_ms']:.1f}"
+                        }
+                        for metodo, ajuste in ajustes_backend.items()
+                    ]),
+                    use_container_width=True,
+                    hide_index=True
+                )
+                estadisticas_ajustes = obtener_estadisticas_cache_ajustes()
+                st.caption(
+                    "Cada método se ajusta sin los últimos 6 meses y se compara contra ellos "
+                    "(sesgo > 0 = sobreestima). Ajustes en cache: "
+                    f"{estadisticas_ajustes['entradas']} · hits {estadisticas_ajustes['hits']} · "
+                    f"misses {estadisticas_ajustes['misses']}"
+                )
+
+    # 🆕 v7.3.1: Backtest walk-forward del método heurístico (todos los cortes del histórico)
+    if n_meses_historia > MIN_MESES_ENTRENAMIENTO:
+        with st.expander("🧪 Backtest walk-forward (3/6/12 meses)", expanded=False):
+            serie_backtest = serie_historica['revenue'].to_numpy(dtype=float)
+            mes_inicial_backtest = int(str(serie_historica['periodo'].iloc[0]).split('-')[1])
+            variantes_backtest = {
+                'En muestra': ESTACIONALIDAD_EN_MUESTRA,
+                'Actuales': data['seasonal_factors'],
+                'Sin estacionalidad': None
+            }
+            resultados_backtest = ejecutar_backtest(
+                serie_backtest, mes_inicial_backtest,
+                variantes_estacionales=variantes_backtest
+            )
+            tabla_backtest = resultados_backtest.assign(
+                celda=[
+                    f"{mape:.1f}% ({sesgo:+.1f}%)" if pd.notna(mape) else "N/A"
+                    for mape, sesgo in zip(resultados_backtest['mape'], resultados_backtest['sesgo'])
+                ]
+            ).pivot_table(
+                index=['estacionalidad', 'configuracion'], columns='horizonte',
+                values='celda', aggfunc='first', sort=False
+            )
+            tabla_backtest.columns = [f"{h} meses" for h in tabla_backtest.columns]
+            st.markdown("**MAPE (sesgo) por escenario y horizonte**")
+            mostrar_tabla(tabla_backtest, use_container_width=True)
+
+            # Ajuste de la tasa de crecimiento: grilla de tasas mensuales × variantes
+            tasas_grilla = {f"{tasa:+.2%}": tasa for tasa in np.round(np.linspace(-0.02, 0.05, 141), 4)}
+            resultados_grilla = ejecutar_backtest(
+                serie_backtest, mes_inicial_backtest,
+                tasas_crecimiento=tasas_grilla,
+                variantes_estacionales=variantes_backtest
+            )
+            mejores = []
+            for horizonte in HORIZONTES_BACKTEST:
+                mejor = mejor_configuracion(resultados_grilla, horizonte)
+                if mejor is not None:
+                    mejores.append({
+                        'Horizonte': f"{horizonte} meses",
+                        'Tasa mensual': mejor['configuracion'],
+                        'Estacionalidad': mejor['estacionalidad'],
+                        'MAPE': f"{mejor['mape']:.1f}%",
+                        'Sesgo': f"{mejor['sesgo']:+.1f}%",
+                        'Cortes': int(mejor['n_cortes'])
+                    })
+            if mejores:
+                st.markdown(f"**Mejor configuración ({len(tasas_grilla) * len(variantes_backtest)} evaluadas)**")
+                mostrar_tabla(pd.DataFrame(mejores), use_container_width=True, hide_index=True)
+            st.caption(
+                f"En cada corte (desde el mes {MIN_MESES_ENTRENAMIENTO + 1}) se proyecta con el promedio de los meses "
+                "anteriores y se compara contra lo ocurrido; el horizonte h promedia los errores de los meses 1..h. "
+                "'En muestra' estima los factores solo con meses anteriores al corte; 'Actuales' usa los factores "
+                "vigentes (incluyen los meses evaluados). No incluye contratos ni cotizaciones."
+            )
 
     # 🆕 v6.0.3: CORRECCIÓN CRÍTICA - Usar generar_proyecciones_por_escenario para TODOS los escenarios
     # Esto asegura que la estacionalidad se aplique correctamente en los gráficos
@@ -5151,21 +5888,21 @@ with tab5:
     
     # Generar proyecciones para cada escenario usando la metodología correcta (v5.0.2)
     # 🆕 v6.0.6: Pasar último mes histórico para proyecciones correctas
-    proyecciones = {}
-    escenarios = ['Conservador', 'Moderado', 'Optimista']
-    
-    for escenario in escenarios:
-        proyecciones[escenario] = generar_proyecciones_por_escenario(
-            revenue_mensual,
-            data['financial'],
-            meses=meses_proyeccion,
-            escenario=escenario,
-            seasonal_factors=data['seasonal_factors'],  # ✅ Estacionalidad aplicada
-            ultimo_mes_historico=data['historical'].get('ultimo_mes')  # 🆕 v6.0.6
-        )
+    # 🆕 v6.4.0: Los 3 escenarios en una sola pasada vectorizada
+    # 🆕 v6.4.2: Memoizado (comparte cache con Resumen y Reportes)
+    escenarios = ESCENARIOS
+    proyecciones = obtener_proyecciones(
+        revenue_mensual,
+        data['financial'],
+        meses=meses_proyeccion,
+        escenarios=escenarios,
+        seasonal_factors=data['seasonal_factors'],  # ✅ Estacionalidad aplicada
+        ultimo_mes_historico=data['historical'].get('ultimo_mes')  # 🆕 v6.0.6
+    )
 
     # Tabs para cada escenario
-    tabs = st.tabs(["📊 Comparación", "🔴 Conservador", "🔵 Moderado", "🟢 Optimista"])
+    tabs = st.tabs(["📊 Comparación", "🔴 Conservador", "🔵 Moderado", "🟢 Optimista", "🎲 Monte Carlo",
+                    "📅 Diario / Semanal"])
 
     with tabs[0]:
         st.markdown("### 📊 Comparación de Escenarios")
@@ -5237,6 +5974,12 @@ with tab5:
                 col1, col2, col3 = st.columns([1, 1, 2])
                 with col1:
                     st.metric("📊 Estacionalidad", "Activada ✅")
+                    # 🆕 v7.2.0: Versión de los factores usados en estas proyecciones
+                    version_estacional = data.get('seasonal_version') or {}
+                    if version_estacional.get('version') is not None:
+                        st.caption(f"🗂️ Factores v{version_estacional['version']} · {version_estacional['huella']}")
+                    elif version_estacional:
+                        st.caption(f"🗂️ Factores de referencia (constantes) · {version_estacional['huella']}")
                 with col2:
                     st.metric("⚡ Variación", f"{variacion_pct:.0f}%")
                 with col3:
@@ -5282,7 +6025,7 @@ with tab5:
                     })
                 
                 df_vigencia = pd.DataFrame(vigencia_data)
-                st.dataframe(df_vigencia, use_container_width=True, hide_index=True)
+                mostrar_tabla(df_vigencia, use_container_width=True, hide_index=True)
                 
                 st.caption("💡 Si ves que los contratos desaparecen antes de lo esperado, revisa las fechas de inicio/fin en la sección de Contratos.")
         
@@ -5382,7 +6125,7 @@ with tab5:
                     ))
             except Exception as e:
                 # Silenciar cualquier error en el rendering del gráfico
-                print(f"⚠️ Error al graficar escenario {escenario}: {str(e)}")
+                logger.warning("Error al graficar escenario %s: %s", escenario, e)
                 continue
 
         fig_revenue.update_layout(
@@ -5394,7 +6137,7 @@ with tab5:
             legend=dict(orientation="h", yanchor="bottom", y=1.02)
         )
 
-        st.plotly_chart(fig_revenue, use_container_width=True, key="chart_proyecciones_revenue")
+        mostrar_grafico(fig_revenue, use_container_width=True, key="chart_proyecciones_revenue")
         
         # Agregar nota explicativa sobre estacionalidad
         if data['seasonal_factors']:
@@ -5409,7 +6152,7 @@ with tab5:
                     'Factor': [f"{v:.3f}" for v in data['seasonal_factors'].values()],
                     'Variación': [f"{(v-1)*100:+.1f}%" for v in data['seasonal_factors'].values()]
                 })
-                st.dataframe(factores_df, use_container_width=True, hide_index=True)
+                mostrar_tabla(factores_df, use_container_width=True, hide_index=True)
                 
                 st.markdown("""
                 **✨ Correcciones en esta versión (v6.0.7):**
@@ -5485,7 +6228,7 @@ with tab5:
             legend=dict(orientation="h", yanchor="bottom", y=1.02)
         )
 
-        st.plotly_chart(fig, use_container_width=True, key="chart_proyecciones_flujos_lineal")
+        mostrar_grafico(fig, use_container_width=True, key="chart_proyecciones_flujos_lineal")
         
         st.markdown("---")
         
@@ -5523,7 +6266,7 @@ with tab5:
             df_para_graficos = pd.DataFrame(datos_graficos)
         except Exception as e:
             st.warning("⚠️ Error al preparar datos para gráficos. Carga datos reales primero.")
-            print(f"🐛 Error preparando datos: {e}")
+            logger.exception("Error preparando datos de gráficos: %s", e)
             # Crear DataFrame vacío para evitar errores posteriores
             df_para_graficos = pd.DataFrame(columns=['Periodo', 'Escenario', 'flujo_neto', 'efectivo_acumulado'])
         
@@ -5559,7 +6302,7 @@ with tab5:
                 
                 # Mostrar PRIMERO el flujo mensual (más importante para ver estacionalidad)
                 st.markdown("#### 💵 Flujo de Caja Mensual")
-                st.plotly_chart(fig_flujo_mensual, use_container_width=True, key="chart_flujo_mensual_barras")
+                mostrar_grafico(fig_flujo_mensual, use_container_width=True, key="chart_flujo_mensual_barras")
                 
                 col1, col2 = st.columns([2, 1])
                 with col1:
@@ -5581,7 +6324,7 @@ with tab5:
                 
                 # Mostrar SEGUNDO el acumulado (visión de largo plazo)
                 st.markdown("#### 📈 Proyección de Efectivo Acumulado")
-                st.plotly_chart(fig_efectivo_acum, use_container_width=True, key="chart_efectivo_acumulado_lineas")
+                mostrar_grafico(fig_efectivo_acum, use_container_width=True, key="chart_efectivo_acumulado_lineas")
                 
                 st.markdown("""
                 **¿Qué muestra este gráfico?**
@@ -5594,9 +6337,7 @@ with tab5:
                 st.info("ℹ️ Carga datos reales para ver los gráficos de flujo de caja detallado.")
         except Exception as e:
             st.warning("⚠️ No se pudieron generar los gráficos de flujo de caja. Los demás análisis están disponibles.")
-            print(f"🐛 Error creando gráficos de flujo: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error creando gráficos de flujo: %s", e)
         
         st.markdown("---")
 
@@ -5651,7 +6392,7 @@ with tab5:
             hovermode='x unified'
         )
 
-        st.plotly_chart(fig_comp, use_container_width=True, key="chart_proyecciones_barras_comparativas")
+        mostrar_grafico(fig_comp, use_container_width=True, key="chart_proyecciones_barras_comparativas")
 
         # 🆕 v4.7.1: TABLA COMPARATIVA DE RESUMEN
         st.markdown("### 📋 Tabla Comparativa de Escenarios")
@@ -5671,7 +6412,7 @@ with tab5:
             })
 
         df_comparacion = pd.DataFrame(datos_comparacion)
-        st.dataframe(df_comparacion, use_container_width=True, hide_index=True)
+        mostrar_tabla(df_comparacion, use_container_width=True, hide_index=True)
 
         # 🆕 v4.7.1: BOTÓN DE DESCARGA
         csv = df_comparacion.to_csv(index=False).encode('utf-8')
@@ -5750,7 +6491,7 @@ with tab5:
 
             # Key único y seguro para el gráfico (sin espacios ni caracteres especiales)
             chart_key = f"runway_chart_{idx}_{escenario.lower().replace(' ', '_')}"
-            st.plotly_chart(fig, use_container_width=True, key=chart_key)
+            mostrar_grafico(fig, use_container_width=True, key=chart_key)
 
             st.markdown("#### 📋 Tabla Detallada")
 
@@ -5760,7 +6501,7 @@ with tab5:
             df_display['egresos_totales'] = df_display['egresos_totales'].apply(lambda x: f"${x:,.0f}")
             df_display['flujo_neto'] = df_display['flujo_neto'].apply(lambda x: f"${x:,.0f}")
 
-            st.dataframe(df_display, use_container_width=True, hide_index=True)
+            mostrar_tabla(df_display, use_container_width=True, hide_index=True)
 
             # 🆕 v4.7.1: Botón de descarga para cada escenario
             csv_individual = df_display.to_csv(index=False).encode('utf-8')
@@ -5772,6 +6513,228 @@ with tab5:
                 key=f"download_{escenario}"
             )
 
+    # 🆕 v6.5.0: SIMULACIÓN MONTE CARLO
+    @fragmento('monte_carlo', entradas=('contratos_manuales', 'cotizaciones_manuales', 'version_cartera', 'escenario_proyeccion', 'meses_colchon'))
+    def renderizar_monte_carlo(data, efectivo_actual, revenue_mensual, meses_proyeccion):
+        st.markdown("### 🎲 Simulación Monte Carlo de Flujo de Caja")
+        st.caption(
+            "Trayectorias de revenue remuestreadas de los cambios mes a mes del histórico "
+            "(desestacionalizado) + estacionalidad + cierre aleatorio de cotizaciones según su probabilidad"
+        )
+
+        col_mc1, col_mc2 = st.columns(2)
+        with col_mc1:
+            n_simulaciones = st.select_slider(
+                "Número de simulaciones:",
+                options=SIMULACIONES_MONTE_CARLO,
+                value=SIMULACIONES_MONTE_CARLO[0],
+                format_func=lambda n: f"{n:,}",
+                key="mc_simulaciones"
+            )
+        with col_mc2:
+            escenario_mc = st.selectbox(
+                "Componentes de revenue:",
+                options=ESCENARIOS,
+                index=ESCENARIOS.index(st.session_state.escenario_proyeccion),
+                key="mc_escenario",
+                help="Conservador: solo base | Moderado: + contratos y cotizaciones | Optimista: + equipos disponibles"
+            )
+
+        resultado_mc = simular_monte_carlo(
+            data['historical']['data'],
+            revenue_mensual,
+            data['financial'],
+            meses=meses_proyeccion,
+            efectivo_inicial=efectivo_actual,
+            meses_colchon=st.session_state.meses_colchon,
+            escenario=escenario_mc,
+            seasonal_factors=data['seasonal_factors'],
+            ultimo_mes_historico=data['historical'].get('ultimo_mes'),
+            n_simulaciones=n_simulaciones,
+            indice_cartera=obtener_indice_cartera(),
+            revenue_equipos_50pct=calcular_revenue_equipos_disponibles_50pct()
+        )
+
+        if resultado_mc is None:
+            st.warning("⚠️ Se necesitan al menos 3 meses de histórico con revenue para la simulación")
+        else:
+            bandas = resultado_mc['bandas']
+
+            col1, col2, col3, col4 = st.columns(4)
+            with col1:
+                st.metric(
+                    f"🛡️ Prob. romper colchón ({st.session_state.meses_colchon}m)",
+                    f"{resultado_mc['prob_ruptura_colchon'] * 100:.1f}%",
+                    help="% de trayectorias donde el balance cae por debajo de las necesidades mínimas en algún mes"
+                )
+            with col2:
+                st.metric(
+                    "🔴 Prob. efectivo negativo",
+                    f"{resultado_mc['prob_efectivo_negativo'] * 100:.1f}%"
+                )
+            with col3:
+                st.metric("💰 Balance final P50", f"${bandas['balance_p50'].iloc[-1]:,.0f}")
+            with col4:
+                st.metric("⏱️ Tiempo de simulación", f"{resultado_mc['tiempo_ms']:,.0f} ms")
+
+            fig_mc = go.Figure()
+            fig_mc.add_trace(go.Scatter(
+                x=bandas['nombre_mes'], y=bandas['balance_p95'],
+                name='P95', mode='lines', line=dict(color='#10B981', width=1)
+            ))
+            fig_mc.add_trace(go.Scatter(
+                x=bandas['nombre_mes'], y=bandas['balance_p5'],
+                name='P5', mode='lines', line=dict(color='#EF4444', width=1),
+                fill='tonexty', fillcolor='rgba(37, 99, 235, 0.15)'
+            ))
+            fig_mc.add_trace(go.Scatter(
+                x=bandas['nombre_mes'], y=bandas['balance_p50'],
+                name='P50 (mediana)', mode='lines+markers', line=dict(color='#2563EB', width=3)
+            ))
+            fig_mc.add_trace(go.Scatter(
+                x=bandas['nombre_mes'], y=bandas['necesidades_p50'],
+                name='Necesidades mínimas (P50)', mode='lines', line=dict(color='orange', width=2, dash='dash')
+            ))
+            fig_mc.update_layout(
+                height=450,
+                hovermode='x unified',
+                xaxis_title='Período',
+                yaxis_title='Balance (USD)',
+                yaxis=dict(tickformat='$,.0f')
+            )
+            mostrar_grafico(fig_mc, use_container_width=True, key="monte_carlo_chart")
+
+            df_mc_display = pd.DataFrame({
+                'Mes': bandas['nombre_mes'],
+                'Balance P5': bandas['balance_p5'].apply(lambda x: f"${x:,.0f}"),
+                'Balance P50': bandas['balance_p50'].apply(lambda x: f"${x:,.0f}"),
+                'Balance P95': bandas['balance_p95'].apply(lambda x: f"${x:,.0f}"),
+                'Revenue P50': bandas['revenue_p50'].apply(lambda x: f"${x:,.0f}"),
+                'Prob. Ruptura Colchón': bandas['prob_ruptura_mes'].apply(lambda x: f"{x * 100:.1f}%")
+            })
+            mostrar_tabla(df_mc_display, use_container_width=True, hide_index=True)
+            st.caption(
+                f"{resultado_mc['n_simulaciones']:,} trayectorias · "
+                f"{resultado_mc['n_retornos_historicos']} retornos históricos · semilla fija {SEMILLA_MONTE_CARLO}"
+            )
+
+    with tabs[4]:
+        renderizar_monte_carlo(data, efectivo_actual, revenue_mensual, meses_proyeccion)
+
+    # 🆕 v7.1.0: FLUJO DE CAJA DIARIO / SEMANAL CON REZAGO DE COBRANZA
+    @fragmento('flujo_diario', entradas=('contratos_manuales', 'cotizaciones_manuales', 'version_cartera', 'escenario_proyeccion'))
+    def renderizar_flujo_diario(data, efectivo_actual, revenue_mensual):
+        st.markdown("### 📅 Flujo de Caja Diario / Semanal")
+        st.caption(
+            "Revenue y egresos de cada mes repartidos por día. Lo facturado se cobra N días después "
+            "(pagos a 30 días), por lo que la caja puede bajar aunque el mes sea rentable"
+        )
+
+        col_g1, col_g2, col_g3 = st.columns(3)
+        with col_g1:
+            granularidad = st.radio("Resolución:", ["Semanal", "Diaria"], horizontal=True, key="granularidad_flujo")
+        with col_g2:
+            if granularidad == "Semanal":
+                periodos = st.slider("Semanas a proyectar:", 4, MAX_SEMANAS_PROYECCION, 13, key="semanas_slider")
+            else:
+                periodos = st.slider("Días a proyectar:", 14, MAX_DIAS_PROYECCION, 91, key="dias_slider")
+        with col_g3:
+            dias_cobro = st.number_input(
+                "Días de cobro (rezago):",
+                min_value=0,
+                max_value=120,
+                value=DIAS_COBRO_DEFAULT,
+                step=15,
+                key="dias_cobro_input",
+                help="Días entre la facturación y el cobro. 0 = cobro inmediato"
+            )
+
+        flujo_detallado = generar_proyecciones_diarias(
+            revenue_mensual,
+            data['financial'],
+            periodos,
+            frecuencia='W' if granularidad == "Semanal" else 'D',
+            seasonal_factors=data['seasonal_factors'],
+            ultimo_mes_historico=data['historical'].get('ultimo_mes'),
+            indice_cartera=obtener_indice_cartera(),
+            revenue_equipos_50pct=calcular_revenue_equipos_disponibles_50pct(),
+            ano_base=datetime.now().year,
+            efectivo_inicial=efectivo_actual,
+            dias_cobro=int(dias_cobro)
+        )
+
+        colores_flujo = {'Conservador': '#EF4444', 'Moderado': '#2563EB', 'Optimista': '#10B981'}
+        fechas_flujo = pd.to_datetime(flujo_detallado['fechas'])
+
+        # Métricas: punto de menor caja por escenario
+        cols_min = st.columns(len(flujo_detallado['escenarios']))
+        for fila, escenario in enumerate(flujo_detallado['escenarios']):
+            balance_escenario = flujo_detallado['balance'][fila]
+            posicion_min = int(np.argmin(balance_escenario))
+            with cols_min[fila]:
+                st.metric(
+                    f"📉 Caja mínima - {escenario}",
+                    f"${balance_escenario[posicion_min]:,.0f}",
+                    delta=fechas_flujo[posicion_min].strftime('%d %b %Y'),
+                    delta_color="off"
+                )
+
+        # Gráfico con submuestreo min-max (miles de puntos diarios → ≤ MAX_PUNTOS_GRAFICO por traza)
+        fig_flujo = go.Figure()
+        submuestreado = False
+        for fila, escenario in enumerate(flujo_detallado['escenarios']):
+            x_graf, y_graf = submuestrear_min_max(fechas_flujo, flujo_detallado['balance'][fila])
+            submuestreado = submuestreado or len(x_graf) < len(fechas_flujo)
+            fig_flujo.add_trace(go.Scatter(
+                x=x_graf, y=y_graf,
+                name=escenario, mode='lines',
+                line=dict(color=colores_flujo.get(escenario, '#6B7280'), width=2)
+            ))
+        fig_flujo.add_hline(y=0, line_dash="dot", line_color="red", annotation_text="Caja en cero")
+        fig_flujo.update_layout(
+            height=450,
+            hovermode='x unified',
+            xaxis_title='Fecha',
+            yaxis_title='Efectivo al cierre del período (USD)',
+            yaxis=dict(tickformat='$,.0f')
+        )
+        mostrar_grafico(fig_flujo, use_container_width=True, key="flujo_detallado_chart")
+        if submuestreado:
+            st.caption(
+                f"📉 Gráfico reducido a ≤{MAX_PUNTOS_GRAFICO} puntos por escenario (conserva mínimos y máximos). "
+                "La tabla muestra todos los períodos."
+            )
+
+        escenario_tabla = st.session_state.escenario_proyeccion
+        df_flujo = proyeccion_diaria_a_dataframe(flujo_detallado, escenario_tabla)
+        st.markdown(f"#### 📋 Detalle - Escenario {escenario_tabla}")
+        mostrar_tabla(
+            pd.DataFrame({
+                'Fecha': df_flujo['fecha'].dt.strftime('%Y-%m-%d'),
+                'Revenue Devengado': df_flujo['revenue'].apply(lambda x: f"${x:,.0f}"),
+                'Cobros': df_flujo['cobros'].apply(lambda x: f"${x:,.0f}"),
+                'Egresos': df_flujo['egresos_totales'].apply(lambda x: f"${x:,.0f}"),
+                'Flujo Neto': df_flujo['flujo_neto'].apply(lambda x: f"${x:,.0f}"),
+                'Balance': df_flujo['balance'].apply(lambda x: f"${x:,.0f}")
+            }),
+            use_container_width=True,
+            hide_index=True,
+            height=400
+        )
+        st.download_button(
+            label="📥 Descargar CSV",
+            data=df_flujo.to_csv(index=False),
+            file_name=f"flujo_{granularidad.lower()}_{escenario_tabla.lower()}_{periodos}.csv",
+            mime="text/csv",
+            key="download_flujo_detallado"
+        )
+
+    with tabs[5]:
+        renderizar_flujo_diario(data, efectivo_actual, revenue_mensual)
+
+with tab5:
+    renderizar_proyecciones(data, efectivo_actual)
+
     # =============================================================================
     # PÁGINA: REPORTES DETALLADOS
     # =============================================================================
@@ -5787,7 +6750,8 @@ with tab6:
 
     tabs = st.tabs(["📈 Estacionalidad", "🔥 Burn Rate", "💰 Balance Proyectado"])
 
-    with tabs[0]:
+    @fragmento('reportes_estacionalidad', entradas=('datos_procesados',))
+    def renderizar_reportes_estacionalidad(data, efectivo_actual):
         st.markdown("### 📅 Análisis de Estacionalidad")
         st.caption("✨ Interactivo: Compara años vs promedio - ✅ DATOS REALES del backend")
 
@@ -5883,7 +6847,7 @@ with tab6:
             legend=dict(orientation="h", yanchor="bottom", y=-0.15)
         )
 
-        st.plotly_chart(fig, use_container_width=True, key="chart_analisis_radar_principal")
+        mostrar_grafico(fig, use_container_width=True, key="chart_analisis_radar_principal")
 
         st.info("""
         ℹ️ **Nota sobre Año 2025:**  
@@ -5900,7 +6864,7 @@ with tab6:
         df_seasonal['% vs Promedio'] = df_seasonal['Factor'].apply(
             lambda x: f"{(x-1)*100:+.1f}%"
         )
-        st.dataframe(df_seasonal, use_container_width=True, hide_index=True)
+        mostrar_tabla(df_seasonal, use_container_width=True, hide_index=True)
 
         st.success("""
         ✅ **Datos Reales Integrados:**  
@@ -5908,7 +6872,11 @@ with tab6:
         (Ene 2023 - Sep 2025), eliminando completamente los valores hardcodeados anteriores.
         """)
 
-    with tabs[1]:
+    with tabs[0]:
+        renderizar_reportes_estacionalidad(data, efectivo_actual)
+
+    @fragmento('reportes_burn_rate', entradas=('datos_procesados', 'meses_colchon'))
+    def renderizar_reportes_burn_rate(data, efectivo_actual):
         st.markdown("### 🔥 Análisis de Burn Rate")
 
         st.success(f"""
@@ -5960,7 +6928,7 @@ with tab6:
                      title='Distribución del Burn Rate',
                      color_discrete_sequence=px.colors.sequential.Blues_r)
         fig.update_traces(textposition='inside', textinfo='percent+label')
-        st.plotly_chart(fig, use_container_width=True, key="chart_reportes_clientes")
+        mostrar_grafico(fig, use_container_width=True, key="chart_reportes_clientes")
 
         revenue_prom = data['historical']['revenue_promedio']
         burn_rate_calc = data['financial']['burn_rate']
@@ -5982,7 +6950,11 @@ with tab6:
         • Mantener margen de protección adecuado configurado en {st.session_state.meses_colchon} meses
         """)
 
-    with tabs[2]:
+    with tabs[1]:
+        renderizar_reportes_burn_rate(data, efectivo_actual)
+
+    @fragmento('reportes_balance', entradas=('datos_procesados', 'contratos_manuales', 'cotizaciones_manuales', 'version_cartera', 'meses_colchon'))
+    def renderizar_reportes_balance(data, efectivo_actual):
         st.markdown("### 💰 Balance Proyectado Multi-Escenario")
         st.caption("✅ Balance acumulado correctamente con burn rate REAL")
         
@@ -6005,57 +6977,45 @@ with tab6:
             st.write("**Último mes histórico:**")
             st.write(data['historical'].get('ultimo_mes', 'No definido'))
 
-        meses_balance = st.slider("Meses de proyección:", 1, 12, 6, key="balance_slider")
+        meses_balance = st.slider("Meses de proyección:", 1, MAX_MESES_PROYECCION, 6, key="balance_slider")
 
         # 🆕 v6.0.3: CORRECCIÓN CRÍTICA - Usar generar_proyecciones_por_escenario
         # Esto asegura que la estacionalidad se aplique correctamente en el balance
         # 🆕 v6.0.6: Pasar último mes histórico para proyecciones correctas
-        revenue_mensual = data['historical']['revenue_promedio']
-        
-        proyecciones_bal = {}
-        escenarios = ['Conservador', 'Moderado', 'Optimista']
-        
-        for escenario in escenarios:
-            proyecciones_bal[escenario] = generar_proyecciones_por_escenario(
-                revenue_mensual,
-                data['financial'],
-                meses=meses_balance,
-                escenario=escenario,
-                seasonal_factors=data['seasonal_factors'],  # ✅ Estacionalidad aplicada
-                ultimo_mes_historico=data['historical'].get('ultimo_mes')  # 🆕 v6.0.6
-            )
-            
-            # 🔍 v6.2.3: DEBUG en CONSOLA
-            print(f"\n{'='*60}")
-            print(f"DEBUG Balance Proyectado - Escenario: {escenario}")
-            print(f"{'='*60}")
-            print(f"Seasonal factors presentes: {data['seasonal_factors'] is not None}")
-            if data['seasonal_factors']:
-                print(f"Primer factor: {list(data['seasonal_factors'].items())[0]}")
-            print(f"Último mes histórico: {data['historical'].get('ultimo_mes')}")
-            print(f"Meses balance: {meses_balance}")
-            
-            # ✅ v6.2.4 FIX: Protección contra KeyError en debug
-            try:
-                df_debug = proyecciones_bal[escenario].head(3)
-                print(f"\nPrimeros 3 meses de {escenario}:")
-                
-                # Verificar qué columnas existen
-                columnas_disponibles = ['mes', 'nombre_mes', 'revenue', 'egresos_totales', 'flujo_neto']
-                columnas_existentes = [col for col in columnas_disponibles if col in df_debug.columns]
-                
-                if columnas_existentes:
-                    print(df_debug[columnas_existentes].to_string())
-                    if 'revenue' in df_debug.columns:
-                        print(f"Revenue promedio (3m): ${df_debug['revenue'].mean():,.0f}")
-                else:
-                    print(f"Columnas disponibles: {list(df_debug.columns)}")
-            except Exception as e:
-                print(f"⚠️ Error en debug: {e}")
-            
-            print(f"{'='*60}\n")
+        # 🆕 v6.4.0: Los 3 escenarios en una sola pasada vectorizada
+        # 🆕 v6.4.2: Memoizado (comparte cache con Resumen y Proyecciones)
+        # 🆕 v7.4.1: Grafo incremental (cambiar el efectivo solo recalcula el balance)
+        escenarios = ESCENARIOS
+        grafo_balance = obtener_grafo_flujo_caja('balance', data, meses_balance, escenarios, efectivo_actual)
+        proyecciones_bal = evaluar(grafo_balance, 'proyecciones')
+        
+        # 🔍 v6.2.3: DEBUG en CONSOLA
+        # 🆕 v7.5.1: Solo con SPT_LOG_LEVEL=DEBUG (el to_string() no se arma en producción)
+        if logger.isEnabledFor(logging.DEBUG):
+            factores = data['seasonal_factors']
+            columnas_disponibles = ['mes', 'nombre_mes', 'revenue', 'egresos_totales', 'flujo_neto']
+            for escenario in escenarios:
+                # ✅ v6.2.4 FIX: Protección contra KeyError en debug
+                try:
+                    df_debug = proyecciones_bal[escenario].head(3)
+                    columnas_existentes = [col for col in columnas_disponibles if col in df_debug.columns]
+                    logger.debug(
+                        "Balance proyectado - primeros 3 meses de %s:\n%s", escenario,
+                        df_debug[columnas_existentes].to_string() if columnas_existentes else list(df_debug.columns),
+                        extra=con_campos(
+                            escenario=escenario,
+                            factores_estacionales=factores is not None,
+                            primer_factor=next(iter(factores.items()), None) if factores else None,
+                            ultimo_mes=data['historical'].get('ultimo_mes'),
+                            meses_balance=meses_balance,
+                            revenue_promedio_3m=(float(df_debug['revenue'].mean())
+                                                 if 'revenue' in df_debug.columns else None)
+                        )
+                    )
+                except Exception as e:
+                    logger.debug("Error en debug del balance (%s): %s", escenario, e)
 
-        balances = generar_balance_multi_escenario(meses_balance, efectivo_actual, proyecciones_bal)
+        balances = evaluar(grafo_balance, 'balances')
         
         # 🔍 v6.2.3: DEBUG - Mostrar primeros 3 meses de proyecciones por escenario
         with st.expander("🔍 DEBUG: Proyecciones por Escenario (primeros 3 meses)", expanded=False):
@@ -6070,18 +7030,33 @@ with tab6:
                         columnas_existentes = [col for col in columnas_deseadas if col in df.columns]
                         
                         if columnas_existentes:
-                            st.dataframe(df[columnas_existentes])
+                            mostrar_tabla(df[columnas_existentes])
                             if 'revenue' in df.columns:
                                 st.write(f"Revenue promedio (3m): ${df['revenue'].mean():,.0f}")
                             if 'flujo_neto' in df.columns:
                                 st.write(f"Flujo neto promedio (3m): ${df['flujo_neto'].mean():,.0f}")
                         else:
                             st.write(f"Columnas disponibles: {list(df.columns)}")
-                            st.dataframe(df)
+                            mostrar_tabla(df)
                         
                         st.write("---")
                     except Exception as e:
                         st.warning(f"⚠️ Error mostrando debug de {escenario}: {str(e)}")
+            
+            # 🆕 v6.4.2: Estado del cache de proyecciones
+            stats_cache = obtener_estadisticas_cache_proyecciones()
+            total_consultas = stats_cache['hits'] + stats_cache['misses']
+            tasa_aciertos = stats_cache['hits'] / total_consultas * 100 if total_consultas > 0 else 0
+            st.write("**⚡ Cache de Proyecciones:**")
+            col_c1, col_c2, col_c3, col_c4 = st.columns(4)
+            with col_c1:
+                st.metric("Hits", stats_cache['hits'])
+            with col_c2:
+                st.metric("Misses", stats_cache['misses'])
+            with col_c3:
+                st.metric("Tasa de aciertos", f"{tasa_aciertos:.0f}%")
+            with col_c4:
+                st.metric("Entradas", f"{stats_cache['entradas']}/{MAX_ENTRADAS_CACHE_PROYECCIONES}")
 
 
         fig = go.Figure()
@@ -6112,7 +7087,7 @@ with tab6:
                     marker=dict(size=10)
                 ))
             except Exception as e:
-                print(f"⚠️ Error graficando {escenario}: {e}")
+                logger.warning("Error graficando %s: %s", escenario, e)
                 continue
 
         fig.add_hline(y=0, line_dash="dash", line_color="red", line_width=2,
@@ -6132,7 +7107,7 @@ with tab6:
             title='Evolución del Efectivo Acumulado por Escenario (con Burn Rate REAL + Estacionalidad)'  # ✅ v6.2.4: Incluir "Acumulado"
         )
 
-        st.plotly_chart(fig, use_container_width=True, key="chart_reportes_balance_12m")
+        mostrar_grafico(fig, use_container_width=True, key="chart_reportes_balance_12m")
 
         st.markdown("### ⏱️ Análisis de Runway por Escenario")
 
@@ -6181,6 +7156,9 @@ with tab6:
         con burn rate ajustándose proporcionalmente en cada caso.
         """)
 
+    with tabs[2]:
+        renderizar_reportes_balance(data, efectivo_actual)
+
     # =============================================================================
     # PÁGINA: INGRESO MANUAL
     # =============================================================================
@@ -6199,3 +7177,6 @@ with tab6:
     <p>© 2025 AI-MindNovation. Todos los derechos reservados.</p>
     </div>
     """, unsafe_allow_html=True)
+
+# 🆕 v7.5.0: Cierre del perfil del rerun completo
+cerrar_perfil_rerun()
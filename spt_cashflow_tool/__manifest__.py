@@ -1,6 +1,6 @@
 {
     'name': 'SPT Cash Flow Tool',
-    'version': '18.0.1.0.0',
+    'version': '18.0.1.4.2',
     'category': 'Accounting/Finance',
     'author': 'AI-MindNovation',
     'website': 'https://www.ai-mindnovation.com',
@@ -41,6 +41,8 @@
         - Resumen Ejecutivo con KPIs principales
         - Análisis Histórico de ingresos y clientes
         - Proyecciones de flujo de efectivo
+        - Proyecciones multi-escenario (Conservador/Moderado/Optimista) con el
+          motor spt_forecast del dashboard (opcional, requiere numpy/pandas)
         - Reportes detallados en PDF
     """,
 }
@@ -0,0 +1,20 @@
+"""
+Marca como importados los análisis que ya creó import_historical_data
+(llevan marca de agua de facturas y no tienen cliente), uno por período
+"""
+
+
+def migrate(cr, version):
+    if not version:
+        return
+    cr.execute("""
+        UPDATE cashflow_analysis
+           SET imported = TRUE
+         WHERE id IN (
+                SELECT MAX(id)
+                  FROM cashflow_analysis
+                 WHERE client_id IS NULL
+                   AND (source_write_date IS NOT NULL OR source_move_count > 0)
+              GROUP BY company_id, period, date_from
+         )
+    """)
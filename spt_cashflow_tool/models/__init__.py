@@ -3,4 +3,5 @@ Models initialization
 """
 from . import financial_kpi
 from . import cashflow_analysis
+from . import cashflow_summary
 from . import revenue_projection
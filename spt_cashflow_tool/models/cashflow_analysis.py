@@ -2,9 +2,15 @@
 Cashflow Analysis Model
 Almacena datos históricos de ingresos y gastos por periodo
 """
+import logging
+from bisect import bisect_right
+
 from odoo import models, fields, api
+from odoo.exceptions import UserError
 from datetime import datetime
 
+_logger = logging.getLogger(__name__)
+
 
 class CashflowAnalysis(models.Model):
     _name = 'cashflow.analysis'
@@ -33,6 +39,13 @@ class CashflowAnalysis(models.Model):
     notes = fields.Text('Notas')
     active = fields.Boolean('Activo', default=True)
 
+    # Marca de agua de la importación (facturas de origen del período)
+    source_write_date = fields.Datetime('Última Modificación de Facturas', readonly=True)
+    source_move_count = fields.Integer('Facturas del Período', readonly=True)
+    # Solo los análisis creados por import_historical_data se actualizan o
+    # eliminan al reimportar; los ingresados a mano (por cliente, anuales...) no
+    imported = fields.Boolean('Importado desde Facturas', default=False, readonly=True, copy=False, index=True)
+
     @api.depends('date_from', 'date_to', 'period')
     def _compute_name(self):
         """Genera nombre descriptivo del periodo"""
@@ -49,25 +62,52 @@ class CashflowAnalysis(models.Model):
         for record in self:
             record.net_cashflow = record.revenue - record.expenses
 
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super().create(vals_list)
+        records._refresh_summary()
+        return records
+
+    def write(self, vals):
+        result = super().write(vals)
+        self._refresh_summary()
+        return result
+
+    def unlink(self):
+        result = super().unlink()
+        self._refresh_summary()
+        return result
+
+    def _refresh_summary(self):
+        """
+        Programa la actualización de cashflow.summary (una vez por transacción,
+        después del commit) salvo durante operaciones masivas (programan al final)
+        """
+        if not self.env.context.get('skip_cashflow_summary_refresh'):
+            self.env['cashflow.summary'].schedule_refresh()
+
     @api.model
     def get_revenue_trend(self, months=12):
         """
         Obtiene datos de tendencia de revenue de los últimos N meses
+        Lee el resumen mensual pre-agregado (cashflow.summary), solo análisis
+        mensuales (un trimestre no se suma al punto de su primer mes)
         Retorna: lista de dicts con mes y revenue
         """
-        analyses = self.search(
-            [('company_id', '=', self.env.company.id)],
+        monthly = self.env['cashflow.summary']._read_group(
+            [('company_id', '=', self.env.company.id), ('period', '=', 'monthly')],
+            groupby=['month:month'],
+            aggregates=['revenue:sum'],
+            order='month:month desc',
             limit=months,
-            order='date_from desc'
         )
-        analyses = analyses.sorted(key=lambda x: x.date_from)  # Orden ascendente
-        
+
         trend_data = []
-        for analysis in analyses:
+        for month, revenue in reversed(monthly):  # Orden ascendente
             trend_data.append({
-                'date': analysis.date_from.strftime('%b %Y'),
-                'revenue': analysis.revenue,
-                'month_key': analysis.date_from.strftime('%Y-%m'),
+                'date': month.strftime('%b %Y'),
+                'revenue': revenue,
+                'month_key': month.strftime('%Y-%m'),
             })
         return trend_data
 
@@ -75,130 +115,246 @@ class CashflowAnalysis(models.Model):
     def get_top_clients(self, limit=5):
         """
         Obtiene los top N clientes por total de ingresos
+        Agrupa y ordena en SQL sobre cashflow.summary
         Retorna: lista de dicts con cliente y revenue total
         """
-        from odoo.tools import groupby
-        
-        analyses = self.search([('company_id', '=', self.env.company.id)])
-        
-        # Agrupar por cliente y sumar revenue
-        client_revenues = {}
-        for analysis in analyses:
-            client_name = analysis.client_id.name if analysis.client_id else 'Sin Cliente'
-            if client_name not in client_revenues:
-                client_revenues[client_name] = 0
-            client_revenues[client_name] += analysis.revenue
-        
-        # Ordenar y limitar
-        sorted_clients = sorted(
-            client_revenues.items(),
-            key=lambda x: x[1],
-            reverse=True
-        )[:limit]
-        
-        top_data = [{'client': name, 'revenue': amount} for name, amount in sorted_clients]
+        client_revenues = self.env['cashflow.summary']._read_group(
+            [('company_id', '=', self.env.company.id)],
+            groupby=['client_id'],
+            aggregates=['revenue:sum'],
+            order='revenue:sum desc',
+            limit=limit,
+        )
+
+        top_data = [
+            {'client': client.name if client else 'Sin Cliente', 'revenue': amount}
+            for client, amount in client_revenues
+        ]
         return top_data
 
     @api.model
     def get_revenue_statistics(self):
         """
         Calcula estadísticas de revenue: promedio, mínimo, máximo
+        Una sola agregación sobre cashflow.summary; mínimo y máximo son por
+        análisis individual (columnas min/max_revenue de cada fila del resumen)
         Retorna: dict con estadísticas
         """
-        analyses = self.search([('company_id', '=', self.env.company.id)])
-        
-        if not analyses:
+        [(total_revenue, min_revenue, max_revenue, total_periods)] = self.env['cashflow.summary']._read_group(
+            [('company_id', '=', self.env.company.id)],
+            aggregates=['revenue:sum', 'min_revenue:min', 'max_revenue:max', 'analysis_count:sum'],
+        )
+
+        if not total_periods:
             return {
                 'average_revenue': 0,
                 'min_revenue': 0,
                 'max_revenue': 0,
                 'total_periods': 0,
             }
-        
-        revenues = [a.revenue for a in analyses]
-        
+
         return {
-            'average_revenue': sum(revenues) / len(revenues) if revenues else 0,
-            'min_revenue': min(revenues) if revenues else 0,
-            'max_revenue': max(revenues) if revenues else 0,
-            'total_periods': len(revenues),
+            'average_revenue': total_revenue / total_periods,
+            'min_revenue': min_revenue,
+            'max_revenue': max_revenue,
+            'total_periods': total_periods,
         }
 
     @api.model
-    def import_historical_data(self, date_from, date_to, period_type='monthly', company_id=None):
+    def import_historical_data(self, date_from, date_to, period_type='monthly', company_id=None, incremental=False):
         """
         Importa datos históricos de análisis basados en facturas
-        
+
+        Los períodos se actualizan en sitio (upsert): se escribe el análisis
+        importado del mismo tipo de período y fecha de inicio, o se crea uno
+        nuevo. Solo se eliminan los análisis importados del rango que no
+        corresponden a ningún período generado; los ingresados a mano (otro
+        período, por cliente) nunca se tocan.
+
         Args:
             date_from: Fecha inicio
             date_to: Fecha fin
             period_type: 'monthly' o 'quarterly'
             company_id: Empresa (usa self.env.company si no se especifica)
+            incremental: Si True, solo recalcula los períodos con facturas
+                         nuevas o modificadas desde la última importación
+                         (marca de agua de write_date y conteo de facturas)
+
+        Returns:
+            int: número de períodos recalculados
         """
-        from dateutil.relativedelta import relativedelta
-        
         if not company_id:
             company_id = self.env.company
-        
-        # Limpiar análisis existentes en el rango
-        existing = self.search([
-            ('company_id', '=', company_id.id),
-            ('date_from', '>=', date_from),
-            ('date_to', '<=', date_to),
-        ])
-        existing.unlink()
-        
+        self = self.with_context(skip_cashflow_summary_refresh=True)
+
         # Generar períodos según tipo
         if period_type == 'monthly':
             periods = self._generate_monthly_periods(date_from, date_to)
         else:  # quarterly
             periods = self._generate_quarterly_periods(date_from, date_to)
-        
-        # Para cada período, calcular revenue y gastos
-        for period in periods:
-            period_date_from = period['date_from']
-            period_date_to = period['date_to']
-            period_name = period['name']
-            
-            # REVENUE: Facturas de clientes
-            sale_invoices = self.env['account.move'].search([
-                ('company_id', '=', company_id.id),
-                ('move_type', '=', 'out_invoice'),
-                ('state', '=', 'posted'),
-                ('invoice_date', '>=', period_date_from),
-                ('invoice_date', '<=', period_date_to),
-            ])
-            revenue = sum(sale_invoices.mapped('amount_total'))
-            
-            # EXPENSES: Facturas de proveedores + gastos
-            purchase_invoices = self.env['account.move'].search([
-                ('company_id', '=', company_id.id),
-                ('move_type', '=', 'in_invoice'),
-                ('state', '=', 'posted'),
-                ('invoice_date', '>=', period_date_from),
-                ('invoice_date', '<=', period_date_to),
-            ])
-            expenses = sum(purchase_invoices.mapped('amount_total'))
-            
-            expense_invoices = self.env['account.move'].search([
-                ('company_id', '=', company_id.id),
-                ('move_type', '=', 'in_expense'),
-                ('state', '=', 'posted'),
-                ('invoice_date', '>=', period_date_from),
-                ('invoice_date', '<=', period_date_to),
-            ])
-            expenses += sum(expense_invoices.mapped('amount_total'))
-            
-            # Crear registro de análisis
-            self.create({
-                'name': period_name,
+        period_starts = [period['date_from'] for period in periods]
+
+        # Análisis importados del mismo tipo de período en el rango, indexados
+        # por fecha de inicio (la fecha de fin del mes en curso cambia cada día)
+        existing = self.with_context(active_test=False).search([
+            ('company_id', '=', company_id.id),
+            ('imported', '=', True),
+            ('period', '=', period_type),
+            ('client_id', '=', False),
+            ('date_from', '>=', date_from),
+            ('date_from', '<=', date_to),
+        ])
+        existing_by_period = {}
+        for analysis in existing:
+            if analysis.date_from in existing_by_period:
+                raise UserError(
+                    f'Hay más de un análisis importado ({period_type}) que inicia el '
+                    f'{analysis.date_from}: elimine los duplicados antes de reimportar'
+                )
+            existing_by_period[analysis.date_from] = analysis
+        generated_starts = set(period_starts)
+        stale = existing.filtered(lambda analysis: analysis.date_from not in generated_starts)
+        stale.unlink()
+
+        # Marca de agua por período: última modificación y cantidad de facturas
+        # (cualquier estado, para detectar facturas anuladas o cambiadas de fecha)
+        watermarks = self._get_period_watermarks(company_id, periods, period_starts)
+
+        dirty_indexes = [
+            index for index, period in enumerate(periods)
+            if not incremental or self._is_period_outdated(
+                existing_by_period.get(period['date_from']), period, watermarks[index]
+            )
+        ]
+        if not dirty_indexes:
+            if stale:
+                self.env['cashflow.summary'].schedule_refresh()
+            return 0
+
+        # Totales diarios por tipo de factura en una sola consulta agregada
+        # (en vez de 3 búsquedas por período cargando todas las facturas),
+        # limitada al tramo que contiene los períodos a recalcular
+        daily_totals = self.env['account.move']._read_group(
+            self._get_invoice_domain(
+                company_id,
+                periods[dirty_indexes[0]]['date_from'],
+                periods[dirty_indexes[-1]]['date_to'],
+            ) + [('state', '=', 'posted')],
+            groupby=['invoice_date:day', 'move_type'],
+            aggregates=['amount_total:sum'],
+        )
+
+        # Asignar cada día a su período (períodos contiguos y ordenados)
+        totals = [{'revenue': 0.0, 'expenses': 0.0} for _ in periods]
+        for invoice_date, move_type, amount_total in daily_totals:
+            index = bisect_right(period_starts, invoice_date) - 1
+            if index < 0:
+                continue
+            key = 'revenue' if move_type == 'out_invoice' else 'expenses'
+            totals[index][key] += amount_total
+
+        # Upsert: escribir los períodos existentes y crear los nuevos en un solo create
+        vals_to_create = []
+        for index in dirty_indexes:
+            period = periods[index]
+            last_write_date, move_count = watermarks[index]
+            vals = {
+                'name': period['name'],
                 'period': period_type,
-                'date_from': period_date_from,
-                'date_to': period_date_to,
-                'revenue': revenue,
-                'expenses': expenses,
+                'date_from': period['date_from'],
+                'date_to': period['date_to'],
+                'revenue': totals[index]['revenue'],
+                'expenses': totals[index]['expenses'],
                 'company_id': company_id.id,
-            })
+                'source_write_date': last_write_date,
+                'source_move_count': move_count,
+                'imported': True,
+            }
+            analysis = existing_by_period.get(period['date_from'])
+            if analysis:
+                analysis.write(vals)
+            else:
+                vals_to_create.append(vals)
+        if vals_to_create:
+            self.create(vals_to_create)
+        self.env['cashflow.summary'].schedule_refresh()
+
+        return len(dirty_indexes)
+
+    @api.model
+    def _get_invoice_domain(self, company_id, date_from, date_to):
+        """Dominio de facturas de clientes, proveedores y gastos de un rango de fechas"""
+        return [
+            ('company_id', '=', company_id.id),
+            ('move_type', 'in', ('out_invoice', 'in_invoice', 'in_expense')),
+            ('invoice_date', '>=', date_from),
+            ('invoice_date', '<=', date_to),
+        ]
+
+    @api.model
+    def _get_period_watermarks(self, company_id, periods, period_starts):
+        """
+        Última write_date y cantidad de facturas de cada período, en una sola consulta
+
+        Returns:
+            list de tuplas (write_date máxima o False, conteo) alineada con periods
+        """
+        watermarks = [(False, 0) for _ in periods]
+        if not periods:
+            return watermarks
+
+        daily_watermarks = self.env['account.move']._read_group(
+            self._get_invoice_domain(company_id, periods[0]['date_from'], periods[-1]['date_to']),
+            groupby=['invoice_date:day'],
+            aggregates=['write_date:max', '__count'],
+        )
+        for invoice_date, write_date, count in daily_watermarks:
+            index = bisect_right(period_starts, invoice_date) - 1
+            if index < 0:
+                continue
+            last_write_date, move_count = watermarks[index]
+            if write_date and (not last_write_date or write_date > last_write_date):
+                last_write_date = write_date
+            watermarks[index] = (last_write_date, move_count + count)
+        return watermarks
+
+    @staticmethod
+    def _is_period_outdated(analysis, period, watermark):
+        """
+        True si el período no tiene análisis, cambió su fecha de fin o sus
+        facturas cambiaron desde la importación
+        """
+        if not analysis:
+            return True
+        last_write_date, move_count = watermark
+        return (
+            analysis.date_to != period['date_to']
+            or analysis.source_move_count != move_count
+            or (last_write_date or False) != (analysis.source_write_date or False)
+        )
+
+    @api.model
+    def cron_import_historical_incremental(self, months=24):
+        """
+        Cron nocturno: importación incremental mensual de los últimos N meses
+        para cada empresa. Solo se recalculan los meses con facturas nuevas o
+        modificadas. El mes en curso se importa completo (hasta fin de mes)
+        para que su período no cambie de una noche a otra.
+        """
+        from dateutil.relativedelta import relativedelta
+
+        month_start = fields.Date.today().replace(day=1)
+        date_from = month_start - relativedelta(months=months - 1)
+        date_to = month_start + relativedelta(months=1, days=-1)
+        for company in self.env['res.company'].search([]):
+            updated = self.with_company(company).import_historical_data(
+                date_from=date_from,
+                date_to=date_to,
+                period_type='monthly',
+                company_id=company,
+                incremental=True,
+            )
+            _logger.info('Importación incremental %s: %s períodos recalculados', company.name, updated)
 
     @staticmethod
     def _generate_monthly_periods(date_from, date_to):
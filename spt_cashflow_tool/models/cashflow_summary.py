@@ -0,0 +1,111 @@
+"""
+Cashflow Summary Model
+Resumen mensual pre-agregado (vista materializada) de cashflow.analysis
+por empresa, tipo de período, mes y cliente
+
+Las escrituras en cashflow.analysis programan un solo refresco por
+transacción, que se ejecuta después del commit en su propio cursor: el
+bloqueo del REFRESH no se mantiene durante la transacción del usuario.
+"""
+import logging
+
+from odoo import models, fields, api, SUPERUSER_ID
+
+_logger = logging.getLogger(__name__)
+
+
+class CashflowSummary(models.Model):
+    _name = 'cashflow.summary'
+    _description = 'Cashflow Monthly Summary'
+    _auto = False
+    _order = 'month desc'
+
+    company_id = fields.Many2one('res.company', 'Empresa', readonly=True)
+    period = fields.Selection(
+        [('monthly', 'Mensual'), ('quarterly', 'Trimestral'), ('annual', 'Anual')],
+        'Periodo', readonly=True
+    )
+    month = fields.Date('Mes', readonly=True)
+    client_id = fields.Many2one('res.partner', 'Cliente', readonly=True)
+    revenue = fields.Float('Ingresos ($)', digits=(16, 2), readonly=True)
+    min_revenue = fields.Float('Ingreso Mínimo por Análisis ($)', digits=(16, 2), readonly=True)
+    max_revenue = fields.Float('Ingreso Máximo por Análisis ($)', digits=(16, 2), readonly=True)
+    expenses = fields.Float('Gastos ($)', digits=(16, 2), readonly=True)
+    net_cashflow = fields.Float('Flujo Neto ($)', digits=(16, 2), readonly=True)
+    analysis_count = fields.Integer('Análisis', readonly=True)
+
+    def init(self):
+        """
+        Crea la vista materializada y sus índices
+
+        El índice único sobre (company_id, period, month, client_key) permite
+        REFRESH MATERIALIZED VIEW CONCURRENTLY (sin bloquear lecturas).
+        """
+        self.env.cr.execute(f'DROP MATERIALIZED VIEW IF EXISTS {self._table} CASCADE')
+        self.env.cr.execute(f"""
+            CREATE MATERIALIZED VIEW {self._table} AS (
+                SELECT
+                    row_number() OVER (ORDER BY company_id, period, month, client_key) AS id,
+                    company_id,
+                    period,
+                    month,
+                    client_key,
+                    NULLIF(client_key, 0) AS client_id,
+                    revenue,
+                    min_revenue,
+                    max_revenue,
+                    expenses,
+                    net_cashflow,
+                    analysis_count
+                FROM (
+                    SELECT
+                        company_id,
+                        period,
+                        date_trunc('month', date_from)::date AS month,
+                        COALESCE(client_id, 0) AS client_key,
+                        SUM(revenue) AS revenue,
+                        MIN(revenue) AS min_revenue,
+                        MAX(revenue) AS max_revenue,
+                        SUM(expenses) AS expenses,
+                        SUM(net_cashflow) AS net_cashflow,
+                        COUNT(*) AS analysis_count
+                    FROM cashflow_analysis
+                    WHERE active
+                    GROUP BY company_id, period, date_trunc('month', date_from)::date, COALESCE(client_id, 0)
+                ) AS rollup
+            )
+        """)
+        self.env.cr.execute(f"""
+            CREATE UNIQUE INDEX {self._table}_key_uniq
+                ON {self._table} (company_id, period, month, client_key)
+        """)
+        self.env.cr.execute(f'CREATE INDEX {self._table}_company_month_idx ON {self._table} (company_id, month)')
+        self.env.cr.execute(f'CREATE INDEX {self._table}_company_client_idx ON {self._table} (company_id, client_id)')
+
+    @api.model
+    def refresh_summary(self):
+        """Recalcula la vista materializada con los análisis actuales (en la transacción actual)"""
+        self.env['cashflow.analysis'].flush_model()
+        self.env.cr.execute(f'REFRESH MATERIALIZED VIEW CONCURRENTLY {self._table}')
+        self.invalidate_model()
+
+    @api.model
+    def schedule_refresh(self):
+        """
+        Programa un refresco después del commit de la transacción actual
+
+        Varias llamadas en la misma transacción programan un solo refresco.
+        """
+        postcommit = self.env.cr.postcommit
+        if postcommit.data.get('cashflow_summary_refresh'):
+            return
+        postcommit.data['cashflow_summary_refresh'] = True
+        registry = self.env.registry
+
+        @postcommit.add
+        def refresh_after_commit():
+            try:
+                with registry.cursor() as cr:
+                    api.Environment(cr, SUPERUSER_ID, {})['cashflow.summary'].refresh_summary()
+            except Exception:
+                _logger.exception('No se pudo refrescar cashflow.summary')
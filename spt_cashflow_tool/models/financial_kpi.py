@@ -2,10 +2,30 @@
 Financial KPI Model
 Almacena y calcula los 4 KPIs principales del Cash Flow Tool
 """
+from bisect import bisect_right
+
 from odoo import models, fields, api
 from odoo.tools import float_compare
 
 
+def _find_previous_kpi(company_history, previous_date, record_id):
+    """Último KPI con fecha <= previous_date (excluyendo record_id), o None"""
+    if not company_history or not previous_date:
+        return None
+    dates, rows = company_history
+    position = bisect_right(dates, previous_date) - 1
+    while position >= 0 and rows[position]['id'] == record_id:
+        position -= 1
+    return rows[position] if position >= 0 else None
+
+
+def _percent_variation(current, previous):
+    """Variación porcentual; 0 si el valor anterior no es positivo"""
+    if previous > 0:
+        return (current - previous) / previous * 100
+    return 0
+
+
 class FinancialKPI(models.Model):
     _name = 'financial.kpi'
     _description = 'Financial KPI'
@@ -46,41 +66,56 @@ class FinancialKPI(models.Model):
 
     @api.depends('date', 'cash_available', 'monthly_revenue', 'burn_rate')
     def _compute_variations(self):
-        """Calcula variaciones porcentuales vs mes anterior"""
+        """
+        Calcula variaciones porcentuales vs mes anterior
+
+        Todo el lote se resuelve con un solo search_read (KPIs de las empresas
+        afectadas ordenados por fecha) y el KPI anterior de cada registro se
+        ubica en memoria con bisect, en vez de un search por registro.
+        """
+        previous_dates = {
+            record.id: fields.Date.subtract(record.date, months=1)
+            for record in self if record.date
+        }
+        history = self._get_kpi_history(self.company_id.ids, max(previous_dates.values())) if previous_dates else {}
+
         for record in self:
-            # Buscar KPI del mes anterior
-            previous_date = fields.Date.subtract(record.date, months=1)
-            
-            previous_kpi = self.search([
-                ('date', '<=', previous_date),
-                ('company_id', '=', record.company_id.id),
-                ('id', '!=', record.id)
-            ], limit=1, order='date desc')
-
-            # Variación de Efectivo
-            if previous_kpi and previous_kpi.cash_available > 0:
-                record.cash_variation = (
-                    (record.cash_available - previous_kpi.cash_available) / previous_kpi.cash_available * 100
-                )
+            previous_kpi = _find_previous_kpi(
+                history.get(record.company_id.id),
+                previous_dates.get(record.id),
+                record.id
+            )
+            if previous_kpi:
+                record.cash_variation = _percent_variation(record.cash_available, previous_kpi['cash_available'])
+                record.revenue_variation = _percent_variation(record.monthly_revenue, previous_kpi['monthly_revenue'])
+                record.burn_rate_variation = _percent_variation(record.burn_rate, previous_kpi['burn_rate'])
             else:
                 record.cash_variation = 0
-
-            # Variación de Revenue
-            if previous_kpi and previous_kpi.monthly_revenue > 0:
-                record.revenue_variation = (
-                    (record.monthly_revenue - previous_kpi.monthly_revenue) / previous_kpi.monthly_revenue * 100
-                )
-            else:
                 record.revenue_variation = 0
-
-            # Variación de Burn Rate
-            if previous_kpi and previous_kpi.burn_rate > 0:
-                record.burn_rate_variation = (
-                    (record.burn_rate - previous_kpi.burn_rate) / previous_kpi.burn_rate * 100
-                )
-            else:
                 record.burn_rate_variation = 0
 
+    @api.model
+    def _get_kpi_history(self, company_ids, date_to):
+        """
+        KPIs hasta date_to agrupados por empresa, en una sola consulta
+
+        Returns:
+            dict {company_id: (fechas, filas)} con ambas listas ordenadas por
+            fecha e id ascendentes (fechas listas para bisect)
+        """
+        rows = self.search_read(
+            [('company_id', 'in', company_ids), ('date', '<=', date_to)],
+            ['date', 'company_id', 'cash_available', 'monthly_revenue', 'burn_rate'],
+            order='company_id, date, id',
+            load=None
+        )
+        history = {}
+        for row in rows:
+            dates, company_rows = history.setdefault(row['company_id'], ([], []))
+            dates.append(row['date'])
+            company_rows.append(row)
+        return history
+
     @api.model
     def get_latest_kpis(self):
         """Obtiene los KPIs más recientes por empresa"""
@@ -2,8 +2,30 @@
 Revenue Projection Model
 Genera proyecciones de flujo de efectivo a N meses
 """
+import logging
+
 from odoo import models, fields, api
-from datetime import datetime, timedelta
+from odoo.exceptions import UserError
+from datetime import datetime
+from dateutil.relativedelta import relativedelta
+
+_logger = logging.getLogger(__name__)
+
+# Motor de proyecciones compartido con el dashboard (paquete spt_forecast).
+# Es opcional: sin él solo está disponible el modo de tasa única.
+try:
+    from spt_forecast.proyecciones import generar_proyecciones_vectorizadas
+except ImportError:
+    generar_proyecciones_vectorizadas = None
+    _logger.warning('spt_forecast no está instalado: proyecciones multi-escenario deshabilitadas')
+
+# Horizonte máximo de proyección (5 años)
+MAX_MONTHS_TO_PROJECT = 60
+
+SCENARIOS = [('Conservador', 'Conservador'), ('Moderado', 'Moderado'), ('Optimista', 'Optimista')]
+
+# Escenario que se copia a projection_line_ids (vistas, reporte PDF y dashboard)
+DEFAULT_SCENARIO = 'Moderado'
 
 
 class RevenueProjection(models.Model):
@@ -17,13 +39,29 @@ class RevenueProjection(models.Model):
     company_id = fields.Many2one('res.company', 'Empresa', required=True, default=lambda self: self.env.company)
 
     # Parámetros de proyección
-    months_to_project = fields.Integer('Meses a Proyectar', required=True, default=6, help='De 1 a 12 meses')
+    months_to_project = fields.Integer('Meses a Proyectar', required=True, default=6, help='De 1 a 60 meses')
     base_revenue = fields.Float('Revenue Base Mensual ($)', required=True, digits=(16, 2), help='Revenue mensual base para calcular proyecciones')
     base_expenses = fields.Float('Gastos Base Mensual ($)', required=True, digits=(16, 2), help='Gastos fijos mensuales')
     growth_rate = fields.Float('Tasa de Crecimiento (%)', default=0, digits=(5, 2), help='Crecimiento mensual en porcentaje')
 
+    # Multi-escenario (mismo motor que el dashboard)
+    projection_mode = fields.Selection(
+        [('single', 'Tasa Única'), ('scenarios', 'Multi-Escenario')],
+        'Modo de Proyección', required=True, default='single',
+        help='Multi-Escenario: Conservador/Moderado/Optimista con estacionalidad y costos variables'
+    )
+    variable_cost_rate = fields.Float(
+        'Costos Variables (% del Revenue)', default=0, digits=(5, 2),
+        help='Porcentaje del revenue que se suma a los gastos fijos (burn rate dinámico)'
+    )
+    use_seasonality = fields.Boolean(
+        'Aplicar Estacionalidad', default=True,
+        help='Factores por mes calculados del análisis histórico (requiere 12 meses con datos)'
+    )
+
     # Líneas de proyección (One2many)
     projection_line_ids = fields.One2many('revenue.projection.line', 'projection_id', 'Líneas de Proyección')
+    scenario_line_ids = fields.One2many('revenue.projection.scenario.line', 'projection_id', 'Líneas por Escenario')
 
     # Campos de estado
     active = fields.Boolean('Activo', default=True)
@@ -38,51 +76,171 @@ class RevenueProjection(models.Model):
 
     @api.constrains('months_to_project')
     def _check_months_to_project(self):
-        """Valida que months_to_project esté entre 1 y 12"""
+        """Valida que months_to_project esté entre 1 y MAX_MONTHS_TO_PROJECT"""
         for record in self:
-            if record.months_to_project < 1 or record.months_to_project > 12:
-                raise models.ValidationError('Los meses a proyectar deben estar entre 1 y 12')
+            if record.months_to_project < 1 or record.months_to_project > MAX_MONTHS_TO_PROJECT:
+                raise models.ValidationError(
+                    f'Los meses a proyectar deben estar entre 1 y {MAX_MONTHS_TO_PROJECT}'
+                )
 
     def generate_projections(self):
         """
         Genera automáticamente las líneas de proyección basado en los parámetros.
         Limpia líneas existentes y genera nuevas.
+
+        Acepta varias proyecciones a la vez: las líneas existentes se eliminan
+        con un solo unlink y las nuevas se insertan con un solo create.
         """
+        # Eliminar líneas existentes
+        self.projection_line_ids.unlink()
+        self.scenario_line_ids.unlink()
+
+        line_vals = []
+        scenario_line_vals = []
+        seasonal_factors_by_company = {}
         for record in self:
-            # Eliminar líneas existentes
-            record.projection_line_ids.unlink()
+            if record.projection_mode == 'scenarios':
+                company = record.company_id
+                if company not in seasonal_factors_by_company:
+                    seasonal_factors_by_company[company] = self._get_seasonal_factors(company)
+                seasonal_factors = seasonal_factors_by_company[company] if record.use_seasonality else None
+                scenario_vals = record._prepare_scenario_lines(seasonal_factors)
+                scenario_line_vals.extend(scenario_vals)
+                # Copia del escenario base en las líneas simples (compatibilidad)
+                line_vals.extend(
+                    {key: vals[key] for key in vals if key not in ('scenario', 'net_flow')}
+                    for vals in scenario_vals if vals['scenario'] == DEFAULT_SCENARIO
+                )
+            else:
+                line_vals.extend(record._prepare_projection_lines())
 
-            # Generar nuevas líneas
-            current_date = record.projection_date
-            
-            for month_num in range(1, record.months_to_project + 1):
-                # Calcular fecha del mes
-                if month_num == 1:
-                    month_date = record.projection_date
-                else:
-                    # Sumar meses a la fecha base
-                    month_date = record.projection_date + timedelta(days=30 * (month_num - 1))
-                
-                # Calcular revenue con crecimiento
-                if record.growth_rate > 0:
-                    # Aplicar crecimiento compuesto: revenue * (1 + rate)^months
-                    growth_factor = (1 + record.growth_rate / 100) ** (month_num - 1)
-                    projected_revenue = record.base_revenue * growth_factor
-                else:
-                    projected_revenue = record.base_revenue
-
-                # Los gastos se asumen fijos (sin variación)
-                projected_expenses = record.base_expenses
-                
-                # Crear línea de proyección
-                self.env['revenue.projection.line'].create({
-                    'projection_id': record.id,
-                    'month_number': month_num,
+        self.env['revenue.projection.line'].create(line_vals)
+        self.env['revenue.projection.scenario.line'].create(scenario_line_vals)
+
+    def _prepare_projection_lines(self):
+        """
+        Valores de las líneas de proyección (sin escribir en la base de datos)
+
+        Returns:
+            list de dicts para revenue.projection.line.create()
+        """
+        self.ensure_one()
+        months = range(self.months_to_project)
+
+        # Sumar meses calendario (30 días por mes se desfasa en horizontes largos)
+        month_dates = [self.projection_date + relativedelta(months=offset) for offset in months]
+
+        # Crecimiento compuesto: revenue * (1 + rate)^months
+        if self.growth_rate > 0:
+            growth = 1 + self.growth_rate / 100
+            projected_revenues = [self.base_revenue * growth ** offset for offset in months]
+        else:
+            projected_revenues = [self.base_revenue] * self.months_to_project
+
+        # Los gastos se asumen fijos (sin variación)
+        return [
+            {
+                'projection_id': self.id,
+                'month_number': offset + 1,
+                'month_name': month_date.strftime('%b %Y'),
+                'month_date': month_date,
+                'projected_revenue': projected_revenue,
+                'projected_expenses': self.base_expenses,
+            }
+            for offset, month_date, projected_revenue in zip(months, month_dates, projected_revenues)
+        ]
+
+    def _prepare_scenario_lines(self, seasonal_factors=None):
+        """
+        Valores de las líneas Conservador/Moderado/Optimista en una sola pasada
+        del motor vectorizado de spt_forecast (crecimiento por escenario,
+        estacionalidad y burn rate = gastos fijos + % de costos variables)
+
+        Returns:
+            list de dicts para revenue.projection.scenario.line.create()
+        """
+        self.ensure_one()
+        if generar_proyecciones_vectorizadas is None:
+            raise UserError(
+                'Las proyecciones multi-escenario requieren el paquete spt_forecast '
+                '(y numpy/pandas) en el servidor de Odoo'
+            )
+
+        months = self.months_to_project
+        projections = generar_proyecciones_vectorizadas(
+            self.base_revenue,
+            {
+                'gastos_fijos': self.base_expenses,
+                'tasa_costos_variables': self.variable_cost_rate / 100,
+            },
+            months,
+            escenarios=[scenario for scenario, _label in SCENARIOS],
+            seasonal_factors=seasonal_factors,
+            # El motor proyecta desde el mes siguiente a ultimo_mes_historico
+            ultimo_mes_historico=self.projection_date.month - 1,
+            ano_base=self.projection_date.year,
+        )
+
+        month_dates = [self.projection_date + relativedelta(months=offset) for offset in range(months)]
+        scenario_vals = []
+        for scenario, df_proj in projections.items():
+            scenario_vals.extend(
+                {
+                    'projection_id': self.id,
+                    'scenario': scenario,
+                    'month_number': offset + 1,
                     'month_name': month_date.strftime('%b %Y'),
                     'month_date': month_date,
-                    'projected_revenue': projected_revenue,
-                    'projected_expenses': projected_expenses,
-                })
+                    'projected_revenue': float(revenue),
+                    'projected_expenses': float(expenses),
+                    'net_flow': float(net_flow),
+                }
+                for offset, (month_date, revenue, expenses, net_flow) in enumerate(zip(
+                    month_dates,
+                    df_proj['revenue'],
+                    df_proj['egresos_totales'],
+                    df_proj['flujo_neto'],
+                ))
+            )
+        return scenario_vals
+
+    @api.model
+    def _get_seasonal_factors(self, company):
+        """
+        Factores estacionales {nombre_mes: factor} del análisis histórico mensual
+
+        Igual que el dashboard: revenue promedio de cada mes calendario dividido
+        por el promedio de los 12 meses. Sin los 12 meses con datos retorna None
+        (el motor usa factor 1.0).
+        """
+        monthly_averages = self.env['cashflow.analysis']._read_group(
+            [('company_id', '=', company.id), ('period', '=', 'monthly')],
+            groupby=['date_from:month_number'],
+            aggregates=['revenue:avg'],
+        )
+        if len(monthly_averages) < 12:
+            return None
+
+        month_names = ['Enero', 'Febrero', 'Marzo', 'Abril', 'Mayo', 'Junio',
+                       'Julio', 'Agosto', 'Septiembre', 'Octubre', 'Noviembre', 'Diciembre']
+        overall_average = sum(average for _month, average in monthly_averages) / 12
+        if overall_average <= 0:
+            return None
+        return {
+            month_names[month_number - 1]: average / overall_average
+            for month_number, average in monthly_averages
+        }
+
+    @api.model
+    def cron_refresh_scenario_projections(self):
+        """
+        Cron diario: regenera las proyecciones multi-escenario activas para que
+        reflejen la estacionalidad del histórico más reciente
+        """
+        projections = self.search([('projection_mode', '=', 'scenarios')])
+        if projections:
+            projections.generate_projections()
+            _logger.info('Proyecciones multi-escenario regeneradas: %s', len(projections))
 
     def action_generate_projections(self):
         """Acción para botón en vista form"""
@@ -184,3 +342,24 @@ class RevenueProjectionLine(models.Model):
         """Calcula el flujo neto: revenue - expenses"""
         for line in self:
             line.net_flow = line.projected_revenue - line.projected_expenses
+
+
+class RevenueProjectionScenarioLine(models.Model):
+    _name = 'revenue.projection.scenario.line'
+    _description = 'Revenue Projection Scenario Line'
+    _order = 'projection_id, scenario, month_number'
+
+    # Una fila por proyección × escenario × mes; el flujo neto lo calcula el motor
+    projection_id = fields.Many2one('revenue.projection', 'Proyección', required=True, ondelete='cascade', index=True)
+    scenario = fields.Selection(SCENARIOS, 'Escenario', required=True)
+    month_number = fields.Integer('Número de Mes', required=True)
+    month_name = fields.Char('Nombre del Mes', required=True)
+    month_date = fields.Date('Fecha del Mes', required=True)
+    projected_revenue = fields.Float('Revenue Proyectado ($)', digits=(16, 2), required=True)
+    projected_expenses = fields.Float('Gastos Proyectados ($)', digits=(16, 2), required=True)
+    net_flow = fields.Float('Flujo Neto Proyectado ($)', digits=(16, 2), required=True)
+
+    _sql_constraints = [
+        ('projection_scenario_month_uniq', 'unique(projection_id, scenario, month_number)',
+         'Cada escenario tiene una sola línea por mes'),
+    ]
@@ -10,7 +10,7 @@ class GenerateProjectionWizard(models.TransientModel):
 
     name = fields.Char('Nombre de Proyección', required=True)
     projection_date = fields.Date('Fecha Base', required=True, default=fields.Date.today)
-    months_to_project = fields.Integer('Meses a Proyectar', required=True, default=6, help='De 1 a 12 meses')
+    months_to_project = fields.Integer('Meses a Proyectar', required=True, default=6, help='De 1 a 60 meses')
     base_revenue = fields.Float('Revenue Base Mensual ($)', required=True, help='Dejar en 0 para calcular automáticamente')
     base_expenses = fields.Float('Gastos Base Mensual ($)', required=True, help='Dejar en 0 para calcular automáticamente')
     growth_rate = fields.Float('Tasa de Crecimiento (%)', default=0, help='Crecimiento mensual esperado')
@@ -17,6 +17,10 @@ class ImportHistoricalDataWizard(models.TransientModel):
         'Tipo de Período', required=True, default='monthly'
     )
     company_id = fields.Many2one('res.company', 'Empresa', required=True, default=lambda self: self.env.company)
+    incremental = fields.Boolean(
+        'Solo Períodos con Cambios', default=True,
+        help='Recalcula únicamente los períodos con facturas nuevas o modificadas desde la última importación'
+    )
 
     def action_import_historical_data(self):
         """
@@ -30,7 +34,8 @@ class ImportHistoricalDataWizard(models.TransientModel):
             date_from=self.date_from,
             date_to=self.date_to,
             period_type=self.period_type,
-            company_id=self.company_id
+            company_id=self.company_id,
+            incremental=self.incremental
         )
         
         # Retornar action a la vista de análisis
@@ -0,0 +1,24 @@
+"""
+SPT Forecast - Módulos de cálculo sin dependencia de Streamlit
+==============================================================
+
+Funciones puras (sin st.session_state ni UI) que pueden importarse desde
+procesos worker, jobs batch o el módulo Odoo sin ejecutar el dashboard.
+
+Módulos:
+  - ingesta: lectura de workbooks Excel (secuencial o en paralelo)
+  - constantes: escenarios, tasas de crecimiento y nombres de meses
+  - estacionalidad: almacén persistente y versionado de factores estacionales
+  - cartera: índice de intervalos de contratos y cotizaciones
+  - pronostico: backends heurístico / descomposición / Holt-Winters
+  - proyecciones: motor vectorizado de proyecciones multi-escenario
+  - balance: balance, necesidades mínimas, excedentes y transferencias
+  - simulacion: simulación Monte Carlo de flujo de caja
+  - backtest: backtest walk-forward (MAPE/sesgo por escenario y horizonte)
+  - granularidad: flujo de caja diario/semanal con rezago de cobranza
+  - submuestreo: reducción min-max de series largas para gráficos
+  - grafo: grafo de cálculos memoizados por versión de sus entradas
+  - motor: API de proyección completa (entradas explícitas → tablas)
+  - perfilador: tiempos, llamadas y memoria por sección / función y rerun
+  - registro: logging estructurado (niveles, JSON, muestreo, tiempos)
+"""
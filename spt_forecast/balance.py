@@ -0,0 +1,506 @@
+"""
+Balance, excedentes y transferencias - v7.0.2
+=============================================
+
+Cálculos sobre las proyecciones mensuales: balance acumulado por escenario,
+necesidades mínimas dinámicas (colchón), excedentes invertibles,
+recomendaciones de inversión y transferencias trimestrales a casa matriz.
+
+v7.0.2: Libro de caja columnar. Los cálculos ya no recorren filas con
+iterrows(): el balance es una suma acumulada (np.cumsum), los totales
+trimestrales son reducciones agrupadas (np.bincount) y las transferencias se
+aplican como eventos negativos intercalados en la misma suma acumulada
+(suma segmentada). np.cumsum suma en el mismo orden que los loops originales,
+por lo que los resultados son idénticos.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def _saldos_acumulados(efectivo_inicial, movimientos):
+    """
+    Saldo después de cada movimiento, sumando en orden desde efectivo_inicial
+
+    Equivale a `saldo += movimiento` en un loop (mismo redondeo que el cálculo
+    fila a fila, a diferencia de efectivo_inicial + np.cumsum(movimientos)).
+    """
+    movimientos = np.asarray(movimientos, dtype=float)
+    return np.cumsum(np.concatenate([[efectivo_inicial], movimientos]))[1:]
+
+
+def _columna_costos_contratos(proyecciones_df):
+    """Costos específicos de contratos por mes (0 si la proyección no los trae)"""
+    if 'costos_contratos' in proyecciones_df.columns:
+        return proyecciones_df['costos_contratos'].to_numpy(dtype=float)
+    return 0
+
+
+def _necesidades_por_fila(proyecciones_df, gastos_fijos, tasa_costos_variables, meses_colchon):
+    """Necesidades mínimas dinámicas alineadas con las filas de la proyección"""
+    revenue = proyecciones_df['revenue'].to_numpy(dtype=float)
+    costos_contratos = _columna_costos_contratos(proyecciones_df)
+    burn_rate = gastos_fijos + revenue * tasa_costos_variables + costos_contratos
+    return burn_rate * meses_colchon
+
+
+def _ceros_o_flotantes(valores):
+    """
+    Columna de montos con piso en 0 (max(0, x)) con el mismo dtype que producía
+    el cálculo fila a fila: int64 si todos quedan en 0, float64 en otro caso
+    """
+    valores = np.where(valores > 0, valores, 0.0)
+    if not (valores > 0).any():
+        return np.zeros(len(valores), dtype=np.int64)
+    return valores
+
+
+def calcular_runway_mejorado(efectivo_actual, flujos_proyectados, burn_rate):
+    """✅ Runway considerando balance proyectado con protección ZeroDivision"""
+    balance_3_meses = efectivo_actual + sum(flujos_proyectados)
+    
+    if balance_3_meses <= 0:
+        efectivo_temp = efectivo_actual
+        for i, flujo in enumerate(flujos_proyectados, 1):
+            efectivo_temp += flujo
+            if efectivo_temp <= 0:
+                return i
+        return 3
+    else:
+        # ✅ v5.0.3: Proteger división por cero
+        if burn_rate > 0:
+            meses_adicionales = balance_3_meses / burn_rate
+            return 3 + meses_adicionales
+        else:
+            return float('inf')  # Runway infinito si no hay burn rate
+
+
+def calcular_necesidades_minimas_dinamicas(proyecciones_df, gastos_fijos, tasa_costos_variables, meses_colchon):
+    """
+    🆕 v6.2.2: Calcula necesidades mínimas MES A MES considerando costos específicos de contratos
+    
+    Esta función resuelve el problema de que las necesidades mínimas eran estáticas,
+    cuando en realidad varían según si hay contratos vigentes o no en cada mes.
+    
+    Args:
+        proyecciones_df: DataFrame con proyecciones (debe tener 'mes', 'mes_numero', 'ano', 'revenue', 'costos_contratos')
+        gastos_fijos: Gastos fijos mensuales
+        tasa_costos_variables: Tasa de costos variables (ej: 0.0962)
+        meses_colchon: Número de meses de burn rate para mantener como colchón
+    
+    Returns:
+        dict: {mes: necesidades_minimas} donde mes es 1, 2, 3...
+    
+    LÓGICA:
+    Para cada mes proyectado:
+    1. Calcular costos variables = revenue × tasa
+    2. Obtener costos específicos de contratos para ese mes
+    3. Burn rate = gastos_fijos + costos_variables + costos_contratos
+    4. Necesidades mínimas = burn_rate × meses_colchon
+    
+    EJEMPLO:
+    - Mes 1 (Nov 2025) con contrato de $10k costos:
+      Burn rate = $50k + $30k + $10k = $90k
+      Necesidades (2m) = $180k
+    
+    - Mes 7 (May 2026) sin contratos:
+      Burn rate = $50k + $30k + $0 = $80k
+      Necesidades (2m) = $160k
+    """
+    # 🆕 v7.0.2: Vectorizado (burn rate de todos los meses en una operación)
+    necesidades = _necesidades_por_fila(proyecciones_df, gastos_fijos, tasa_costos_variables, meses_colchon)
+    return dict(zip(proyecciones_df['mes'].tolist(), necesidades.tolist()))
+
+
+def calcular_necesidades_excedentes_mejorado(efectivo_actual, proyecciones_df, financial_data, meses_colchon=2):
+    """
+    ✅ Necesidades/excedentes con balance completo
+    ✅ v4.5.5: Recibe burn_rate como parámetro (calculado dinámicamente)
+    🆕 v4.6.0: Meses de colchón configurable
+    ✅ v6.2.3: FIX CRÍTICO - Usa necesidades DINÁMICAS que consideran costos de contratos mes a mes
+    
+    Args:
+        efectivo_actual: Efectivo disponible actual
+        proyecciones_df: DataFrame con proyecciones (debe incluir 'flujo_neto', 'revenue', 'costos_contratos')
+        financial_data: Dict con 'gastos_fijos' y 'tasa_costos_variables'
+        meses_colchon: Número de meses de burn rate para margen de protección (1, 2 o 3)
+    
+    Returns:
+        dict con balance_proyectado, necesidades_minimas, excedente_deficit, flujos_mensuales
+    
+    NOTA: Con pagos a 30 días, se recomienda mínimo 2 meses de colchón:
+    - Mes 1: Cubrir operación actual
+    - Mes 2: Cubrir operación mientras se cobran ventas del mes 1
+    
+    ✅ v6.2.3: CAMBIO CRÍTICO
+    - ANTES: necesidades_minimas = burn_rate * meses_colchon (FIJO para todos los meses)
+    - AHORA: necesidades_minimas = PROMEDIO de necesidades dinámicas de 3 meses (VARIABLE según contratos)
+    """
+    flujos_proyectados = proyecciones_df['flujo_neto'].tolist()
+    balance_proyectado = efectivo_actual + sum(flujos_proyectados)
+    
+    # ✅ v6.2.3: Calcular necesidades mínimas DINÁMICAS mes a mes
+    necesidades_dinamicas = calcular_necesidades_minimas_dinamicas(
+        proyecciones_df,
+        financial_data['gastos_fijos'],
+        financial_data['tasa_costos_variables'],
+        meses_colchon
+    )
+    
+    # Para la métrica principal, usar el PROMEDIO de los 3 meses
+    # (Esto representa las necesidades típicas del período proyectado)
+    necesidades_minimas = sum(necesidades_dinamicas.values()) / len(necesidades_dinamicas)
+    
+    excedente_o_deficit = balance_proyectado - necesidades_minimas
+    
+    return {
+        'balance_proyectado': balance_proyectado,
+        'necesidades_minimas': necesidades_minimas,
+        'excedente_deficit': excedente_o_deficit,
+        'flujos_mensuales': flujos_proyectados,
+        'meses_colchon': meses_colchon  # Incluir para referencia
+    }
+
+
+def calcular_excedentes_invertibles(proyecciones_df, efectivo_inicial, financial_data, meses_colchon, dias_liquidacion):
+    """
+    🆕 v4.8.0: Calcula excedentes invertibles mes a mes considerando necesidades mínimas
+    ✅ v6.2.2: CORREGIDO - Usa necesidades mínimas DINÁMICAS que varían mes a mes
+    
+    Args:
+        proyecciones_df: DataFrame con proyecciones mensuales (debe tener 'revenue', 'egresos_totales', 'costos_contratos')
+        efectivo_inicial: Efectivo disponible al inicio
+        financial_data: Dict con 'gastos_fijos' y 'tasa_costos_variables'
+        meses_colchon: Número de meses de burn rate para mantener como colchón
+        dias_liquidacion: Días de anticipación para liquidar inversiones
+    
+    Returns:
+        DataFrame con análisis de excedentes invertibles mes a mes
+    
+    LÓGICA v6.2.2 (CORREGIDA):
+    1. Calcular necesidades mínimas DINÁMICAS por mes (considerando vigencia de contratos)
+    2. Por cada mes, calcular el balance acumulado
+    3. Restar las necesidades mínimas ESPECÍFICAS de ese mes
+    4. El excedente es lo que se puede invertir
+    5. Marcar cuándo liquidar cada inversión (basado en días_liquidacion)
+    
+    DIFERENCIA vs v6.2.1:
+    - ANTES: necesidades_minimas = burn_rate × meses_colchon (FIJO para todos los meses)
+    - AHORA: necesidades_minimas_mes = (gastos + costos_variables + costos_contratos) × meses_colchon (VARIABLE)
+    """
+    
+    if len(proyecciones_df) == 0:
+        return pd.DataFrame()
+    
+    # 🆕 v6.2.2: Necesidades mínimas DINÁMICAS mes a mes
+    # 🆕 v7.0.2: Columnar - balance por suma acumulada, sin iterrows()
+    necesidades = _necesidades_por_fila(
+        proyecciones_df,
+        financial_data['gastos_fijos'],
+        financial_data['tasa_costos_variables'],
+        meses_colchon
+    )
+    
+    meses = proyecciones_df['mes'].to_numpy()
+    balance = _saldos_acumulados(efectivo_inicial, proyecciones_df['flujo_neto'])
+    
+    # Excedente invertible = balance - necesidades ESPECÍFICAS de cada mes
+    excedente = balance - necesidades
+    puede_invertir = excedente > 0
+    
+    # Fecha aproximada de liquidación (dias_liquidacion antes del siguiente mes)
+    # Simplificación: asumimos que cada mes tiene 30 días
+    mes_liquidacion = pd.Series(meses + (1 if dias_liquidacion <= 30 else 2))
+    if puede_invertir.any():
+        liquidar_antes_mes = mes_liquidacion.where(puede_invertir)
+    else:
+        liquidar_antes_mes = [None] * len(meses)
+    
+    return pd.DataFrame({
+        'mes': meses,
+        'balance_disponible': balance,
+        'necesidades_minimas': necesidades,  # 🆕 v6.2.2: Ahora varía por mes
+        'excedente_invertible': _ceros_o_flotantes(excedente),
+        'puede_invertir': puede_invertir,
+        'liquidar_antes_mes': liquidar_antes_mes
+    })
+
+
+def generar_recomendaciones_inversion(df_excedentes, rentabilidad_estimada=0.10):
+    """
+    🆕 v4.8.0: Genera recomendaciones de inversión basadas en excedentes
+    
+    Args:
+        df_excedentes: DataFrame con análisis de excedentes
+        rentabilidad_estimada: Rentabilidad anual estimada (default 10% = 0.10)
+    
+    Returns:
+        DataFrame con recomendaciones de inversión
+    
+    INSTRUMENTOS SUGERIDOS (Colombia):
+    - CDTs: ~12% EA (baja liquidez pero mayor rendimiento)
+    - TES corto plazo: ~10% EA (buena liquidez)
+    - Fondos de Inversión Colectiva: ~8-10% EA (alta liquidez)
+    """
+    
+    if len(df_excedentes) == 0:
+        return pd.DataFrame()
+    
+    # 🆕 v7.0.2: Filtro con máscara booleana en lugar de iterrows()
+    invertibles = df_excedentes[
+        df_excedentes['puede_invertir'].astype(bool) & (df_excedentes['excedente_invertible'] > 0)
+    ]
+    if len(invertibles) == 0:
+        return pd.DataFrame()
+    
+    monto = invertibles['excedente_invertible'].to_numpy()
+    
+    return pd.DataFrame({
+        'mes': invertibles['mes'].to_numpy(),
+        'monto_invertible': monto,
+        'instrumento_sugerido': 'Cartera Mixta (CDT 40%, TES 30%, FCI 30%)',
+        # Rendimiento proporcional al tiempo: inversión de 1 mes = rentabilidad_anual / 12
+        'rentabilidad_estimada_mensual': monto * (rentabilidad_estimada / 12),
+        'liquidar_antes_mes': invertibles['liquidar_antes_mes'].to_numpy(),
+        'riesgo': 'Bajo',
+        'liquidez': 'Media-Alta'
+    })
+
+
+def _agrupar_por_trimestre(proyecciones_df, meses_a_proyectar):
+    """
+    Agrupa las filas de la proyección en trimestres (meses 1-3 → T1, 4-6 → T2, ...)
+    
+    Returns:
+        tuple (numero_trimestres, filas, trimestre_fila, revenue_total, flujo_neto_total):
+        - filas: posiciones de las filas incluidas, ordenadas por trimestre
+        - trimestre_fila: índice de trimestre (0 = T1) de cada fila incluida
+        - revenue_total / flujo_neto_total: sumas por trimestre (np.bincount)
+    """
+    numero_trimestres = int(np.ceil(meses_a_proyectar / 3))
+    
+    meses = proyecciones_df['mes'].to_numpy()
+    incluidas = np.flatnonzero((meses >= 1) & (meses <= meses_a_proyectar))
+    trimestre = (meses[incluidas].astype(np.int64) - 1) // 3
+    orden = np.argsort(trimestre, kind='stable')
+    filas = incluidas[orden]
+    trimestre_fila = trimestre[orden]
+    
+    def sumar(columna):
+        valores = proyecciones_df[columna].to_numpy()
+        totales = np.bincount(trimestre_fila, weights=valores[filas].astype(float), minlength=numero_trimestres)
+        # Proyecciones vacías (todo en 0) traen columnas enteras: conservar el tipo
+        return totales.astype(valores.dtype) if np.issubdtype(valores.dtype, np.integer) else totales
+    
+    return numero_trimestres, filas, trimestre_fila, sumar('revenue'), sumar('flujo_neto')
+
+
+def _etiquetas_trimestre(numero_trimestres):
+    """Etiquetas 'T1', 'T2', ..."""
+    return [f'T{t}' for t in range(1, numero_trimestres + 1)]
+
+
+def _rangos_trimestre(numero_trimestres, meses_a_proyectar):
+    """Rango de meses de cada trimestre ('1-3', '4-6', ...; el último puede ser parcial)"""
+    return [f'{(t - 1) * 3 + 1}-{min(t * 3, meses_a_proyectar)}' for t in range(1, numero_trimestres + 1)]
+
+
+def _margen_retenido(utilidad_local, revenue_total):
+    """Margen retenido (%) por trimestre; 0 si el trimestre no tiene revenue"""
+    margen = np.zeros(len(revenue_total))
+    con_revenue = revenue_total > 0
+    margen[con_revenue] = utilidad_local[con_revenue] / revenue_total[con_revenue] * 100
+    return _ceros_o_flotantes(margen)
+
+
+def calcular_transferencias_trimestrales(proyecciones_df, meses_a_proyectar):
+    """
+    🆕 v4.8.0: Calcula transferencias TRIMESTRALES a casa matriz según política SPT
+    ⚠️ NOTA v4.8.1: Esta función NO descuenta transferencias del balance
+    Para balance ajustado, usar calcular_transferencias_con_balance()
+    
+    POLÍTICA SPT GLOBAL:
+    - Utilidad neta local debe ser 10% del revenue
+    - Transferencia = Flujo Neto SPT Colombia - (Revenue × 10%)
+    - Se transfiere trimestre vencido (no mensualmente)
+    
+    Args:
+        proyecciones_df: DataFrame con proyecciones (debe tener 'revenue' y 'flujo_neto')
+        meses_a_proyectar: Número total de meses proyectados
+    
+    Returns:
+        dict con análisis trimestral de transferencias
+    
+    EJEMPLO:
+    Si Flujo Neto trimestral = $150,000 y Revenue trimestral = $400,000
+    Utilidad Local Requerida = $400,000 × 10% = $40,000
+    Transferencia HQ = $150,000 - $40,000 = $110,000
+    """
+    
+    # 🆕 v7.0.2: Totales trimestrales como reducciones agrupadas (sin filtrar por trimestre)
+    numero_trimestres, _, _, revenue_total, flujo_neto_total = _agrupar_por_trimestre(
+        proyecciones_df, meses_a_proyectar
+    )
+    
+    # Utilidad local requerida (10% del revenue) y transferencia a casa matriz
+    utilidad_local = revenue_total * 0.10
+    transferencia_hq = _ceros_o_flotantes(flujo_neto_total - utilidad_local)  # No transferir si es negativo
+    
+    trimestres = pd.DataFrame({
+        'trimestre': _etiquetas_trimestre(numero_trimestres),
+        'meses': _rangos_trimestre(numero_trimestres, meses_a_proyectar),
+        'revenue_total': revenue_total,
+        'flujo_neto_total': flujo_neto_total,
+        'utilidad_local_10pct': utilidad_local,
+        'transferencia_hq': transferencia_hq,
+        'margen_retenido': _margen_retenido(utilidad_local, revenue_total)
+    }) if numero_trimestres > 0 else pd.DataFrame()
+    
+    return {
+        'trimestres': trimestres,
+        'numero_trimestres': numero_trimestres,
+        'total_transferencias': sum(transferencia_hq.tolist())
+    }
+
+
+def calcular_transferencias_con_balance(proyecciones_df, efectivo_inicial, meses_a_proyectar):
+    """
+    🆕 v4.8.1: Calcula transferencias Y balance ajustado después de cada transferencia
+    
+    CORRECCIÓN CRÍTICA: Al final de cada trimestre, la transferencia se DESCUENTA
+    del balance, por lo que el siguiente trimestre parte con menos efectivo.
+    
+    Args:
+        proyecciones_df: DataFrame con proyecciones (debe tener 'mes', 'revenue', 'flujo_neto')
+        efectivo_inicial: Efectivo disponible al inicio del período
+        meses_a_proyectar: Número total de meses proyectados
+    
+    Returns:
+        dict con:
+        - 'trimestres': DataFrame con análisis trimestral
+        - 'balance_mensual': DataFrame con balance mes a mes (DESPUÉS de transferencias)
+        - 'total_transferencias': Total transferido
+        - 'balance_final': Balance después de todas las transferencias
+    
+    LÓGICA:
+    1. Acumular flujo neto mes a mes
+    2. Al final de cada trimestre:
+       - Calcular transferencia (Flujo Neto Trimestral - 10% Revenue Trimestral)
+       - DESCONTAR transferencia del balance
+       - Continuar con balance ajustado
+    """
+    
+    # 🆕 v7.0.2: Libro de caja columnar con suma acumulada segmentada.
+    # Cada trimestre aporta sus flujos mensuales seguidos de un evento negativo
+    # (-transferencia); una sola np.cumsum sobre esa secuencia da el balance
+    # antes y después de cada transferencia, en el mismo orden que el loop original.
+    numero_trimestres, filas, trimestre_fila, revenue_total, flujo_neto_total = _agrupar_por_trimestre(
+        proyecciones_df, meses_a_proyectar
+    )
+    
+    if numero_trimestres == 0:
+        return {
+            'trimestres': pd.DataFrame(),
+            'balance_mensual': pd.DataFrame(),
+            'numero_trimestres': 0,
+            'total_transferencias': 0,
+            'balance_final': efectivo_inicial
+        }
+    
+    utilidad_local = revenue_total * 0.10
+    transferencia_hq = _ceros_o_flotantes(flujo_neto_total - utilidad_local)
+    
+    flujo_mes = proyecciones_df['flujo_neto'].to_numpy()[filas]
+    meses_fila = proyecciones_df['mes'].to_numpy()[filas].astype(int)
+    
+    # Secuencia de eventos: meses del T1, -transferencia T1, meses del T2, ...
+    n_filas = len(filas)
+    posicion_mes = np.arange(n_filas) + trimestre_fila           # corrimiento por transferencias previas
+    posicion_transferencia = np.searchsorted(trimestre_fila, np.arange(numero_trimestres), side='right') \
+        + np.arange(numero_trimestres)
+    eventos = np.empty(n_filas + numero_trimestres)
+    eventos[posicion_mes] = flujo_mes
+    eventos[posicion_transferencia] = -transferencia_hq
+    saldos = _saldos_acumulados(efectivo_inicial, eventos)
+    
+    balance_antes = saldos[posicion_mes]
+    balance_despues_trimestre = saldos[posicion_transferencia]
+    balance_inicio = np.concatenate([[efectivo_inicial], balance_despues_trimestre[:-1]])
+    
+    # El último mes de cada trimestre refleja la transferencia aplicada
+    ultimo_mes = np.append(trimestre_fila[1:] != trimestre_fila[:-1], True)[:n_filas]
+    balance_despues_mes = balance_antes.copy()
+    balance_despues_mes[ultimo_mes] = balance_despues_trimestre[trimestre_fila[ultimo_mes]]
+    transferencia_mes = np.zeros(n_filas, dtype=transferencia_hq.dtype)
+    transferencia_mes[ultimo_mes] = transferencia_hq[trimestre_fila[ultimo_mes]]
+    
+    etiquetas = _etiquetas_trimestre(numero_trimestres)
+    
+    trimestres = pd.DataFrame({
+        'trimestre': etiquetas,
+        'meses': _rangos_trimestre(numero_trimestres, meses_a_proyectar),
+        'balance_inicio': balance_inicio,
+        'revenue_total': revenue_total,
+        'flujo_neto_total': flujo_neto_total,
+        'utilidad_local_10pct': utilidad_local,
+        'transferencia_hq': transferencia_hq,
+        'balance_despues_transferencia': balance_despues_trimestre,
+        'margen_retenido': _margen_retenido(utilidad_local, revenue_total)
+    })
+    
+    balance_mensual = pd.DataFrame({
+        'mes': meses_fila,
+        'trimestre': [etiquetas[t] for t in trimestre_fila],
+        'balance_antes_transferencia': balance_antes,
+        'flujo_neto_mes': flujo_mes,
+        'balance_despues_transferencia': balance_despues_mes,
+        'transferencia_aplicada': transferencia_mes
+    }) if n_filas > 0 else pd.DataFrame()
+    
+    return {
+        'trimestres': trimestres,
+        'balance_mensual': balance_mensual,
+        'numero_trimestres': numero_trimestres,
+        'total_transferencias': sum(transferencia_hq.tolist()),
+        'balance_final': saldos[-1]
+    }
+
+
+def generar_balance_multi_escenario(meses, efectivo_inicial, proyecciones):
+    """
+    ✅ Balance multi-escenario corregido
+    ✅ v6.2.3: Ahora incluye nombre_mes con año para etiquetas correctas
+    """
+    
+    balances = {}
+    
+    for escenario, df_proj in proyecciones.items():
+        if len(df_proj) == 0:
+            balances[escenario] = pd.DataFrame()
+            continue
+        
+        # 🆕 v4.6.1: Usar 'egresos_totales' en lugar de 'gastos'
+        # 🆕 v7.0.2: Columnar - efectivo final por suma acumulada (sin iterrows)
+        meses_proj = df_proj['mes'].to_numpy().astype(int)
+        ingresos = df_proj['revenue'].to_numpy()
+        egresos = df_proj['egresos_totales'].to_numpy()
+        flujo_neto = ingresos - egresos
+        efectivo_final = _saldos_acumulados(efectivo_inicial, flujo_neto)
+        
+        if 'nombre_mes' in df_proj.columns:
+            nombre_mes = df_proj['nombre_mes'].to_numpy()  # ✅ v6.2.3: Incluir nombre con año
+        else:
+            nombre_mes = [f"Mes {m}" for m in meses_proj]
+        
+        balances[escenario] = pd.DataFrame({
+            'mes': meses_proj,
+            'nombre_mes': nombre_mes,
+            'efectivo_inicial': efectivo_final - flujo_neto,
+            'ingresos': ingresos,
+            'egresos_totales': egresos,
+            'flujo_neto': flujo_neto,
+            'efectivo_final': efectivo_final,
+            'escenario': escenario
+        })
+    
+    return balances
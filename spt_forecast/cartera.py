@@ -0,0 +1,255 @@
+"""
+Índice de intervalos de la cartera - v7.0.0
+===========================================
+
+Cada contrato/cotización se compila UNA vez a un intervalo de ordinales de mes
+[mes_desde, mes_hasta] (ordinal = año × 12 + mes - 1). Los aportes de revenue y
+costos se acumulan como sumas de prefijo sobre los puntos de cambio, de modo
+que el revenue vigente en cualquier mes es una búsqueda binaria O(log n).
+
+Recibe la cartera como listas de dicts (mismo formato que
+st.session_state.contratos_manuales / cotizaciones_manuales); el cacheo del
+índice entre reruns queda a cargo del llamador.
+"""
+
+from datetime import datetime
+
+import numpy as np
+
+# Centinelas de ordinal: "vigente siempre" y "sin fecha fin"
+_ORDINAL_MIN = -10**9
+_ORDINAL_MAX = 10**9
+
+
+def ordinal_mes(ano, mes):
+    """🆕 v6.4.1: Ordinal de mes (año × 12 + mes - 1). Acepta escalares o arrays"""
+    return ano * 12 + (mes - 1)
+
+
+def _a_datetime(valor):
+    """🆕 v6.4.1: Convierte ISO string → datetime (otros tipos se retornan igual)"""
+    if isinstance(valor, str):
+        return datetime.fromisoformat(valor)
+    return valor
+
+
+def _parsear_vigencia_contrato(contrato):
+    """
+    🆕 v6.4.1: Pre-parsea la vigencia de un contrato (misma semántica que la
+    versión por mes: error de fechas → vigente siempre)
+    
+    Returns:
+        tuple (inicio, fin) como datetime; inicio None = vigente siempre,
+        fin None = sin fecha fin
+    """
+    try:
+        fecha_inicio = _a_datetime(contrato.get('fecha_inicio'))
+        fecha_fin = contrato.get('fecha_fin', 'Abierta')
+        
+        if not isinstance(fecha_inicio, datetime):
+            # Comparar datetime con None/date lanza TypeError → fallback vigente
+            return None, None
+        
+        if fecha_fin == 'Abierta' or fecha_fin is None:
+            return fecha_inicio, None
+        
+        fecha_fin = _a_datetime(fecha_fin)
+        # Fecha fin no comparable → vigente desde el inicio (fallback)
+        return fecha_inicio, fecha_fin if isinstance(fecha_fin, datetime) else None
+    
+    except (ValueError, TypeError):
+        return None, None
+
+
+def _parsear_vigencia_cotizacion(cotizacion):
+    """
+    🆕 v6.4.1: Pre-parsea la vigencia de una cotización (inicio + duracion_meses,
+    mismo día del mes; duración 0 = indefinida; error → vigente siempre)
+    
+    Returns:
+        tuple (inicio, fin) como datetime; inicio None = vigente siempre,
+        fin None = sin fecha fin
+    """
+    try:
+        fecha_inicio = _a_datetime(cotizacion.get('fecha_inicio'))
+        duracion_meses = cotizacion.get('duracion_meses', 0)
+        
+        if duracion_meses > 0:
+            mes_fin = fecha_inicio.month + duracion_meses
+            ano_fin = fecha_inicio.year + (mes_fin - 1) // 12
+            mes_fin = ((mes_fin - 1) % 12) + 1
+            fecha_fin = datetime(ano_fin, mes_fin, fecha_inicio.day)
+        else:
+            fecha_fin = None  # Sin duración = indefinido
+        
+        if not isinstance(fecha_inicio, datetime):
+            return None, None
+        
+        return fecha_inicio, fecha_fin
+    
+    except (ValueError, TypeError, AttributeError):
+        return None, None
+
+
+def _vigencia_a_ordinales(fecha_inicio, fecha_fin):
+    """
+    🆕 v6.4.1: Convierte una vigencia a intervalo cerrado de ordinales de mes
+    
+    Un mes cuenta como vigente si su día 15 (mitad de mes) cae dentro de
+    [fecha_inicio, fecha_fin], igual que en el cálculo mes a mes.
+    """
+    try:
+        if fecha_inicio is None:
+            desde = _ORDINAL_MIN
+        else:
+            desde = ordinal_mes(fecha_inicio.year, fecha_inicio.month)
+            if fecha_inicio > datetime(fecha_inicio.year, fecha_inicio.month, 15):
+                desde += 1
+        
+        if fecha_fin is None:
+            hasta = _ORDINAL_MAX
+        else:
+            hasta = ordinal_mes(fecha_fin.year, fecha_fin.month)
+            if datetime(fecha_fin.year, fecha_fin.month, 15) > fecha_fin:
+                hasta -= 1
+        
+        return desde, hasta
+    
+    except TypeError:
+        # Ej: datetime con zona horaria - mismo fallback que el cálculo original
+        return _ORDINAL_MIN, _ORDINAL_MAX
+
+
+def _construir_sumas_prefijo(intervalos, valores):
+    """
+    🆕 v6.4.1: Sumas de prefijo sobre los puntos de cambio de un conjunto de intervalos
+    
+    Args:
+        intervalos: lista de (desde, hasta) en ordinales de mes
+        valores: array (n_intervalos, n_series) con el aporte mensual de cada intervalo
+    
+    Returns:
+        tuple (puntos, acumulados, activos):
+        - puntos: ordinales ordenados donde cambia el total
+        - acumulados: (n_puntos, n_series) total vigente desde cada punto
+        - activos: cantidad de intervalos vigentes desde cada punto
+    """
+    n_series = valores.shape[1]
+    validos = [i for i, (desde, hasta) in enumerate(intervalos) if desde <= hasta]
+    if not validos:
+        return np.empty(0, dtype=np.int64), np.empty((0, n_series)), np.empty(0, dtype=np.int64)
+    
+    desde = np.array([intervalos[i][0] for i in validos], dtype=np.int64)
+    hasta_excl = np.array([intervalos[i][1] for i in validos], dtype=np.int64) + 1
+    aportes = valores[validos]
+    
+    # Eventos: +aporte al iniciar, -aporte al día siguiente de terminar
+    eventos = np.concatenate([desde, hasta_excl])
+    deltas = np.concatenate([aportes, -aportes])
+    deltas_activos = np.concatenate([np.ones(len(desde), dtype=np.int64),
+                                     -np.ones(len(desde), dtype=np.int64)])
+    
+    puntos, inverso = np.unique(eventos, return_inverse=True)
+    delta_por_punto = np.zeros((len(puntos), n_series))
+    np.add.at(delta_por_punto, inverso, deltas)
+    activos_por_punto = np.zeros(len(puntos), dtype=np.int64)
+    np.add.at(activos_por_punto, inverso, deltas_activos)
+    
+    acumulados = np.cumsum(delta_por_punto, axis=0)
+    activos = np.cumsum(activos_por_punto)
+    # Sin intervalos vigentes el total es exactamente 0 (evita residuos de redondeo)
+    acumulados[activos == 0] = 0.0
+    
+    return puntos, acumulados, activos
+
+
+def compilar_indice_cartera(contratos, cotizaciones):
+    """
+    🆕 v6.4.1: Compila contratos y cotizaciones a un índice de intervalos
+    
+    Args:
+        contratos: lista de dicts (formato de contratos_manuales)
+        cotizaciones: lista de dicts (formato de cotizaciones_manuales)
+    
+    Returns:
+        dict con puntos y sumas de prefijo para:
+        - contratos: [revenue (tarifa_mensual_total), costos (costos_operativos_mensuales)]
+        - cotizaciones: [revenue (tarifa × probabilidad × 50%)]
+    """
+    contratos_activos = [c for c in (contratos or []) if c.get('estado') == 'Activo']
+    cotizaciones = list(cotizaciones or [])
+    
+    intervalos_c = [_vigencia_a_ordinales(*_parsear_vigencia_contrato(c)) for c in contratos_activos]
+    valores_c = np.array([
+        [c.get('tarifa_mensual_total', 0), c.get('costos_operativos_mensuales', 0)]
+        for c in contratos_activos
+    ], dtype=float).reshape(-1, 2)
+    
+    intervalos_q = [_vigencia_a_ordinales(*_parsear_vigencia_cotizacion(q)) for q in cotizaciones]
+    valores_q = np.array([
+        [q.get('tarifa_total', 0) * (q.get('probabilidad_cierre', 50) / 100) * 0.5]
+        for q in cotizaciones
+    ], dtype=float).reshape(-1, 1)
+    
+    puntos_c, acumulados_c, _ = _construir_sumas_prefijo(intervalos_c, valores_c)
+    puntos_q, acumulados_q, _ = _construir_sumas_prefijo(intervalos_q, valores_q)
+    
+    return {
+        'puntos_contratos': puntos_c,
+        'acumulados_contratos': acumulados_c,
+        'puntos_cotizaciones': puntos_q,
+        'acumulados_cotizaciones': acumulados_q,
+        'n_contratos': len(contratos_activos),
+        'n_cotizaciones': len(cotizaciones),
+        # 🆕 v6.5.0: Detalle por cotización para simulación Monte Carlo (cierre Bernoulli)
+        'cotizaciones_desde': np.array([i[0] for i in intervalos_q], dtype=np.int64),
+        'cotizaciones_hasta': np.array([i[1] for i in intervalos_q], dtype=np.int64),
+        'cotizaciones_valor_cierre': np.array([q.get('tarifa_total', 0) * 0.5 for q in cotizaciones], dtype=float),
+        'cotizaciones_probabilidad': np.array([q.get('probabilidad_cierre', 50) / 100 for q in cotizaciones], dtype=float)
+    }
+
+
+def _consultar_prefijos(puntos, acumulados, ordinales):
+    """🆕 v6.4.1: Total vigente en cada ordinal (búsqueda binaria vectorizada)"""
+    if len(puntos) == 0:
+        return np.zeros((len(ordinales), acumulados.shape[1]))
+    posiciones = np.searchsorted(puntos, ordinales, side='right') - 1
+    totales = acumulados[np.maximum(posiciones, 0)]
+    totales[posiciones < 0] = 0.0
+    return totales
+
+
+def consultar_indice_cartera(indice, ordinales):
+    """
+    🆕 v6.4.1: Revenue y costos de la cartera vigente para uno o varios meses
+    
+    Args:
+        indice: dict de compilar_indice_cartera()
+        ordinales: array de ordinales de mes (ver ordinal_mes())
+    
+    Returns:
+        tuple (revenue_contratos, costos_contratos, revenue_cotizaciones) - arrays por mes
+    """
+    ordinales = np.atleast_1d(np.asarray(ordinales, dtype=np.int64))
+    contratos = _consultar_prefijos(indice['puntos_contratos'], indice['acumulados_contratos'], ordinales)
+    cotizaciones = _consultar_prefijos(indice['puntos_cotizaciones'], indice['acumulados_cotizaciones'], ordinales)
+    return contratos[:, 0], contratos[:, 1], cotizaciones[:, 0]
+
+
+def calcular_revenue_equipos_50pct(equipos_disponibles, tarifas_por_tipo):
+    """
+    Revenue del 50% de equipos disponibles (no depende del mes)
+    
+    Args:
+        equipos_disponibles: lista de dicts con clave 'tipo'
+        tarifas_por_tipo: dict {tipo_equipo: tarifa_mensual}
+    
+    Returns:
+        float con el 50% del revenue mensual potencial
+    """
+    revenue_equipos_disponibles = 0
+    for equipo in equipos_disponibles or []:
+        tarifa_mensual = tarifas_por_tipo.get(equipo['tipo'], 0)
+        if tarifa_mensual > 0:
+            revenue_equipos_disponibles += tarifa_mensual
+    return revenue_equipos_disponibles * 0.5
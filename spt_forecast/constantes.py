@@ -0,0 +1,29 @@
+"""
+Constantes del motor de proyecciones - v7.0.0
+=============================================
+
+Escenarios, tasas de crecimiento y componentes de revenue adicional compartidos
+por el dashboard, los jobs batch y el módulo Odoo.
+"""
+
+ESCENARIOS = ['Conservador', 'Moderado', 'Optimista']
+
+# Tasas de crecimiento mensual por escenario
+TASAS_CRECIMIENTO = {
+    'Conservador': 0.01,  # 1% mensual
+    'Moderado': 0.02,     # 2% mensual
+    'Optimista': 0.03     # 3% mensual
+}
+
+# Componentes de revenue adicional incluidos en cada escenario:
+# (contratos vigentes, 50% cotizaciones vigentes, 50% equipos disponibles)
+COMPONENTES_ESCENARIO = {
+    'Conservador': (0.0, 0.0, 0.0),
+    'Moderado': (1.0, 1.0, 0.0),
+    'Optimista': (1.0, 1.0, 1.0)
+}
+
+MESES_NOMBRES = ['Enero', 'Febrero', 'Marzo', 'Abril', 'Mayo', 'Junio',
+                 'Julio', 'Agosto', 'Septiembre', 'Octubre', 'Noviembre', 'Diciembre']
+MESES_ABREV = ['Ene', 'Feb', 'Mar', 'Abr', 'May', 'Jun',
+               'Jul', 'Ago', 'Sep', 'Oct', 'Nov', 'Dic']
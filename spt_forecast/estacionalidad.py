@@ -0,0 +1,319 @@
+"""
+Almacén persistente de factores estacionales - v7.2.0
+=====================================================
+
+Antes, cada ingesta recalculaba seasonal_factors y seasonal_by_year recorriendo
+todo df_completo. El almacén guarda solo estadísticos suficientes por mes:
+
+  - 'meses': {'YYYY-MM': {'suma', 'conteo'}} → aporte de cada mes incorporado
+  - 'aportes_por_mes': 12 índices {'YYYY': {'suma', 'conteo'}}, uno por mes
+    calendario (Ene..Dic), con los mismos aportes agrupados
+  - 'suma_mes' / 'conteo_mes': 12 acumulados por mes calendario
+  - 'totales_anuales': {'YYYY': [12 totales o None]} → vectores por año
+  - 'archivos': SHA-256 de los archivos fuente de la última actualización
+
+Incorporar, reemplazar o retirar un mes cuesta O(años): el acumulado de su mes
+calendario se rehace desde su índice, y los factores se derivan en O(12). Cada cambio incrementa
+'version' y deja en 'historial' la huella de los factores resultantes, de modo
+que una proyección puede registrar con qué versión se calculó.
+
+Misma metodología que procesar_archivos_reales() (v6.0.7 / v5.0.4):
+  - factor_mes = promedio de filas del mes / promedio de los 12 meses
+  - seasonal_by_year: solo años con 12 meses, total_mes / promedio anual
+
+Un almacén corresponde a una fuente de datos estable (clave_fuente(), ej: la
+empresa), no a un juego de archivos: al subir un libro con un mes nuevo se
+actualiza el mismo almacén y sube su versión. Los SHA-256 por archivo solo
+sirven para omitir la actualización si ningún archivo cambió. Con
+reemplazar=True, los meses que ya no vienen en la fuente se retiran en vez de
+mezclarse. En disco (opcional), un archivo por fuente;
+actualizar_almacen_en_disco() hace cargar → actualizar → guardar bajo un
+bloqueo (hilos del proceso + flock del archivo cuando existe fcntl).
+"""
+
+import copy
+import hashlib
+import json
+import re
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows: solo bloqueo entre hilos
+    fcntl = None
+
+from spt_forecast.constantes import MESES_NOMBRES
+from spt_forecast.registro import obtener_logger
+
+logger = obtener_logger('estacionalidad')
+
+FORMATO_ALMACEN = 2  # Incrementar si cambia la estructura del JSON
+
+MAX_HISTORIAL_VERSIONES = 50
+
+_bloqueo_almacenes = threading.Lock()
+
+
+def crear_almacen_estacional():
+    """Almacén vacío (versión 0)"""
+    return {
+        'formato': FORMATO_ALMACEN,
+        'version': 0,
+        'meses': {},
+        'aportes_por_mes': [{} for _ in range(12)],
+        'suma_mes': [0.0] * 12,
+        'conteo_mes': [0] * 12,
+        'totales_anuales': {},
+        'archivos': [],
+        'historial': []
+    }
+
+
+def resumir_meses(df_completo, columna='Accrual Revenue'):
+    """
+    Suma y conteo (valores no nulos) por año-mes de las filas de Utilization
+
+    Returns:
+        DataFrame con Year, Month, suma, conteo
+    """
+    resumen = df_completo.groupby(['Year', 'Month'])[columna].agg(['sum', 'count']).reset_index()
+    return resumen.rename(columns={'sum': 'suma', 'count': 'conteo'})
+
+
+def _recalcular_mes_calendario(almacen, mes):
+    """
+    Rehace el acumulado de un mes calendario desde su índice (un aporte por
+    año): O(años), sin arrastrar error de restar/sumar flotantes
+    """
+    aportes = almacen['aportes_por_mes'][mes - 1].values()
+    almacen['suma_mes'][mes - 1] = sum(aporte['suma'] for aporte in aportes)
+    almacen['conteo_mes'][mes - 1] = sum(aporte['conteo'] for aporte in aportes)
+
+
+def incorporar_mes(almacen, ano, mes, suma, conteo):
+    """
+    Agrega o reemplaza el aporte de un mes (modifica el almacén en sitio)
+
+    Returns:
+        bool: True si el almacén cambió
+    """
+    ano, mes, suma, conteo = int(ano), int(mes), float(suma), int(conteo)
+    clave = f'{ano:04d}-{mes:02d}'
+    if almacen['meses'].get(clave) == {'suma': suma, 'conteo': conteo}:
+        return False
+
+    aporte = {'suma': suma, 'conteo': conteo}
+    almacen['meses'][clave] = aporte
+    almacen['aportes_por_mes'][mes - 1][f'{ano:04d}'] = aporte
+    _recalcular_mes_calendario(almacen, mes)
+
+    totales = almacen['totales_anuales'].setdefault(str(ano), [None] * 12)
+    totales[mes - 1] = suma
+    return True
+
+
+def retirar_mes(almacen, clave):
+    """
+    Quita el aporte de un mes 'YYYY-MM' (modifica el almacén en sitio)
+
+    Returns:
+        bool: True si el almacén cambió
+    """
+    if almacen['meses'].pop(clave, None) is None:
+        return False
+    ano, mes = clave.split('-')
+    mes = int(mes)
+    almacen['aportes_por_mes'][mes - 1].pop(ano, None)
+    _recalcular_mes_calendario(almacen, mes)
+
+    totales = almacen['totales_anuales'].get(ano)
+    if totales is not None:
+        totales[mes - 1] = None
+        if all(total is None for total in totales):
+            del almacen['totales_anuales'][ano]
+    return True
+
+
+def actualizar_almacen_estacional(almacen, resumen_mensual, reemplazar=False, hashes_archivos=None):
+    """
+    Incorpora los meses de resumen_mensual (ver resumir_meses()) a una copia del almacén
+
+    Solo cambia la versión si algún mes es nuevo, cambió su suma/conteo o
+    (con reemplazar=True) fue retirado por no estar en resumen_mensual.
+
+    Args:
+        reemplazar: el resumen es el dataset completo; los meses ausentes se retiran
+        hashes_archivos: SHA-256 de los archivos fuente; si coinciden con los de
+            la última actualización, se devuelve el almacén tal cual sin recorrer
+            el resumen
+
+    Returns:
+        tuple (almacen_nuevo, meses_actualizados)
+    """
+    if hashes_archivos is not None:
+        hashes_archivos = sorted(hashes_archivos)
+        if almacen and almacen.get('archivos') == hashes_archivos:
+            return almacen, 0
+
+    almacen = copy.deepcopy(almacen) if almacen else crear_almacen_estacional()
+    if hashes_archivos is not None:
+        almacen['archivos'] = hashes_archivos
+    meses_actualizados = 0
+    claves_resumen = set()
+    for ano, mes, suma, conteo in resumen_mensual[['Year', 'Month', 'suma', 'conteo']].itertuples(index=False):
+        claves_resumen.add(f'{int(ano):04d}-{int(mes):02d}')
+        if incorporar_mes(almacen, ano, mes, suma, conteo):
+            meses_actualizados += 1
+    if reemplazar:
+        for clave in [k for k in almacen['meses'] if k not in claves_resumen]:
+            if retirar_mes(almacen, clave):
+                meses_actualizados += 1
+
+    if meses_actualizados:
+        almacen['version'] += 1
+        almacen['historial'].append({
+            'version': almacen['version'],
+            'huella': huella_factores(calcular_factores_estacionales(almacen)),
+            'fecha': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            'meses': len(almacen['meses'])
+        })
+        del almacen['historial'][:-MAX_HISTORIAL_VERSIONES]
+    return almacen, meses_actualizados
+
+
+def calcular_factores_estacionales(almacen, minimo_meses=12):
+    """
+    Factores {nombre_mes: factor} en O(12)
+
+    Returns:
+        dict o None si hay menos de minimo_meses meses calendario con datos
+    """
+    promedios = {
+        mes: almacen['suma_mes'][mes - 1] / almacen['conteo_mes'][mes - 1]
+        for mes in range(1, 13)
+        if almacen['conteo_mes'][mes - 1] > 0
+    }
+    if len(promedios) < minimo_meses:
+        return None
+    promedio_global = sum(promedios.values()) / len(promedios)
+    return {
+        MESES_NOMBRES[mes - 1]: valor / promedio_global if promedio_global > 0 else 1.0
+        for mes, valor in promedios.items()
+    }
+
+
+def calcular_seasonal_by_year(almacen):
+    """
+    Factores por año {año: [12 factores]} de los años con los 12 meses
+    """
+    seasonal_by_year = {}
+    for ano, totales in sorted(almacen['totales_anuales'].items()):
+        if any(total is None for total in totales):
+            continue
+        promedio_anual = sum(totales) / 12
+        if promedio_anual:
+            seasonal_by_year[int(ano)] = [total / promedio_anual for total in totales]
+    return seasonal_by_year
+
+
+def huella_factores(seasonal_factors):
+    """Huella corta (SHA-256) de un dict de factores; None si no hay factores"""
+    if not seasonal_factors:
+        return None
+    serializado = json.dumps(sorted(seasonal_factors.items()), default=float)
+    return hashlib.sha256(serializado.encode()).hexdigest()[:12]
+
+
+def clave_fuente(nombre):
+    """
+    Clave estable de una fuente de datos (ej: 'SPT Colombia' → 'spt-colombia')
+
+    Sirve de nombre de archivo del almacén: solo minúsculas, dígitos y guiones.
+    """
+    clave = re.sub(r'[^a-z0-9]+', '-', str(nombre).strip().lower()).strip('-')
+    return clave or 'fuente'
+
+
+def version_de_factores(almacen, seasonal_factors):
+    """Versión del almacén que produjo estos factores (None si no está en el historial)"""
+    huella = huella_factores(seasonal_factors)
+    for entrada in reversed(almacen.get('historial', [])):
+        if entrada['huella'] == huella:
+            return entrada['version']
+    return None
+
+
+def cargar_almacen_estacional(ruta):
+    """
+    Lee el almacén desde JSON
+
+    Returns:
+        dict (almacén vacío si no existe, está corrupto o tiene otro formato)
+    """
+    ruta = Path(ruta)
+    if not ruta.exists():
+        return crear_almacen_estacional()
+    try:
+        with open(ruta, encoding='utf-8') as f:
+            almacen = json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning("Almacén estacional ilegible (%s): se reconstruye", e)
+        return crear_almacen_estacional()
+    if almacen.get('formato') != FORMATO_ALMACEN:
+        logger.warning("Almacén estacional con formato incompatible: se reconstruye")
+        return crear_almacen_estacional()
+    return almacen
+
+
+def guardar_almacen_estacional(almacen, ruta):
+    """Escribe el almacén de forma atómica (archivo temporal único + reemplazo)"""
+    ruta = Path(ruta)
+    ruta.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=ruta.parent, prefix=f'.{ruta.name}.',
+                                     suffix='.tmp', delete=False) as f:
+        json.dump(almacen, f, ensure_ascii=False, indent=2)
+    try:
+        os.replace(f.name, ruta)
+    except OSError:
+        os.unlink(f.name)
+        raise
+
+
+@contextmanager
+def _bloquear_almacen(ruta):
+    """Exclusión mutua de cargar → actualizar → guardar sobre un mismo archivo"""
+    with _bloqueo_almacenes:
+        if fcntl is None:
+            yield
+            return
+        ruta.parent.mkdir(parents=True, exist_ok=True)
+        with open(ruta.with_name(f'.{ruta.name}.lock'), 'w') as candado:
+            fcntl.flock(candado, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(candado, fcntl.LOCK_UN)
+
+
+def actualizar_almacen_en_disco(ruta, resumen_mensual, reemplazar=True, hashes_archivos=None):
+    """
+    Carga, actualiza (ver actualizar_almacen_estacional()) y guarda el almacén
+    de una fuente sin perder actualizaciones concurrentes
+
+    Returns:
+        tuple (almacen_nuevo, meses_actualizados)
+    """
+    ruta = Path(ruta)
+    with _bloquear_almacen(ruta):
+        almacen_previo = cargar_almacen_estacional(ruta)
+        almacen, meses_actualizados = actualizar_almacen_estacional(
+            almacen_previo, resumen_mensual, reemplazar=reemplazar, hashes_archivos=hashes_archivos
+        )
+        if meses_actualizados or almacen['archivos'] != almacen_previo['archivos']:
+            guardar_almacen_estacional(almacen, ruta)
+    return almacen, meses_actualizados
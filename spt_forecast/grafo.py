@@ -0,0 +1,166 @@
+"""
+Grafo de cálculos incrementales - v7.4.1
+========================================
+
+DAG pequeño de cálculos con nombre. Cada nodo es:
+
+  - una entrada: su valor se fija desde afuera con fijar_entrada(); la versión
+    sube solo si la huella del valor cambió
+  - un cálculo: funcion(*valores de sus dependencias), memoizado por la tupla
+    de versiones de sus dependencias; solo se recalcula (y sube su versión)
+    cuando alguna de ellas cambió
+
+Así, cambiar una entrada solo recalcula los nodos aguas abajo que se piden.
+Cada cálculo registra ejecuciones, aciertos de cache y tiempo (ms), para ver
+cuánto costó realmente un cambio.
+
+El grafo es un dict (puede guardarse en st.session_state). Las dependencias
+deben existir al definir un nodo, por lo que el grafo no puede tener ciclos.
+"""
+
+import hashlib
+import json
+import time
+
+
+def crear_grafo():
+    """Grafo vacío"""
+    return {
+        'nodos': {},         # nombre → {'funcion', 'dependencias'} (funcion None = entrada)
+        'valores': {},
+        'versiones': {},
+        'firmas': {},        # entrada: huella del valor; cálculo: versiones de dependencias
+        'estadisticas': {}
+    }
+
+
+def definir_entrada(grafo, nombre):
+    """Declara una entrada (su valor se fija con fijar_entrada())"""
+    grafo['nodos'][nombre] = {'funcion': None, 'dependencias': ()}
+
+
+def definir_nodo(grafo, nombre, funcion, dependencias=()):
+    """
+    Declara (o reemplaza) un cálculo funcion(*dependencias)
+
+    Raises:
+        ValueError: si una dependencia no existe o el reemplazo crearía un ciclo
+    """
+    dependencias = tuple(dependencias)
+    faltantes = [dep for dep in dependencias if dep not in grafo['nodos']]
+    if faltantes:
+        raise ValueError(f"Dependencias no definidas para '{nombre}': {faltantes}")
+    if nombre in grafo['nodos']:
+        ciclo = {nombre, *nodos_aguas_abajo(grafo, nombre)} & set(dependencias)
+        if ciclo:
+            raise ValueError(f"'{nombre}' no puede depender de {sorted(ciclo)}: crearía un ciclo")
+
+    grafo['nodos'][nombre] = {'funcion': funcion, 'dependencias': dependencias}
+    grafo['firmas'].pop(nombre, None)  # Obliga a recalcular con la nueva función
+
+
+def _huella_por_defecto(valor):
+    """Valor si es hashable; si no, SHA-256 de su JSON (TypeError si no es serializable)"""
+    try:
+        hash(valor)
+        return valor
+    except TypeError:
+        serializado = json.dumps(valor, sort_keys=True, default=float)
+        return hashlib.sha256(serializado.encode()).hexdigest()
+
+
+def fijar_entrada(grafo, nombre, valor, huella=None):
+    """
+    Fija el valor de una entrada
+
+    Args:
+        huella: identifica el valor (obligatoria para valores no serializables
+                a JSON, ej: DataFrames o arrays); default: el valor o su JSON
+
+    Returns:
+        bool: True si la versión cambió
+    """
+    if grafo['nodos'].get(nombre, {}).get('funcion', True) is not None:
+        raise ValueError(f"'{nombre}' no es una entrada del grafo")
+    huella = _huella_por_defecto(valor) if huella is None else huella
+    if nombre in grafo['versiones'] and grafo['firmas'][nombre] == huella:
+        return False
+    grafo['valores'][nombre] = valor
+    grafo['firmas'][nombre] = huella
+    grafo['versiones'][nombre] = grafo['versiones'].get(nombre, 0) + 1
+    return True
+
+
+def evaluar(grafo, nombre):
+    """
+    Valor de un nodo, recalculando solo lo que cambió aguas arriba
+
+    Raises:
+        ValueError: nodo desconocido o entrada sin valor
+    """
+    nodo = grafo['nodos'].get(nombre)
+    if nodo is None:
+        raise ValueError(f"Nodo desconocido: '{nombre}'")
+    if nodo['funcion'] is None:
+        if nombre not in grafo['versiones']:
+            raise ValueError(f"Entrada sin valor: '{nombre}'")
+        return grafo['valores'][nombre]
+
+    argumentos = [evaluar(grafo, dep) for dep in nodo['dependencias']]
+    firma = tuple(grafo['versiones'][dep] for dep in nodo['dependencias'])
+    estadisticas = grafo['estadisticas'].setdefault(
+        nombre, {'ejecuciones': 0, 'aciertos': 0, 'ultimo_ms': None, 'total_ms': 0.0}
+    )
+    if grafo['firmas'].get(nombre) == firma:
+        estadisticas['aciertos'] += 1
+        return grafo['valores'][nombre]
+
+    inicio = time.perf_counter()
+    valor = nodo['funcion'](*argumentos)
+    transcurrido_ms = (time.perf_counter() - inicio) * 1000
+
+    grafo['valores'][nombre] = valor
+    grafo['firmas'][nombre] = firma
+    grafo['versiones'][nombre] = grafo['versiones'].get(nombre, 0) + 1
+    estadisticas['ejecuciones'] += 1
+    estadisticas['ultimo_ms'] = transcurrido_ms
+    estadisticas['total_ms'] += transcurrido_ms
+    return valor
+
+
+def nodos_aguas_abajo(grafo, nombre):
+    """Nodos que dependen (directa o indirectamente) de 'nombre', en orden de definición"""
+    afectados = {nombre}
+    cambio = True
+    while cambio:  # Un nodo reemplazado puede depender de nodos definidos después
+        cambio = False
+        for otro, nodo in grafo['nodos'].items():
+            if otro not in afectados and afectados & set(nodo['dependencias']):
+                afectados.add(otro)
+                cambio = True
+    afectados.discard(nombre)
+    return [otro for otro in grafo['nodos'] if otro in afectados]
+
+
+def obtener_estadisticas_grafo(grafo):
+    """
+    Estadísticas por nodo de cálculo (en orden de definición)
+
+    Returns:
+        lista de dicts con nodo, dependencias, version, ejecuciones, aciertos,
+        ultimo_ms y total_ms
+    """
+    filas = []
+    for nombre, nodo in grafo['nodos'].items():
+        if nodo['funcion'] is None:
+            continue
+        estadisticas = grafo['estadisticas'].get(
+            nombre, {'ejecuciones': 0, 'aciertos': 0, 'ultimo_ms': None, 'total_ms': 0.0}
+        )
+        filas.append({
+            'nodo': nombre,
+            'dependencias': list(nodo['dependencias']),
+            'version': grafo['versiones'].get(nombre, 0),
+            **estadisticas
+        })
+    return filas
@@ -0,0 +1,153 @@
+"""
+Proyecciones diarias y semanales - v7.1.0
+=========================================
+
+Horizontes cortos (ej: 13 semanas) o largos (hasta 5 años) con resolución
+diaria o semanal, sobre el mismo motor mensual:
+
+  1. Se proyectan los meses calendario que cubre el horizonte
+     (generar_proyecciones_vectorizadas)
+  2. Revenue y egresos de cada mes se reparten por día (÷ días del mes)
+  3. Cobranza con rezago explícito: el revenue devengado un día se cobra
+     `dias_cobro` días después (pagos a 30 días). La cartera por cobrar al
+     inicio se cobra de forma uniforme durante los primeros `dias_cobro` días
+  4. Balance = efectivo inicial + suma acumulada de (cobros - egresos)
+
+El resultado se guarda como arrays (escenarios × períodos) en lugar de un
+DataFrame por escenario: a 1,800 días × 3 escenarios el cálculo completo son
+unas pocas operaciones NumPy.
+"""
+
+import numpy as np
+import pandas as pd
+
+from spt_forecast.constantes import ESCENARIOS
+from spt_forecast.proyecciones import calcular_calendario_proyeccion, generar_proyecciones_vectorizadas
+
+# Días por período según frecuencia
+FRECUENCIAS = {'D': 1, 'W': 7}
+
+DIAS_COBRO_DEFAULT = 30  # Pagos a 30 días
+
+
+def _dias_por_mes(primer_mes, n_meses):
+    """Días calendario de n_meses consecutivos desde primer_mes (datetime64[M])"""
+    meses = primer_mes + np.arange(n_meses + 1)
+    return np.diff(meses.astype('datetime64[D]')).astype(np.int64)
+
+
+def generar_proyecciones_diarias(revenue_base, financial_data, periodos, frecuencia='D',
+                                 escenarios=None, seasonal_factors=None, ultimo_mes_historico=None,
+                                 indice_cartera=None, revenue_equipos_50pct=None, ano_base=None,
+                                 efectivo_inicial=0.0, dias_cobro=DIAS_COBRO_DEFAULT,
+                                 cuentas_por_cobrar=None):
+    """
+    Proyección de flujo de caja por día o por semana con rezago de cobranza
+
+    El horizonte empieza el día 1 del primer mes proyectado (mismo calendario
+    que las proyecciones mensuales).
+
+    Args:
+        revenue_base: Revenue mensual base (solo equipos operando)
+        financial_data: Dict con gastos_fijos y tasa_costos_variables
+        periodos: Número de días ('D') o semanas ('W') a proyectar
+        frecuencia: 'D' (diaria) o 'W' (semanal)
+        escenarios: Lista de escenarios (default: los 3)
+        seasonal_factors, ultimo_mes_historico, indice_cartera,
+        revenue_equipos_50pct, ano_base: igual que generar_proyecciones_vectorizadas()
+        efectivo_inicial: Efectivo disponible al inicio
+        dias_cobro: Rezago entre devengo y cobro (0 = cobro inmediato)
+        cuentas_por_cobrar: Cartera por cobrar al inicio (default: revenue_base
+                            × dias_cobro / 30, es decir el revenue pendiente de cobro)
+
+    Returns:
+        dict con:
+        - 'fechas': datetime64[D] de inicio de cada período
+        - 'escenarios': lista de escenarios (orden de las filas)
+        - 'revenue', 'cobros', 'egresos_totales', 'flujo_neto': arrays
+          (escenarios × períodos) con los montos del período
+        - 'balance': array (escenarios × períodos) con el efectivo al cierre del período
+        - 'frecuencia', 'dias_cobro'
+    """
+    if frecuencia not in FRECUENCIAS:
+        raise ValueError(f"Frecuencia no soportada: {frecuencia} (usar 'D' o 'W')")
+
+    escenarios = list(escenarios or ESCENARIOS)
+    paso = FRECUENCIAS[frecuencia]
+    dias = periodos * paso
+
+    # 1. Calendario diario y meses que cubre
+    mes_numero, ano, _ = calcular_calendario_proyeccion(1, ultimo_mes_historico, ano_base)
+    primer_mes = np.datetime64(f'{int(ano[0]):04d}-{int(mes_numero[0]):02d}', 'M')
+    fechas = primer_mes.astype('datetime64[D]') + np.arange(dias)
+    indice_mes = (fechas.astype('datetime64[M]') - primer_mes).astype(np.int64)
+    n_meses = int(indice_mes[-1]) + 1 if dias > 0 else 0
+
+    proyecciones = generar_proyecciones_vectorizadas(
+        revenue_base,
+        financial_data,
+        n_meses,
+        escenarios=escenarios,
+        seasonal_factors=seasonal_factors,
+        ultimo_mes_historico=ultimo_mes_historico,
+        indice_cartera=indice_cartera,
+        revenue_equipos_50pct=revenue_equipos_50pct,
+        ano_base=ano_base
+    )
+    revenue_mes = np.vstack([proyecciones[e]['revenue'].to_numpy(dtype=float) for e in escenarios])
+    egresos_mes = np.vstack([proyecciones[e]['egresos_totales'].to_numpy(dtype=float) for e in escenarios])
+
+    # 2. Reparto diario (÷ días calendario de cada mes)
+    dias_mes = _dias_por_mes(primer_mes, n_meses)[indice_mes]
+    revenue = revenue_mes[:, indice_mes] / dias_mes
+    egresos = egresos_mes[:, indice_mes] / dias_mes
+
+    # 3. Cobranza con rezago: lo devengado el día t se cobra el día t + dias_cobro
+    if dias_cobro > 0:
+        if cuentas_por_cobrar is None:
+            cuentas_por_cobrar = revenue_base * dias_cobro / 30
+        cobro_inicial = np.full((len(escenarios), dias_cobro), cuentas_por_cobrar / dias_cobro)
+        cobros = np.concatenate([cobro_inicial, revenue], axis=1)[:, :dias]
+    else:
+        cobros = revenue
+
+    flujo_neto = cobros - egresos
+
+    # 4. Agregación semanal (sumas por bloques de 7 días)
+    if paso > 1:
+        forma = (len(escenarios), periodos, paso)
+        revenue = revenue.reshape(forma).sum(axis=2)
+        cobros = cobros.reshape(forma).sum(axis=2)
+        egresos = egresos.reshape(forma).sum(axis=2)
+        flujo_neto = flujo_neto.reshape(forma).sum(axis=2)
+        fechas = fechas[::paso]
+
+    return {
+        'fechas': fechas,
+        'escenarios': escenarios,
+        'revenue': revenue,
+        'cobros': cobros,
+        'egresos_totales': egresos,
+        'flujo_neto': flujo_neto,
+        'balance': efectivo_inicial + np.cumsum(flujo_neto, axis=1),
+        'frecuencia': frecuencia,
+        'dias_cobro': dias_cobro
+    }
+
+
+def proyeccion_diaria_a_dataframe(resultado, escenario):
+    """
+    Tabla de un escenario de generar_proyecciones_diarias()
+
+    Returns:
+        DataFrame con fecha, revenue, cobros, egresos_totales, flujo_neto, balance
+    """
+    fila = resultado['escenarios'].index(escenario)
+    return pd.DataFrame({
+        'fecha': resultado['fechas'],
+        'revenue': resultado['revenue'][fila],
+        'cobros': resultado['cobros'][fila],
+        'egresos_totales': resultado['egresos_totales'][fila],
+        'flujo_neto': resultado['flujo_neto'][fila],
+        'balance': resultado['balance'][fila]
+    })
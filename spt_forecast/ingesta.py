@@ -0,0 +1,316 @@
+"""
+Ingesta de workbooks Excel - v6.3.3
+===================================
+
+Lectura de los workbooks cargados (Utilization Reports, Weekly Report e
+Informe Financiero) a partir de sus bytes. Vive fuera de dashboard.py para que
+los workers de ProcessPoolExecutor puedan importarla sin ejecutar la UI.
+
+El parseo con openpyxl es CPU-bound: con 5 archivos independientes, repartirlos
+entre procesos reduce el tiempo total aproximadamente al del archivo más lento.
+
+v7.0.1: También incluye el procesamiento de los Utilization Reports ya leídos
+(procesar_utilization_dataframes) para poder medirlo y usarlo sin Streamlit.
+
+v7.2.0: Suma y conteo por año-mes en una sola agrupación (resumen_mensual),
+de la que salen el revenue mensual, la estacionalidad y el almacén estacional.
+
+v7.5.2: Resumen por archivo memoizado por SHA-256: una nueva carga solo
+recorre las filas de los archivos que cambiaron y combina los resúmenes.
+"""
+
+import multiprocessing
+import os
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from io import BytesIO
+
+import pandas as pd
+
+from spt_forecast.estacionalidad import resumir_meses
+
+
+def leer_workbook(contenido, sheet_name=0, header=0):
+    """
+    Parsea un workbook Excel desde sus bytes
+
+    Args:
+        contenido: bytes del archivo .xlsx/.xls
+        sheet_name: hoja a leer (índice o nombre)
+        header: fila de encabezados
+
+    Returns:
+        DataFrame con la hoja solicitada
+    """
+    return pd.read_excel(BytesIO(contenido), sheet_name=sheet_name, header=header)
+
+
+def _tarea_lectura(clave, contenido, sheet_name, header):
+    """
+    Tarea ejecutada en el proceso worker. Nunca lanza excepciones: el error se
+    retorna como texto para reportarlo por archivo en el proceso principal.
+    """
+    try:
+        return clave, leer_workbook(contenido, sheet_name, header), None
+    except Exception as e:
+        return clave, None, f"{type(e).__name__}: {e}"
+
+
+def parsear_workbooks_en_paralelo(trabajos, max_workers=None):
+    """
+    Parsea varios workbooks en paralelo con un pool de procesos
+
+    Se usa el contexto 'spawn' (no 'fork'): el servidor de Streamlit es
+    multi-hilo y hacer fork de un proceso con hilos activos puede bloquearse.
+
+    Args:
+        trabajos: dict {clave: {'contenido': bytes, 'sheet_name': ..., 'header': ...}}
+        max_workers: procesos máximos (default: min(n_trabajos, núcleos))
+
+    Returns:
+        tuple (resultados, errores)
+        - resultados: dict {clave: DataFrame} de los archivos leídos
+        - errores: dict {clave: mensaje} de los archivos que fallaron
+    """
+    resultados = {}
+    errores = {}
+
+    if not trabajos:
+        return resultados, errores
+
+    if max_workers is None:
+        max_workers = min(len(trabajos), os.cpu_count() or 1)
+
+    contexto = multiprocessing.get_context('spawn')
+    try:
+        with ProcessPoolExecutor(max_workers=max_workers, mp_context=contexto) as pool:
+            futuros = [
+                pool.submit(
+                    _tarea_lectura,
+                    clave,
+                    trabajo['contenido'],
+                    trabajo.get('sheet_name', 0),
+                    trabajo.get('header', 0)
+                )
+                for clave, trabajo in trabajos.items()
+            ]
+            for futuro in as_completed(futuros):
+                clave, df, error = futuro.result()
+                if error is None:
+                    resultados[clave] = df
+                else:
+                    errores[clave] = error
+    except BrokenProcessPool as e:
+        # Un worker murió (ej: memoria): los archivos pendientes se reportan como fallidos
+        for clave in trabajos:
+            if clave not in resultados and clave not in errores:
+                errores[clave] = f"Pool de procesos interrumpido: {e}"
+
+    return resultados, errores
+
+
+
+# =============================================================================
+# Vistas derivadas y métricas de Utilization Reports (sobre DataFrames ya leídos)
+# =============================================================================
+
+ESTADOS_EQUIPO_DISPONIBLE = ['Available', 'StandBy', 'Backup']
+
+
+def construir_clientes_desde_df(dataframes):
+    """
+    🆕 v6.3.1: Extrae el set de clientes únicos (nombres limpios) de uno o
+    más DataFrames de Utilization Report
+
+    Returns:
+        Set de strings con nombres de clientes
+    """
+    clientes_set = set()
+    for df in dataframes:
+        if df is not None and 'Client' in df.columns:
+            clientes_set.update(df['Client'].dropna().unique())
+    return {str(c).strip() for c in clientes_set if c and str(c) != 'nan'}
+
+
+def construir_tarifas_desde_df(df_util):
+    """
+    🆕 v6.3.1: Calcula la tarifa promedio (Rental Rate) por tipo de equipo
+
+    Returns:
+        Dict con {tipo_equipo: tarifa_promedio} (solo tarifas > 0)
+    """
+    tarifas_dict = {}
+    if df_util is None or 'Equipment' not in df_util.columns or 'Rental Rate' not in df_util.columns:
+        return tarifas_dict
+
+    # Serie derivada (el DataFrame cacheado es compartido, no se modifica)
+    rental_rate = pd.to_numeric(df_util['Rental Rate'], errors='coerce')
+    tarifas_promedio = rental_rate.groupby(df_util['Equipment']).mean()
+
+    for equipo, tarifa in tarifas_promedio.items():
+        if pd.notna(tarifa) and tarifa > 0:
+            tarifas_dict[str(equipo).strip()] = round(tarifa, 2)
+    return tarifas_dict
+
+
+def construir_equipos_disponibles_desde_df(df_weekly):
+    """
+    🆕 v6.3.1: Construye la lista de equipos disponibles (Available/StandBy/Backup)
+    con el formato usado por los dropdowns de contratos
+
+    Returns:
+        Lista de dicts con {serial, tipo, estado, display}
+    """
+    equipos_lista = []
+    required_cols = ['Equipment', 'Serial Number', 'Status']
+    if df_weekly is None or not all(col in df_weekly.columns for col in required_cols):
+        return equipos_lista
+
+    df_disponibles = df_weekly[df_weekly['Status'].isin(ESTADOS_EQUIPO_DISPONIBLE)]
+    seriales = df_disponibles['Serial Number'].astype(str).str.strip()
+    tipos = df_disponibles['Equipment'].astype(str).str.strip()
+    estados = df_disponibles['Status'].astype(str).str.strip()
+
+    for serial, tipo, estado in zip(seriales, tipos, estados):
+        # Validar que no sean valores nulos
+        if serial and tipo and serial != 'nan' and tipo != 'nan':
+            equipos_lista.append({
+                'serial': serial,
+                'tipo': tipo,
+                'estado': estado,
+                'display': f"{serial} - {tipo} ({estado})"
+            })
+    return equipos_lista
+
+
+MAX_ENTRADAS_CACHE_RESUMENES = 16
+_cache_resumenes = OrderedDict()
+
+
+def normalizar_utilization_df(df_util):
+    """
+    Copia de un Utilization Report con columnas limpias, Date como datetime,
+    Year/Month derivados y Accrual Revenue numérico
+    """
+    df = df_util.copy()
+    df.columns = df.columns.str.strip()
+    df['Date'] = pd.to_datetime(df['Date'])
+    df['Year'] = df['Date'].dt.year
+    df['Month'] = df['Date'].dt.month
+    df['Accrual Revenue'] = pd.to_numeric(df['Accrual Revenue'], errors='coerce')
+    return df
+
+
+def combinar_utilization_dataframes(dataframes):
+    """
+    Filas consolidadas (normalizadas) de los Utilization Reports
+
+    Recorre todas las filas: solo para quien necesita el detalle (snapshots
+    Parquet, depuración), no en cada ingesta.
+    """
+    return normalizar_utilization_df(pd.concat(list(dataframes), ignore_index=True))
+
+
+def resumir_utilization_df(df_util):
+    """
+    Resumen de un solo Utilization Report (la única pasada sobre sus filas)
+
+    Returns:
+        dict con resumen_mensual (Year, Month, suma, conteo), revenue por
+        (Date, Client) para el top de clientes y el set de clientes
+    """
+    df = normalizar_utilization_df(df_util)
+    revenue_cliente = (
+        df.groupby(['Date', 'Client'])['Accrual Revenue'].sum().reset_index()
+        if 'Client' in df.columns
+        else pd.DataFrame(columns=['Date', 'Client', 'Accrual Revenue'])
+    )
+    return {
+        'resumen_mensual': resumir_meses(df),
+        'revenue_cliente': revenue_cliente,
+        'fecha_max': df['Date'].max(),
+        'clientes': construir_clientes_desde_df([df_util])
+    }
+
+
+def _resumen_cacheado(df_util, huella):
+    """Resumen de un archivo, memoizado por su SHA-256 (LRU); sin huella no se cachea"""
+    if huella is None:
+        return resumir_utilization_df(df_util)
+    if huella in _cache_resumenes:
+        _cache_resumenes.move_to_end(huella)
+        return _cache_resumenes[huella]
+    resumen = resumir_utilization_df(df_util)
+    _cache_resumenes[huella] = resumen
+    while len(_cache_resumenes) > MAX_ENTRADAS_CACHE_RESUMENES:
+        _cache_resumenes.popitem(last=False)
+    return resumen
+
+
+def procesar_utilization_dataframes(df_2023, df_2024, df_2025, huellas=None):
+    """
+    Métricas de los 3 Utilization Reports ya leídos
+
+    Cada archivo se resume una sola vez (resumir_utilization_df()); con
+    huellas (SHA-256 por archivo) el resumen se reutiliza mientras el archivo
+    no cambie, de modo que al subir un libro nuevo solo se recorren sus filas.
+    Las métricas se combinan desde los resúmenes (pocas filas por mes), sin
+    concatenar el histórico completo.
+
+    Los DataFrames de entrada no se modifican (pueden venir del cache de
+    lectura compartido).
+
+    Args:
+        huellas: SHA-256 de (2023, 2024, 2025); None = sin cache de resúmenes
+
+    Returns:
+        dict con revenue mensual, resumen mensual (suma/conteo), clientes,
+        estacionalidad, tarifas por equipo y los DataFrames de entrada
+        ('dataframes', para combinar_utilization_dataframes())
+    """
+    dataframes = [df_2023, df_2024, df_2025]
+    huellas = huellas or [None] * len(dataframes)
+    resumenes = [_resumen_cacheado(df, huella) for df, huella in zip(dataframes, huellas)]
+
+    # 1. Revenue mensual total (suma y conteo por año-mes de los 3 resúmenes)
+    resumen_mensual = (
+        pd.concat([r['resumen_mensual'] for r in resumenes], ignore_index=True)
+        .groupby(['Year', 'Month'], as_index=False)[['suma', 'conteo']].sum()
+    )
+    revenue_mensual = resumen_mensual[['Year', 'Month', 'suma']].rename(columns={'suma': 'Accrual Revenue'})
+    revenue_mensual['Year-Month'] = revenue_mensual['Year'].astype(str) + '-' + revenue_mensual['Month'].astype(str).str.zfill(2)
+
+    # 2. Revenue promedio
+    revenue_promedio = revenue_mensual['Accrual Revenue'].mean()
+
+    # 3. Top clientes (últimos 12 meses) desde el revenue por (Date, Client)
+    revenue_cliente = pd.concat([r['revenue_cliente'] for r in resumenes], ignore_index=True)
+    fecha_max = max((r['fecha_max'] for r in resumenes if pd.notna(r['fecha_max'])), default=pd.NaT)
+    df_recent = revenue_cliente[revenue_cliente['Date'] >= fecha_max - pd.DateOffset(months=12)]
+    top_clientes = df_recent.groupby('Client')['Accrual Revenue'].sum().sort_values(ascending=False).head(10)
+
+    # 4. Estacionalidad (promedio por mes del año) desde el resumen
+    por_mes = resumen_mensual.groupby('Month')[['suma', 'conteo']].sum()
+    estacionalidad = por_mes['suma'] / por_mes['conteo']
+
+    # 5. Revenue por año
+    revenue_anual = resumen_mensual.groupby('Year')['suma'].sum()
+
+    # 6. Clientes únicos de los 3 años
+    clientes = set().union(*(r['clientes'] for r in resumenes))
+
+    # 7. Tarifas promedio por tipo de equipo (archivo 2025, el más reciente)
+    tarifas_equipos = construir_tarifas_desde_df(df_2025)
+
+    return {
+        'revenue_mensual': revenue_mensual,
+        'resumen_mensual': resumen_mensual,
+        'revenue_promedio': revenue_promedio,
+        'top_clientes': top_clientes.to_dict(),
+        'estacionalidad': estacionalidad.to_dict(),
+        'revenue_anual': revenue_anual.to_dict(),
+        'dataframes': dataframes,
+        'clientes': sorted(clientes),
+        'tarifas_equipos': tarifas_equipos
+    }
@@ -0,0 +1,185 @@
+"""
+API de proyección sin Streamlit - v7.0.0
+========================================
+
+Punto de entrada único para jobs batch, el módulo Odoo y los benchmarks:
+recibe entradas explícitas (histórico, parámetros financieros, cartera,
+equipos) y retorna las mismas tablas que muestra el dashboard.
+
+Ejemplo:
+    from spt_forecast.motor import proyectar_flujo_caja
+
+    resultado = proyectar_flujo_caja(
+        revenue_base=127467.51,
+        financial_data={'gastos_fijos': 65732, 'tasa_costos_variables': 0.0962},
+        meses=6,
+        efectivo_inicial=80000,
+        contratos=contratos,
+        cotizaciones=cotizaciones
+    )
+    resultado['proyecciones']['Moderado']
+
+v7.4.1: Los cálculos forman un grafo incremental (spt_forecast.grafo):
+
+    entradas (ingesta, factores estacionales, cartera, parámetros)
+      → proyecciones (revenue por escenario, egresos y flujo neto)
+      → balances / necesidades / excedentes / transferencias
+      → recomendaciones
+
+crear_grafo_flujo_caja() lo arma para quien mantiene el grafo entre llamadas
+(ej: el dashboard): cambiar efectivo_inicial no recalcula proyecciones y
+cambiar meses_colchon solo recalcula necesidades, excedentes y recomendaciones.
+"""
+
+from spt_forecast.balance import (
+    calcular_excedentes_invertibles,
+    calcular_necesidades_excedentes_mejorado,
+    calcular_transferencias_con_balance,
+    generar_balance_multi_escenario,
+    generar_recomendaciones_inversion,
+)
+from spt_forecast.cartera import calcular_revenue_equipos_50pct, compilar_indice_cartera
+from spt_forecast.constantes import ESCENARIOS
+from spt_forecast.grafo import crear_grafo, definir_entrada, definir_nodo, evaluar, fijar_entrada
+from spt_forecast.proyecciones import generar_proyecciones_vectorizadas
+
+ENTRADAS_GRAFO_FLUJO_CAJA = (
+    'revenue_base', 'financial_data', 'seasonal_factors', 'ultimo_mes_historico', 'ano_base',
+    'indice_cartera', 'revenue_equipos_50pct', 'meses', 'escenarios',
+    'efectivo_inicial', 'meses_colchon', 'dias_liquidacion', 'rentabilidad_estimada'
+)
+
+
+def _proyectar(revenue_base, financial_data, meses, escenarios, seasonal_factors,
+               ultimo_mes_historico, indice_cartera, revenue_equipos_50pct, ano_base):
+    return generar_proyecciones_vectorizadas(
+        revenue_base,
+        financial_data,
+        meses,
+        escenarios=escenarios,
+        seasonal_factors=seasonal_factors,
+        ultimo_mes_historico=ultimo_mes_historico,
+        indice_cartera=indice_cartera,
+        revenue_equipos_50pct=revenue_equipos_50pct,
+        ano_base=ano_base
+    )
+
+
+def _necesidades(efectivo_inicial, proyecciones, financial_data, meses_colchon):
+    return {
+        escenario: calcular_necesidades_excedentes_mejorado(efectivo_inicial, df_proj, financial_data, meses_colchon)
+        for escenario, df_proj in proyecciones.items()
+    }
+
+
+def _excedentes(proyecciones, efectivo_inicial, financial_data, meses_colchon, dias_liquidacion):
+    return {
+        escenario: calcular_excedentes_invertibles(
+            df_proj, efectivo_inicial, financial_data, meses_colchon, dias_liquidacion
+        )
+        for escenario, df_proj in proyecciones.items()
+    }
+
+
+def _transferencias(proyecciones, efectivo_inicial, meses):
+    return {
+        escenario: calcular_transferencias_con_balance(df_proj, efectivo_inicial, meses)
+        for escenario, df_proj in proyecciones.items()
+    }
+
+
+def _recomendaciones(excedentes, rentabilidad_estimada):
+    return {
+        escenario: generar_recomendaciones_inversion(df_exc, rentabilidad_estimada)
+        for escenario, df_exc in excedentes.items()
+    }
+
+
+def crear_grafo_flujo_caja():
+    """
+    🆕 v7.4.1: Grafo incremental de la proyección de flujo de caja
+
+    Entradas: ENTRADAS_GRAFO_FLUJO_CAJA (fijar con spt_forecast.grafo.fijar_entrada;
+    'indice_cartera' requiere huella explícita). Nodos: 'proyecciones', 'balances',
+    'necesidades', 'excedentes', 'transferencias' y 'recomendaciones', cada uno
+    un dict {escenario: resultado}.
+
+    Returns:
+        dict del grafo (ver spt_forecast.grafo)
+    """
+    grafo = crear_grafo()
+    for entrada in ENTRADAS_GRAFO_FLUJO_CAJA:
+        definir_entrada(grafo, entrada)
+
+    definir_nodo(grafo, 'proyecciones', _proyectar, (
+        'revenue_base', 'financial_data', 'meses', 'escenarios', 'seasonal_factors',
+        'ultimo_mes_historico', 'indice_cartera', 'revenue_equipos_50pct', 'ano_base'
+    ))
+    definir_nodo(grafo, 'balances', generar_balance_multi_escenario, ('meses', 'efectivo_inicial', 'proyecciones'))
+    definir_nodo(grafo, 'necesidades', _necesidades,
+                 ('efectivo_inicial', 'proyecciones', 'financial_data', 'meses_colchon'))
+    definir_nodo(grafo, 'excedentes', _excedentes,
+                 ('proyecciones', 'efectivo_inicial', 'financial_data', 'meses_colchon', 'dias_liquidacion'))
+    definir_nodo(grafo, 'transferencias', _transferencias, ('proyecciones', 'efectivo_inicial', 'meses'))
+    definir_nodo(grafo, 'recomendaciones', _recomendaciones, ('excedentes', 'rentabilidad_estimada'))
+    return grafo
+
+
+def proyectar_flujo_caja(revenue_base, financial_data, meses, efectivo_inicial,
+                         contratos=None, cotizaciones=None, equipos_disponibles=None,
+                         tarifas_por_tipo=None, seasonal_factors=None,
+                         ultimo_mes_historico=None, ano_base=None, escenarios=None,
+                         meses_colchon=2, dias_liquidacion=30, rentabilidad_estimada=0.10):
+    """
+    Proyección completa de flujo de caja para varios escenarios
+
+    Args:
+        revenue_base: Revenue mensual base (solo equipos operando)
+        financial_data: Dict con gastos_fijos y tasa_costos_variables
+        meses: Número de meses a proyectar
+        efectivo_inicial: Efectivo disponible al inicio
+        contratos: Lista de contratos (formato de contratos_manuales)
+        cotizaciones: Lista de cotizaciones (formato de cotizaciones_manuales)
+        equipos_disponibles: Lista de dicts con 'tipo' (equipos Standby/Backup)
+        tarifas_por_tipo: Dict {tipo_equipo: tarifa_mensual}
+        seasonal_factors: Dict opcional {nombre_mes: factor}
+        ultimo_mes_historico: Último mes histórico (1-12) o None (mes actual)
+        ano_base: Año base de la proyección (default: año actual)
+        escenarios: Lista de escenarios (default: los 3)
+        meses_colchon: Meses de burn rate a mantener como colchón
+        dias_liquidacion: Días de anticipación para liquidar inversiones
+        rentabilidad_estimada: Rentabilidad anual para recomendaciones de inversión
+
+    Returns:
+        dict con, por escenario:
+        - 'proyecciones': DataFrame de generar_proyecciones_vectorizadas()
+        - 'balances': DataFrame de generar_balance_multi_escenario()
+        - 'excedentes': DataFrame de calcular_excedentes_invertibles()
+        - 'recomendaciones': DataFrame de generar_recomendaciones_inversion()
+        - 'transferencias': dict de calcular_transferencias_con_balance()
+    """
+    indice_cartera = compilar_indice_cartera(contratos or [], cotizaciones or [])
+    revenue_equipos_50pct = calcular_revenue_equipos_50pct(equipos_disponibles, tarifas_por_tipo or {})
+
+    grafo = crear_grafo_flujo_caja()
+    fijar_entrada(grafo, 'indice_cartera', indice_cartera, huella=id(indice_cartera))
+    for nombre, valor in {
+        'revenue_base': revenue_base,
+        'financial_data': financial_data,
+        'seasonal_factors': seasonal_factors,
+        'ultimo_mes_historico': ultimo_mes_historico,
+        'ano_base': ano_base,
+        'revenue_equipos_50pct': revenue_equipos_50pct,
+        'meses': meses,
+        'escenarios': list(escenarios or ESCENARIOS),
+        'efectivo_inicial': efectivo_inicial,
+        'meses_colchon': meses_colchon,
+        'dias_liquidacion': dias_liquidacion,
+        'rentabilidad_estimada': rentabilidad_estimada
+    }.items():
+        fijar_entrada(grafo, nombre, valor)
+
+    return {
+        nodo: evaluar(grafo, nodo)
+        for nodo in ('proyecciones', 'balances', 'excedentes', 'recomendaciones', 'transferencias')
+    }
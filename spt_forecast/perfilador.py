@@ -0,0 +1,240 @@
+"""
+Perfilador por rerun - v7.5.0
+=============================
+
+Mide, en cada rerun del dashboard (o en cualquier job), tiempo de pared,
+número de llamadas y memoria asignada de:
+
+  - secciones con nombre:  with medir_seccion('pestaña:proyecciones'): ...
+  - funciones calientes:   @perfilar  (o perfilar(funcion, nombre='...'))
+
+Entre iniciar_perfil() y finalizar_perfil() el perfil vive en threading.local
+(Streamlit ejecuta cada sesión en su propio hilo). Sin perfil activo, el
+decorador solo cuesta una consulta a ese threading.local.
+
+Tiempos inclusivos: una sección o función incluye lo que se ejecuta dentro.
+Memoria: con memoria=True se activa tracemalloc durante el perfil;
+'memoria_kb' es la memoria neta asignada (lo que sigue vivo al salir) y
+'pico_memoria_kb' el pico del rerun. tracemalloc es global al proceso y hace
+más lento todo lo que se ejecuta mientras está activo: usarlo solo al
+diagnosticar.
+
+Varias sesiones pueden perfilar memoria a la vez: tracemalloc se activa con el
+primer perfil que lo pide y se detiene con el último (contador con bloqueo;
+los perfiles de hilos que terminaron sin finalizar se liberan solos). Con
+perfiles simultáneos 'memoria_kb' incluye asignaciones de otras sesiones y el
+pico no es atribuible: 'pico_memoria_kb' es None salvo que el perfil haya
+sido el único activo de principio a fin.
+"""
+
+import functools
+import itertools
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+
+MAX_HISTORIAL_PERFILES = 50
+
+_estado = threading.local()
+
+# tracemalloc compartido entre hilos: token del perfil → hilo que lo inició
+_bloqueo_tracemalloc = threading.Lock()
+_usuarios_tracemalloc = {}
+_tracemalloc = {'propio': False, 'epoca': 0}
+_tokens_memoria = itertools.count(1)
+
+
+def perfil_activo():
+    """Perfil en curso del hilo actual (None si no se está perfilando)"""
+    return getattr(_estado, 'perfil', None)
+
+
+def iniciar_perfil(etiqueta='rerun', memoria=False):
+    """
+    Inicia un perfil en el hilo actual (descarta uno previo sin finalizar,
+    ej: un rerun interrumpido por st.rerun() o st.stop())
+
+    Returns:
+        dict del perfil en curso
+    """
+    if perfil_activo() is not None:
+        _descartar_perfil()
+
+    perfil = {
+        'etiqueta': etiqueta,
+        'fecha': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        'inicio': time.perf_counter(),
+        'memoria': memoria,
+        'token_memoria': None,
+        'secciones': {},
+        'funciones': {}
+    }
+    if memoria:
+        _adquirir_tracemalloc(perfil)
+    _estado.perfil = perfil
+    return perfil
+
+
+def _liberar_hilos_terminados():
+    """(Con el bloqueo tomado) libera perfiles de reruns abandonados en hilos que ya terminaron"""
+    for token, hilo in list(_usuarios_tracemalloc.items()):
+        if not hilo.is_alive():
+            del _usuarios_tracemalloc[token]
+
+
+def _detener_si_libre():
+    """(Con el bloqueo tomado) detiene tracemalloc si nadie lo usa y lo inició este módulo"""
+    if not _usuarios_tracemalloc and _tracemalloc['propio']:
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+        _tracemalloc['propio'] = False
+
+
+def _adquirir_tracemalloc(perfil):
+    with _bloqueo_tracemalloc:
+        _liberar_hilos_terminados()
+        _detener_si_libre()
+        exclusivo = not _usuarios_tracemalloc
+        if exclusivo:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                _tracemalloc['propio'] = True
+            tracemalloc.reset_peak()
+        _tracemalloc['epoca'] += 1
+        perfil['token_memoria'] = next(_tokens_memoria)
+        perfil['epoca_memoria'] = _tracemalloc['epoca'] if exclusivo else None
+        _usuarios_tracemalloc[perfil['token_memoria']] = threading.current_thread()
+
+
+def _pico_exclusivo_kb(perfil):
+    """Pico del perfil si fue el único usuario de tracemalloc de principio a fin (si no, None)"""
+    with _bloqueo_tracemalloc:
+        exclusivo = (perfil['epoca_memoria'] is not None
+                     and perfil['epoca_memoria'] == _tracemalloc['epoca']
+                     and list(_usuarios_tracemalloc) == [perfil['token_memoria']])
+        if exclusivo and tracemalloc.is_tracing():
+            return tracemalloc.get_traced_memory()[1] / 1024
+    return None
+
+
+def _liberar_tracemalloc(perfil):
+    with _bloqueo_tracemalloc:
+        _usuarios_tracemalloc.pop(perfil['token_memoria'], None)
+        _liberar_hilos_terminados()
+        _detener_si_libre()
+
+
+def _descartar_perfil():
+    perfil = perfil_activo()
+    _estado.perfil = None
+    if perfil is not None and perfil['token_memoria'] is not None:
+        _liberar_tracemalloc(perfil)
+    return perfil
+
+
+def finalizar_perfil():
+    """
+    Cierra el perfil del hilo actual
+
+    Returns:
+        dict serializable a JSON (ver resumir_perfil()) o None si no había perfil
+    """
+    perfil = perfil_activo()
+    if perfil is None:
+        return None
+    duracion_ms = (time.perf_counter() - perfil['inicio']) * 1000
+    pico_kb = _pico_exclusivo_kb(perfil) if perfil['token_memoria'] is not None else None
+    _descartar_perfil()
+    return resumir_perfil(perfil, duracion_ms, pico_kb)
+
+
+def _memoria_actual(perfil):
+    if perfil['memoria'] and tracemalloc.is_tracing():
+        return tracemalloc.get_traced_memory()[0]
+    return None
+
+
+def _registrar(perfil, tabla, nombre, inicio, memoria_inicial):
+    transcurrido_ms = (time.perf_counter() - inicio) * 1000
+    registro = perfil[tabla].setdefault(
+        nombre, {'llamadas': 0, 'total_ms': 0.0, 'max_ms': 0.0, 'memoria_kb': None}
+    )
+    registro['llamadas'] += 1
+    registro['total_ms'] += transcurrido_ms
+    registro['max_ms'] = max(registro['max_ms'], transcurrido_ms)
+    memoria_final = _memoria_actual(perfil)
+    if memoria_inicial is not None and memoria_final is not None:
+        registro['memoria_kb'] = (registro['memoria_kb'] or 0.0) + (memoria_final - memoria_inicial) / 1024
+
+
+@contextmanager
+def medir_seccion(nombre):
+    """Mide un bloque con nombre en el perfil activo (no hace nada sin perfil)"""
+    perfil = perfil_activo()
+    if perfil is None:
+        yield
+        return
+    memoria_inicial = _memoria_actual(perfil)
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        _registrar(perfil, 'secciones', nombre, inicio, memoria_inicial)
+
+
+def perfilar(funcion=None, nombre=None):
+    """
+    Decorador: cuenta llamadas, tiempo y memoria de la función en el perfil activo
+
+    Uso: @perfilar, @perfilar(nombre='...') o perfilar(funcion, nombre='...')
+    """
+    if funcion is None:
+        return functools.partial(perfilar, nombre=nombre)
+    nombre = nombre or funcion.__name__
+
+    @functools.wraps(funcion)
+    def envoltura(*args, **kwargs):
+        perfil = perfil_activo()
+        if perfil is None:
+            return funcion(*args, **kwargs)
+        memoria_inicial = _memoria_actual(perfil)
+        inicio = time.perf_counter()
+        try:
+            return funcion(*args, **kwargs)
+        finally:
+            _registrar(perfil, 'funciones', nombre, inicio, memoria_inicial)
+    return envoltura
+
+
+def _filas(tabla):
+    filas = [{'nombre': nombre, **registro} for nombre, registro in tabla.items()]
+    return sorted(filas, key=lambda fila: fila['total_ms'], reverse=True)
+
+
+def resumir_perfil(perfil, duracion_ms, pico_memoria_kb=None):
+    """
+    Resumen serializable de un perfil
+
+    Returns:
+        dict con etiqueta, fecha, duracion_ms, pico_memoria_kb y listas
+        'secciones' / 'funciones' (nombre, llamadas, total_ms, max_ms,
+        memoria_kb) ordenadas por total_ms descendente
+    """
+    return {
+        'etiqueta': perfil['etiqueta'],
+        'fecha': perfil['fecha'],
+        'duracion_ms': duracion_ms,
+        'pico_memoria_kb': pico_memoria_kb,
+        'secciones': _filas(perfil['secciones']),
+        'funciones': _filas(perfil['funciones'])
+    }
+
+
+def agregar_a_historial(historial, resumen, maximo=MAX_HISTORIAL_PERFILES):
+    """Agrega un resumen al historial (lista) conservando los últimos 'maximo'"""
+    if resumen is not None:
+        historial.append(resumen)
+        del historial[:-maximo]
+    return historial
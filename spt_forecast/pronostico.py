@@ -0,0 +1,325 @@
+"""
+Backends de pronóstico del revenue base - v7.3.0
+================================================
+
+Hasta v7.2 el revenue proyectado era revenue_promedio × (1+g)^i × factor
+estacional con g fijo (1/2/3%). Este módulo ofrece métodos intercambiables,
+ajustados sobre la serie mensual histórica (df_historical['revenue']):
+
+  - 'heuristico': el método actual (promedio × 2% mensual × factores por mes)
+  - 'descomposicion': descomposición estacional clásica multiplicativa
+    (tendencia por media móvil centrada 2×12, índices estacionales
+    normalizados, tendencia lineal sobre la serie desestacionalizada)
+  - 'holt_winters': suavizamiento exponencial triple (tendencia aditiva,
+    estacionalidad multiplicativa); alfa/beta/gamma por búsqueda en grilla
+    evaluando todas las combinaciones en paralelo como arrays NumPy
+
+Los parámetros ajustados se guardan en un cache por huella de la serie: solo
+se reajusta cuando cambia el histórico. Meses en cero no producen divisiones
+0/0 (denominadores con piso); un ajuste o pronóstico no finito se descarta y
+ajustar_backend() retorna None (el dashboard vuelve al método heurístico). Cada ajuste reporta su precisión en
+los últimos meses (holdout: MAPE y sesgo) para comparar métodos.
+
+Todo en NumPy: con 33-60 meses de historia cada ajuste toma pocos milisegundos.
+"""
+
+import hashlib
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+from spt_forecast.constantes import TASAS_CRECIMIENTO
+
+PERIODO_ESTACIONAL = 12
+MESES_VALIDACION = 6  # Holdout para la precisión reportada
+MIN_CICLOS = 2  # Descomposición y Holt-Winters requieren 2 años completos
+MIN_MESES_ESTADISTICOS = MIN_CICLOS * PERIODO_ESTACIONAL + MESES_VALIDACION
+
+BACKENDS = {
+    'heuristico': 'Heurístico (promedio × crecimiento × estacionalidad)',
+    'descomposicion': 'Descomposición estacional + tendencia lineal',
+    'holt_winters': 'Holt-Winters (tendencia + estacionalidad)'
+}
+
+# Grilla de Holt-Winters: 6 × 5 × 5 = 150 combinaciones evaluadas a la vez
+GRILLA_ALFA = np.array([0.05, 0.2, 0.35, 0.5, 0.7, 0.9])
+GRILLA_BETA = np.array([0.0, 0.02, 0.05, 0.1, 0.2])
+GRILLA_GAMMA = np.array([0.0, 0.05, 0.1, 0.3, 0.5])
+
+# Pisos de los denominadores (índice estacional y nivel relativo a la escala de la serie)
+PISO_ESTACIONAL = 1e-3
+PISO_NIVEL_RELATIVO = 1e-6
+
+MAX_ENTRADAS_CACHE_AJUSTES = 32
+_cache_ajustes = OrderedDict()
+_estadisticas_cache = {'hits': 0, 'misses': 0}
+
+
+def _posicion_estacional(mes_inicial, n):
+    """Índice 0-11 del mes calendario de cada una de n observaciones desde mes_inicial (1-12)"""
+    return (mes_inicial - 1 + np.arange(n)) % PERIODO_ESTACIONAL
+
+
+# =============================================================================
+# HEURÍSTICO (método actual)
+# =============================================================================
+
+def _ajustar_heuristico(serie, mes_inicial):
+    posicion = _posicion_estacional(mes_inicial, len(serie))
+    promedio = serie.mean()
+    indices = np.ones(PERIODO_ESTACIONAL)
+    for mes in range(PERIODO_ESTACIONAL):
+        valores = serie[posicion == mes]
+        if len(valores) and promedio > 0:
+            indices[mes] = valores.mean() / promedio
+    return {'nivel': float(promedio), 'estacional': indices, 'crecimiento': TASAS_CRECIMIENTO['Moderado']}
+
+
+def _pronosticar_heuristico(parametros, mes_siguiente, horizonte):
+    pasos = np.arange(horizonte)
+    posicion = _posicion_estacional(mes_siguiente, horizonte)
+    return parametros['nivel'] * (1 + parametros['crecimiento']) ** pasos * parametros['estacional'][posicion]
+
+
+# =============================================================================
+# DESCOMPOSICIÓN ESTACIONAL CLÁSICA
+# =============================================================================
+
+def _ajustar_descomposicion(serie, mes_inicial):
+    n = len(serie)
+    posicion = _posicion_estacional(mes_inicial, n)
+
+    # 1. Tendencia: media móvil centrada 2×12 (pesos 1/24 en los extremos)
+    pesos = np.r_[0.5, np.ones(PERIODO_ESTACIONAL - 1), 0.5] / PERIODO_ESTACIONAL
+    tendencia = np.full(n, np.nan)
+    medio = PERIODO_ESTACIONAL // 2
+    tendencia[medio:n - medio] = np.convolve(serie, pesos, mode='valid')
+
+    # 2. Índices estacionales: promedio de serie/tendencia por mes, normalizados a media 1
+    # (sin ratio donde la tendencia es 0 o negativa)
+    ratio = np.divide(serie, tendencia, out=np.full(n, np.nan), where=tendencia > 0)
+    indices = np.ones(PERIODO_ESTACIONAL)
+    for mes in range(PERIODO_ESTACIONAL):
+        valores = ratio[(posicion == mes) & ~np.isnan(ratio)]
+        if len(valores):
+            indices[mes] = valores.mean()
+    if indices.mean() > 0:
+        indices /= indices.mean()
+    else:
+        indices = np.ones(PERIODO_ESTACIONAL)
+
+    # 3. Tendencia lineal sobre la serie desestacionalizada (sin los meses con
+    # índice nulo, que no se pueden desestacionalizar)
+    con_indice = indices[posicion] > PISO_ESTACIONAL
+    if con_indice.sum() < 2:
+        con_indice[:] = True
+    desestacionalizada = serie[con_indice] / np.maximum(indices[posicion][con_indice], PISO_ESTACIONAL)
+    pendiente, intercepto = np.polyfit(np.arange(n)[con_indice], desestacionalizada, 1)
+    return {'intercepto': float(intercepto), 'pendiente': float(pendiente), 'estacional': indices, 'n': n}
+
+
+def _pronosticar_descomposicion(parametros, mes_siguiente, horizonte):
+    t = parametros['n'] + np.arange(horizonte)
+    posicion = _posicion_estacional(mes_siguiente, horizonte)
+    return (parametros['intercepto'] + parametros['pendiente'] * t) * parametros['estacional'][posicion]
+
+
+# =============================================================================
+# HOLT-WINTERS (tendencia aditiva, estacionalidad multiplicativa)
+# =============================================================================
+
+def _ajustar_holt_winters(serie, mes_inicial):
+    n = len(serie)
+    m = PERIODO_ESTACIONAL
+    alfa, beta, gamma = (g.ravel() for g in np.meshgrid(GRILLA_ALFA, GRILLA_BETA, GRILLA_GAMMA, indexing='ij'))
+    combinaciones = len(alfa)
+
+    # Estado inicial con los dos primeros ciclos; meses en cero (o todo el
+    # primer ciclo en cero) arrancan con índice neutro
+    promedio_inicial = serie[:m].mean()
+    piso_nivel = PISO_NIVEL_RELATIVO * max(np.abs(serie).max(), 1.0)
+    inicial = serie[:m] / promedio_inicial if promedio_inicial > 0 else np.ones(m)
+    inicial = np.where(inicial > 0, inicial, 1.0)
+    nivel = np.full(combinaciones, promedio_inicial)
+    tendencia = np.full(combinaciones, (serie[m:2 * m].mean() - promedio_inicial) / m)
+    estacional = np.tile(inicial, (combinaciones, 1))  # Por posición relativa a t=0
+
+    # Recursión sobre el tiempo; las 150 combinaciones avanzan juntas
+    sse = np.zeros(combinaciones)
+    for t in range(n):
+        s = estacional[:, t % m]
+        prediccion = (nivel + tendencia) * s
+        if t >= m:  # El primer ciclo solo inicializa
+            sse += (serie[t] - prediccion) ** 2
+        nivel_anterior = nivel
+        nivel = alfa * serie[t] / np.maximum(s, PISO_ESTACIONAL) + (1 - alfa) * (nivel + tendencia)
+        tendencia = beta * (nivel - nivel_anterior) + (1 - beta) * tendencia
+        estacional[:, t % m] = gamma * serie[t] / np.maximum(nivel, piso_nivel) + (1 - gamma) * s
+
+    sse = np.where(np.isfinite(sse), sse, np.inf)
+    mejor = int(np.argmin(sse))
+    # Estacionalidad re-indexada por mes calendario (0 = enero)
+    por_mes = np.empty(m)
+    por_mes[_posicion_estacional(mes_inicial, m)] = estacional[mejor]
+    return {
+        'alfa': float(alfa[mejor]),
+        'beta': float(beta[mejor]),
+        'gamma': float(gamma[mejor]),
+        'nivel': float(nivel[mejor]),
+        'tendencia': float(tendencia[mejor]),
+        'estacional': por_mes
+    }
+
+
+def _pronosticar_holt_winters(parametros, mes_siguiente, horizonte):
+    pasos = np.arange(1, horizonte + 1)
+    posicion = _posicion_estacional(mes_siguiente, horizonte)
+    return (parametros['nivel'] + pasos * parametros['tendencia']) * parametros['estacional'][posicion]
+
+
+_AJUSTAR = {
+    'heuristico': _ajustar_heuristico,
+    'descomposicion': _ajustar_descomposicion,
+    'holt_winters': _ajustar_holt_winters
+}
+_PRONOSTICAR = {
+    'heuristico': _pronosticar_heuristico,
+    'descomposicion': _pronosticar_descomposicion,
+    'holt_winters': _pronosticar_holt_winters
+}
+
+
+# =============================================================================
+# API PÚBLICA
+# =============================================================================
+
+def backend_disponible(metodo, n_meses):
+    """True si hay historia suficiente para el método (2 ciclos + holdout para los estadísticos)"""
+    if metodo == 'heuristico':
+        return n_meses > 0
+    return n_meses >= MIN_MESES_ESTADISTICOS
+
+
+def huella_serie(serie, mes_inicial):
+    """Huella SHA-256 de la serie histórica (clave del cache de ajustes)"""
+    datos = np.ascontiguousarray(serie, dtype=float)
+    return hashlib.sha256(datos.tobytes() + bytes([int(mes_inicial)])).hexdigest()
+
+
+def _mes_siguiente(mes_inicial, n):
+    return int((mes_inicial - 1 + n) % PERIODO_ESTACIONAL) + 1
+
+
+def _ajustar_y_validar(metodo, serie, mes_inicial):
+    """Ajuste sobre toda la serie + precisión en holdout de los últimos MESES_VALIDACION meses"""
+    inicio = time.perf_counter()
+    parametros = _AJUSTAR[metodo](serie, mes_inicial)
+    tiempo_ms = (time.perf_counter() - inicio) * 1000
+
+    mape = sesgo = None
+    if len(serie) > MESES_VALIDACION:
+        entrenamiento, prueba = serie[:-MESES_VALIDACION], serie[-MESES_VALIDACION:]
+        ajuste_prueba = _AJUSTAR[metodo](entrenamiento, mes_inicial)
+        prediccion = _PRONOSTICAR[metodo](
+            ajuste_prueba, _mes_siguiente(mes_inicial, len(entrenamiento)), MESES_VALIDACION
+        )
+        validos = prueba != 0
+        if validos.any() and np.isfinite(prediccion).all():
+            errores = (prediccion[validos] - prueba[validos]) / prueba[validos]
+            mape = float(np.mean(np.abs(errores)) * 100)
+            sesgo = float(np.mean(errores) * 100)
+    return {
+        'metodo': metodo,
+        'parametros': parametros,
+        'n': len(serie),
+        'mes_inicial': mes_inicial,
+        'mape': mape,
+        'sesgo': sesgo,
+        'tiempo_ms': tiempo_ms
+    }
+
+
+def _ajuste_finito(ajuste):
+    """True si los parámetros y un pronóstico de prueba (2 ciclos) son finitos"""
+    for valor in ajuste['parametros'].values():
+        if not np.isfinite(valor).all():
+            return False
+    prueba = _PRONOSTICAR[ajuste['metodo']](ajuste['parametros'], 1, MIN_CICLOS * PERIODO_ESTACIONAL)
+    return bool(np.isfinite(prueba).all())
+
+
+def ajustar_backend(metodo, serie, mes_inicial):
+    """
+    Ajusta un método sobre la serie mensual (memoizado por huella de la serie)
+
+    Args:
+        metodo: clave de BACKENDS
+        serie: revenue mensual histórico (orden cronológico)
+        mes_inicial: mes calendario (1-12) de la primera observación
+
+    Returns:
+        dict con metodo, parametros, n, mes_inicial, mape, sesgo (holdout) y
+        tiempo_ms del ajuste; None si la historia no alcanza para el método
+        o si el ajuste no es finito
+    """
+    if metodo not in BACKENDS:
+        raise ValueError(f"Método de pronóstico no soportado: {metodo}")
+    serie = np.asarray(serie, dtype=float)
+    if not backend_disponible(metodo, len(serie)):
+        return None
+
+    clave = (metodo, huella_serie(serie, mes_inicial))
+    if clave in _cache_ajustes:  # También memoiza los ajustes descartados (None)
+        _estadisticas_cache['hits'] += 1
+        _cache_ajustes.move_to_end(clave)
+        return _cache_ajustes[clave]
+
+    _estadisticas_cache['misses'] += 1
+    ajuste = _ajustar_y_validar(metodo, serie, mes_inicial)
+    if not np.isfinite(serie).all() or not _ajuste_finito(ajuste):
+        ajuste = None
+    _cache_ajustes[clave] = ajuste
+    while len(_cache_ajustes) > MAX_ENTRADAS_CACHE_AJUSTES:
+        _cache_ajustes.popitem(last=False)
+    return ajuste
+
+
+def pronosticar(ajuste, horizonte, desfase=0):
+    """
+    Revenue pronosticado para los meses siguientes a la historia
+
+    Args:
+        ajuste: resultado de ajustar_backend()
+        horizonte: meses a retornar
+        desfase: meses a saltar después del último mes histórico (ej: la
+                 proyección empieza 12 meses después del cierre de la historia)
+
+    Returns:
+        np.ndarray de largo horizonte
+    """
+    mes_siguiente = _mes_siguiente(ajuste['mes_inicial'], ajuste['n'])
+    trayectoria = _PRONOSTICAR[ajuste['metodo']](ajuste['parametros'], mes_siguiente, desfase + horizonte)
+    return np.maximum(trayectoria[desfase:], 0.0)
+
+
+def evaluar_backends(serie, mes_inicial):
+    """
+    Ajusta todos los métodos disponibles (usa el cache)
+
+    Returns:
+        dict {metodo: ajuste} solo con los métodos con historia suficiente
+    """
+    ajustes = {metodo: ajustar_backend(metodo, serie, mes_inicial) for metodo in BACKENDS}
+    return {metodo: ajuste for metodo, ajuste in ajustes.items() if ajuste is not None}
+
+
+def obtener_estadisticas_cache_ajustes():
+    """Contadores del cache de ajustes (hits, misses, entradas)"""
+    return dict(_estadisticas_cache, entradas=len(_cache_ajustes))
+
+
+def limpiar_cache_ajustes():
+    """Vacía el cache de ajustes (ej: benchmarks de ajuste en frío)"""
+    _cache_ajustes.clear()
+    _estadisticas_cache.update(hits=0, misses=0)
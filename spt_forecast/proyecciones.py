@@ -0,0 +1,144 @@
+"""
+Motor vectorizado de proyecciones - v7.0.0
+==========================================
+
+Proyecciones de los 3 escenarios × N meses en una sola pasada NumPy:
+crecimiento compuesto, estacionalidad, cartera vigente por mes (índice de
+intervalos) y burn rate dinámico como operaciones de arrays.
+"""
+
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from spt_forecast.cartera import compilar_indice_cartera, consultar_indice_cartera, ordinal_mes
+from spt_forecast.constantes import (
+    COMPONENTES_ESCENARIO,
+    ESCENARIOS,
+    MESES_ABREV,
+    MESES_NOMBRES,
+    TASAS_CRECIMIENTO,
+)
+
+
+def calcular_calendario_proyeccion(meses, ultimo_mes_historico=None, ano_base=None):
+    """
+    🆕 v6.4.0: Calendario de meses proyectados como arrays
+    
+    Returns:
+        tuple (mes_numero, ano, ordinales) - 🆕 v6.4.1: ordinales de mes para el índice
+    """
+    mes_base = ultimo_mes_historico if ultimo_mes_historico is not None else datetime.now().month
+    if ano_base is None:
+        ano_base = datetime.now().year
+    
+    offsets = mes_base + np.arange(meses)
+    mes_numero = (offsets % 12) + 1
+    # ✅ v6.2.3: Año correcto al cruzar diciembre
+    ano = ano_base + offsets // 12
+    
+    return mes_numero, ano, ordinal_mes(ano, mes_numero)
+
+
+def generar_proyecciones_vectorizadas(revenue_base, financial_data, meses, escenarios=None,
+                                      seasonal_factors=None, ultimo_mes_historico=None,
+                                      indice_cartera=None, revenue_equipos_50pct=None,
+                                      ano_base=None, trayectoria_base=None):
+    """
+    🆕 v6.4.0: Genera proyecciones de VARIOS escenarios en una sola pasada NumPy
+    
+    Misma metodología que generar_proyecciones_por_escenario() (v5.0.2 + v6.0.1 +
+    v6.2.0) pero sin loops por mes: la matriz escenarios × meses se construye con
+    broadcast de crecimiento, estacionalidad y vigencia de contratos.
+    
+    Args:
+        revenue_base: Revenue mensual base (solo equipos operando)
+        financial_data: Dict con gastos_fijos y tasa_costos_variables
+        meses: Número de meses a proyectar
+        escenarios: Lista de escenarios (default: los 3)
+        seasonal_factors: Dict opcional {nombre_mes: factor}
+        ultimo_mes_historico: Último mes histórico (1-12) o None (mes actual)
+        indice_cartera: 🆕 v6.4.1 - Índice de compilar_indice_cartera()
+                        (default: cartera vacía)
+        revenue_equipos_50pct: Revenue de equipos disponibles (default: 0)
+        ano_base: Año base de la proyección (default: año actual)
+        trayectoria_base: 🆕 v7.3.0 - Revenue base pronosticado mes a mes por un
+                          backend estadístico (spt_forecast.pronostico). Reemplaza
+                          crecimiento fijo × estacionalidad: Moderado sigue la
+                          trayectoria y los demás escenarios se separan de ella
+                          por la diferencia de sus tasas de crecimiento
+    
+    Returns:
+        dict {escenario: DataFrame} con las mismas columnas de generar_proyecciones_por_escenario()
+    """
+    escenarios = list(escenarios or ESCENARIOS)
+    gastos_fijos = financial_data.get('gastos_fijos', 0)
+    tasa_costos = financial_data.get('tasa_costos_variables', 0)
+    
+    # ✅ v5.0.3: Si no hay datos (todo en 0), retornar proyecciones vacías
+    if revenue_base == 0 and gastos_fijos == 0:
+        return {
+            escenario: pd.DataFrame({
+                'mes': list(range(1, meses + 1)),
+                'revenue': [0] * meses,
+                'egresos_totales': [0] * meses,
+                'flujo_neto': [0] * meses
+            })
+            for escenario in escenarios
+        }
+    
+    if indice_cartera is None:
+        indice_cartera = compilar_indice_cartera([], [])
+    if revenue_equipos_50pct is None:
+        revenue_equipos_50pct = 0.0
+    
+    # 1. Calendario y cartera vigente por mes (🆕 v6.4.1: búsqueda en el índice)
+    mes_numero, ano, ordinales = calcular_calendario_proyeccion(meses, ultimo_mes_historico, ano_base)
+    revenue_contratos, costos_contratos, revenue_cotizaciones = \
+        consultar_indice_cartera(indice_cartera, ordinales)
+    
+    # 2. Revenue base por escenario (escenarios × meses)
+    componentes = np.array([COMPONENTES_ESCENARIO[e] for e in escenarios])
+    revenue_base_escenario = (revenue_base
+                              + componentes[:, 0:1] * revenue_contratos
+                              + componentes[:, 1:2] * revenue_cotizaciones
+                              + componentes[:, 2:3] * revenue_equipos_50pct)
+    
+    # 3. Crecimiento compuesto y estacionalidad (broadcast)
+    tasas = np.array([TASAS_CRECIMIENTO[e] for e in escenarios])
+    if trayectoria_base is not None:
+        # 🆕 v7.3.0: Tendencia y estacionalidad vienen del backend estadístico
+        trayectoria = np.asarray(trayectoria_base, dtype=float)[:meses]
+        factor_estacional = trayectoria / revenue_base if revenue_base > 0 else np.ones(meses)
+        tasa_referencia = TASAS_CRECIMIENTO['Moderado']
+        factor_crecimiento = ((1 + tasas[:, np.newaxis]) / (1 + tasa_referencia)) ** np.arange(meses)
+    else:
+        factor_crecimiento = (1 + tasas[:, np.newaxis]) ** np.arange(meses)
+        nombres_mes = [MESES_NOMBRES[m - 1] for m in mes_numero]
+        if seasonal_factors:
+            factor_estacional = np.array([seasonal_factors.get(n, 1.0) for n in nombres_mes], dtype=float)
+        else:
+            factor_estacional = np.ones(meses)
+    revenue = revenue_base_escenario * factor_crecimiento * factor_estacional
+    
+    # 4. Burn rate dinámico + costos específicos de contratos (todos los escenarios)
+    egresos_totales = gastos_fijos + revenue * tasa_costos + costos_contratos
+    flujo_neto = revenue - egresos_totales
+    
+    # 🆕 v6.2.2: Etiquetas con año ("Oct 2025")
+    etiquetas = [f"{MESES_ABREV[m - 1]} {a}" for m, a in zip(mes_numero, ano)]
+    
+    return {
+        escenario: pd.DataFrame({
+            'mes': np.arange(1, meses + 1),
+            'mes_numero': mes_numero,
+            'ano': ano,
+            'nombre_mes': etiquetas,
+            'revenue': revenue[idx],
+            'egresos_totales': egresos_totales[idx],
+            'flujo_neto': flujo_neto[idx],
+            'costos_contratos': costos_contratos
+        })
+        for idx, escenario in enumerate(escenarios)
+    }
@@ -0,0 +1,124 @@
+"""
+Registro estructurado - v7.5.1
+==============================
+
+Reemplaza los print() de depuración por el módulo logging estándar:
+
+  - Niveles: SPT_LOG_LEVEL (DEBUG / INFO / WARNING / ERROR; default WARNING),
+    por lo que en producción los mensajes de depuración no se formatean ni
+    se escriben
+  - Formato: SPT_LOG_FORMAT=json → una línea JSON por evento (ts, nivel,
+    logger, mensaje + campos); texto (default) → línea legible con k=v
+  - Formateo diferido: logger.debug("... %s", valor) solo arma el texto si el
+    nivel está habilitado; los volcados caros (DataFrame.to_string()) van
+    detrás de logger.isEnabledFor(logging.DEBUG)
+  - Muestreo: muestrear('clave') deja pasar 1 de cada N líneas por ítem
+    (ej: una por contrato); N = SPT_LOG_MUESTREO (default 20)
+  - Tiempos: with cronometrar(logger, 'evento', **campos) registra
+    duracion_ms al salir
+
+Campos estructurados: logger.info("mensaje", extra=con_campos(escenario=..., meses=...)).
+"""
+
+import itertools
+import json
+import logging
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+RAIZ_LOGGER = 'spt'
+NIVEL_DEFAULT = 'WARNING'
+MUESTREO_DEFAULT = 20
+
+_contadores_muestreo = {}
+
+
+class FormateadorEstructurado(logging.Formatter):
+    """Formatea el registro como JSON (una línea) o como texto con campos k=v"""
+
+    def __init__(self, json_por_linea=False):
+        super().__init__('%(asctime)s %(levelname)s %(name)s: %(message)s')
+        self.json_por_linea = json_por_linea
+
+    def format(self, record):
+        campos = getattr(record, 'campos', None) or {}
+        if not self.json_por_linea:
+            texto = super().format(record)
+            if campos:
+                texto += ' | ' + ' '.join(f'{clave}={valor}' for clave, valor in campos.items())
+            return texto
+
+        evento = {
+            'ts': self.formatTime(record, '%Y-%m-%dT%H:%M:%S') + f'.{int(record.msecs):03d}',
+            'nivel': record.levelname,
+            'logger': record.name,
+            'mensaje': record.getMessage(),
+            **campos
+        }
+        if record.exc_info:
+            evento['excepcion'] = self.formatException(record.exc_info)
+        return json.dumps(evento, ensure_ascii=False, default=str)
+
+
+def configurar_registro(nivel=None, formato=None, destino=None):
+    """
+    Configura el logger raíz 'spt' (idempotente: se puede llamar en cada rerun)
+
+    Args:
+        nivel: nombre o número de nivel (default: SPT_LOG_LEVEL o WARNING)
+        formato: 'json' o 'texto' (default: SPT_LOG_FORMAT o texto)
+        destino: stream de salida (default: sys.stderr; solo al crear el handler)
+
+    Returns:
+        logging.Logger raíz de la aplicación
+    """
+    nivel = nivel or os.environ.get('SPT_LOG_LEVEL', NIVEL_DEFAULT)
+    formato = formato or os.environ.get('SPT_LOG_FORMAT', 'texto')
+    raiz = logging.getLogger(RAIZ_LOGGER)
+    raiz.setLevel(nivel.upper() if isinstance(nivel, str) else nivel)
+    raiz.propagate = False
+
+    manejador = next((h for h in raiz.handlers if getattr(h, 'spt_registro', False)), None)
+    if manejador is None:
+        manejador = logging.StreamHandler(destino or sys.stderr)
+        manejador.spt_registro = True
+        raiz.addHandler(manejador)
+    manejador.setFormatter(FormateadorEstructurado(json_por_linea=formato.lower() == 'json'))
+    return raiz
+
+
+def obtener_logger(nombre):
+    """Logger hijo de 'spt' (ej: obtener_logger('dashboard') → 'spt.dashboard')"""
+    return logging.getLogger(f'{RAIZ_LOGGER}.{nombre}')
+
+
+def con_campos(**campos):
+    """Argumento extra= con campos estructurados"""
+    return {'campos': campos}
+
+
+def muestrear(clave, cada=None):
+    """
+    True para 1 de cada 'cada' llamadas con la misma clave (determinístico)
+
+    Usar junto con el nivel: `if logger.isEnabledFor(logging.DEBUG) and muestrear('x')`.
+    """
+    cada = cada or int(os.environ.get('SPT_LOG_MUESTREO', MUESTREO_DEFAULT))
+    contador = _contadores_muestreo.setdefault(clave, itertools.count())
+    return next(contador) % max(1, cada) == 0
+
+
+@contextmanager
+def cronometrar(logger, evento, nivel=logging.INFO, **campos):
+    """Registra 'evento' con duracion_ms al salir del bloque (nada si el nivel no está habilitado)"""
+    if not logger.isEnabledFor(nivel):
+        yield
+        return
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        campos['duracion_ms'] = round((time.perf_counter() - inicio) * 1000, 2)
+        logger.log(nivel, evento, extra={'campos': campos})
@@ -0,0 +1,185 @@
+"""
+Simulación Monte Carlo de flujo de caja - v7.0.0
+================================================
+
+Simula miles de trayectorias de revenue en un solo array NumPy:
+  - Crecimiento: retornos mes a mes (log) del histórico desestacionalizado,
+    remuestreados con reemplazo (bootstrap)
+  - Estacionalidad: mismos factores que las proyecciones determinísticas
+  - Cotizaciones: cada una cierra (o no) según probabilidad_cierre (Bernoulli)
+  - Contratos activos y costos: igual que el escenario determinístico
+
+Las trayectorias se calculan por bloques (TRAYECTORIAS_POR_BLOQUE) que caben
+en cache; solo revenue y balance se guardan completos, en float32, para los
+percentiles. 100k trayectorias × 60 meses toman ~0.5 s en un núcleo.
+"""
+
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from spt_forecast.cartera import compilar_indice_cartera, consultar_indice_cartera
+from spt_forecast.constantes import COMPONENTES_ESCENARIO, MESES_ABREV, MESES_NOMBRES
+from spt_forecast.proyecciones import calcular_calendario_proyeccion
+
+SEMILLA_MONTE_CARLO = 42  # Fija: mismas entradas → mismo resultado
+TRAYECTORIAS_POR_BLOQUE = 8192
+
+
+def calcular_retornos_historicos(df_historical, seasonal_factors=None):
+    """
+    🆕 v6.5.0: Retornos logarítmicos mes a mes del revenue histórico desestacionalizado
+    
+    Args:
+        df_historical: DataFrame con columnas 'periodo' (YYYY-MM) y 'revenue'
+        seasonal_factors: Dict {nombre_mes: factor} para desestacionalizar
+    
+    Returns:
+        np.array de retornos log (vacío si no hay al menos 2 meses válidos)
+    """
+    if df_historical is None or len(df_historical) < 2:
+        return np.array([])
+    
+    df = df_historical.sort_values('periodo')
+    revenue = pd.to_numeric(df['revenue'], errors='coerce').to_numpy(dtype=float)
+    
+    if seasonal_factors:
+        meses_num = pd.to_numeric(df['periodo'].astype(str).str[5:7], errors='coerce').fillna(0).astype(int)
+        factores = np.array([
+            seasonal_factors.get(MESES_NOMBRES[m - 1], 1.0) if 1 <= m <= 12 else 1.0
+            for m in meses_num
+        ], dtype=float)
+        factores[factores <= 0] = 1.0
+        revenue = revenue / factores
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        retornos = np.diff(np.log(revenue))
+    return retornos[np.isfinite(retornos)]
+
+
+def simular_monte_carlo(df_historical, revenue_base, financial_data, meses, efectivo_inicial,
+                        meses_colchon, escenario='Moderado', seasonal_factors=None,
+                        ultimo_mes_historico=None, n_simulaciones=10000,
+                        semilla=SEMILLA_MONTE_CARLO, indice_cartera=None,
+                        revenue_equipos_50pct=0.0):
+    """
+    🆕 v6.5.0: Simula n_simulaciones trayectorias de flujo de caja (vectorizado)
+    
+    Estructura igual a la proyección determinística:
+        revenue = (revenue_base + adicional_escenario) × crecimiento × estacionalidad
+    con crecimiento = exp(suma de retornos históricos remuestreados) y las
+    cotizaciones incluidas sólo en las trayectorias donde "cierran".
+    
+    Args:
+        df_historical: DataFrame histórico (periodo, revenue)
+        revenue_base: Revenue mensual base
+        financial_data: Dict con gastos_fijos y tasa_costos_variables
+        meses: Horizonte en meses
+        efectivo_inicial: Efectivo disponible hoy
+        meses_colchon: Meses de necesidades mínimas que deben mantenerse
+        escenario: Componentes de revenue adicional ('Conservador'/'Moderado'/'Optimista')
+        n_simulaciones: Número de trayectorias
+        semilla: Semilla del generador (reproducible entre reruns)
+        indice_cartera: Índice de compilar_indice_cartera() (default: cartera vacía)
+        revenue_equipos_50pct: Revenue del 50% de equipos disponibles (escenario Optimista)
+    
+    Returns:
+        dict con 'bandas' (DataFrame P5/P50/P95), probabilidades de ruptura y
+        metadatos, o None si no hay historial suficiente
+    """
+    inicio = datetime.now()
+    retornos = calcular_retornos_historicos(df_historical, seasonal_factors)
+    if len(retornos) < 2 or revenue_base <= 0:
+        return None
+    
+    gastos_fijos = financial_data.get('gastos_fijos', 0)
+    tasa_costos = financial_data.get('tasa_costos_variables', 0)
+    rng = np.random.default_rng(semilla)
+    
+    if indice_cartera is None:
+        indice_cartera = compilar_indice_cartera([], [])
+    
+    # 1. Calendario, estacionalidad y cartera determinística
+    mes_numero, ano, ordinales = calcular_calendario_proyeccion(meses, ultimo_mes_historico)
+    revenue_contratos, costos_contratos, _ = consultar_indice_cartera(indice_cartera, ordinales)
+    if seasonal_factors:
+        factor_estacional = np.array([seasonal_factors.get(MESES_NOMBRES[m - 1], 1.0) for m in mes_numero])
+    else:
+        factor_estacional = np.ones(meses)
+    incluye_contratos, incluye_cotizaciones, incluye_equipos = COMPONENTES_ESCENARIO[escenario]
+    
+    # 🆕 v7.5.2: Trayectorias por bloques de TRAYECTORIAS_POR_BLOQUE (caben en
+    # cache); solo revenue y balance se guardan completos (float32) para los
+    # percentiles. 100k trayectorias × 60 meses en < 1 s.
+    adicional_base = revenue_base + incluye_contratos * revenue_contratos
+    if incluye_equipos:
+        adicional_base = adicional_base + revenue_equipos_50pct
+    n_cotizaciones = len(indice_cartera.get('cotizaciones_probabilidad', []))
+    if incluye_cotizaciones and n_cotizaciones > 0:
+        vigentes = ((ordinales[np.newaxis, :] >= indice_cartera['cotizaciones_desde'][:, np.newaxis]) &
+                    (ordinales[np.newaxis, :] <= indice_cartera['cotizaciones_hasta'][:, np.newaxis]))
+        valor_vigente = indice_cartera['cotizaciones_valor_cierre'][:, np.newaxis] * vigentes
+    
+    revenue = np.empty((n_simulaciones, meses), dtype=np.float32)
+    balance = np.empty((n_simulaciones, meses), dtype=np.float32)
+    ruptura_mes = np.zeros(meses)
+    n_ruptura = n_negativo = 0
+    
+    for desde in range(0, n_simulaciones, TRAYECTORIAS_POR_BLOQUE):
+        hasta = min(desde + TRAYECTORIAS_POR_BLOQUE, n_simulaciones)
+        n_bloque = hasta - desde
+        
+        # 2. Crecimiento estocástico: mes i acumula i retornos (mes 0 = base)
+        crecimiento = np.zeros((n_bloque, meses))
+        crecimiento[:, 1:] = rng.choice(retornos, size=(n_bloque, meses - 1), replace=True)
+        np.exp(np.cumsum(crecimiento, axis=1, out=crecimiento), out=crecimiento)
+        
+        # 3. Cotizaciones: cierre Bernoulli por trayectoria, vigencia por mes
+        adicional = adicional_base
+        if incluye_cotizaciones and n_cotizaciones > 0:
+            cierres = rng.random((n_bloque, n_cotizaciones)) < indice_cartera['cotizaciones_probabilidad']
+            adicional = adicional + cierres @ valor_vigente
+        
+        # 4. Flujo de caja por trayectoria (n_bloque × meses)
+        revenue_bloque = crecimiento
+        revenue_bloque *= adicional * factor_estacional
+        egresos = gastos_fijos + revenue_bloque * tasa_costos + costos_contratos
+        balance_bloque = efectivo_inicial + np.cumsum(revenue_bloque - egresos, axis=1)
+        
+        # 5. Colchón: necesidades mínimas dinámicas (igual que calcular_necesidades_minimas_dinamicas)
+        ruptura = balance_bloque < egresos * meses_colchon
+        ruptura_mes += ruptura.sum(axis=0)
+        n_ruptura += int(ruptura.any(axis=1).sum())
+        n_negativo += int((balance_bloque < 0).any(axis=1).sum())
+        
+        revenue[desde:hasta] = revenue_bloque
+        balance[desde:hasta] = balance_bloque
+    
+    p5, p50, p95 = np.percentile(balance, [5, 50, 95], axis=0).astype(float)
+    rev_p5, rev_p50, rev_p95 = np.percentile(revenue, [5, 50, 95], axis=0).astype(float)
+    # Necesidades crecen con el revenue (tasa_costos >= 0): su mediana sale de la del revenue
+    necesidades_p50 = (gastos_fijos + rev_p50 * tasa_costos + costos_contratos) * meses_colchon
+    
+    bandas = pd.DataFrame({
+        'mes': np.arange(1, meses + 1),
+        'nombre_mes': [f"{MESES_ABREV[m - 1]} {a}" for m, a in zip(mes_numero, ano)],
+        'balance_p5': p5,
+        'balance_p50': p50,
+        'balance_p95': p95,
+        'revenue_p5': rev_p5,
+        'revenue_p50': rev_p50,
+        'revenue_p95': rev_p95,
+        'necesidades_p50': necesidades_p50,
+        'prob_ruptura_mes': ruptura_mes / n_simulaciones
+    })
+    
+    return {
+        'bandas': bandas,
+        'prob_ruptura_colchon': n_ruptura / n_simulaciones,
+        'prob_efectivo_negativo': n_negativo / n_simulaciones,
+        'n_simulaciones': n_simulaciones,
+        'n_retornos_historicos': len(retornos),
+        'escenario': escenario,
+        'tiempo_ms': (datetime.now() - inicio).total_seconds() * 1000
+    }
@@ -0,0 +1,50 @@
+"""
+Submuestreo de series para gráficos - v7.1.0
+============================================
+
+Plotly dibuja cada punto: miles de puntos por traza hacen lento el render y la
+serialización hacia el navegador. submuestrear_min_max() reduce una serie a un
+máximo de puntos conservando, en cada bloque, el mínimo y el máximo, de modo que
+picos y valles (ej: el día de menor caja) siguen visibles.
+"""
+
+import numpy as np
+
+MAX_PUNTOS_GRAFICO = 800
+
+
+def submuestrear_min_max(x, y, max_puntos=MAX_PUNTOS_GRAFICO):
+    """
+    Reduce (x, y) a lo sumo ~max_puntos puntos con el método min-max por bloques
+
+    Args:
+        x: array de posiciones (fechas, números)
+        y: array de valores
+        max_puntos: puntos máximos a conservar (>= 4)
+
+    Returns:
+        tuple (x_reducido, y_reducido) en el orden original, incluyendo
+        siempre el primer y el último punto
+    """
+    x = np.asarray(x)
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if n <= max_puntos:
+        return x, y
+
+    n_bloques = max(1, (max_puntos - 2) // 2)
+    tamano = int(np.ceil(n / n_bloques))
+    n_bloques = int(np.ceil(n / tamano))
+
+    # Completar el último bloque con NaN para poder hacer reshape
+    relleno = np.full(n_bloques * tamano - n, np.nan)
+    bloques = np.concatenate([y, relleno]).reshape(n_bloques, tamano)
+    inicio_bloque = np.arange(n_bloques) * tamano
+
+    indices = np.concatenate([
+        [0, n - 1],
+        inicio_bloque + np.nanargmin(bloques, axis=1),
+        inicio_bloque + np.nanargmax(bloques, axis=1)
+    ])
+    indices = np.unique(indices)  # Ordenados y sin duplicados
+    return x[indices], y[indices]